@@ -1,4 +1,5 @@
-from poker_hands import SUITS
+from poker_hands import SUITS, CARD_RANKS, CARD_SUITS
+from functools import lru_cache
 import re
 
 CARD_WIDTH  = 11
@@ -183,6 +184,30 @@ def card_ascii(rank, suit: str, back = False, back_color=RED) -> str:
     
     return "\n".join(lines)
 
+# --- Card Art Registry ---
+# Card art never changes, so it is rendered once per process and shared: every Card
+# (and every integer card id) with the same (rank, suit, back_color) gets the same string.
+
+@lru_cache(maxsize=None)
+def card_art(rank, suit: str, back = False, back_color=RED) -> str:
+    """Memoized card_ascii: the shared, immutable art string for a card front or back."""
+    if back: return _back_art(back_color) # backs only depend on the colour
+    return card_ascii(rank, suit)
+
+@lru_cache(maxsize=None)
+def _back_art(back_color) -> str:
+    return card_ascii(1, SUITS[0], back=True, back_color=back_color)
+
+def card_front(card) -> str:
+    """Front art of a CardObject or of an integer card id."""
+    if not isinstance(card, int): return card.front
+    return card_art(CARD_RANKS[card], CARD_SUITS[card])
+
+def card_back(card, back_color=RED) -> str:
+    """Back art of a CardObject or of an integer card id."""
+    if not isinstance(card, int): return card.back
+    return card_art(CARD_RANKS[card], CARD_SUITS[card], back=True, back_color=back_color)
+
 # Regex to find ANSI escape codes (colors)
 ANSI_ESCAPE = re.compile(r'(\x1b\[[0-9;]*m)')
 
@@ -215,44 +240,55 @@ def string_to_visual_cells(s):
                 
     return cells
 
+# --- Pre-parsed Art ---
+# Card, title and author art strings are immutable and shared (see the Card Art Registry),
+# so each one is split into lines and visual cells once; composing cards then works on the
+# cached grids. Composed overlaps change with the cards in play, so they are kept in a
+# bounded LRU cache instead.
+
+@lru_cache(maxsize=2048)
+def art_lines(art: str) -> tuple:
+    """The lines of an art string (bounded: combine_cards also passes composed overlaps)."""
+    return tuple(art.split('\n'))
+
+@lru_cache(maxsize=None)
+def art_cells(art: str) -> tuple:
+    """An art string as a grid of visual cells (see string_to_visual_cells), one row per line."""
+    return tuple(tuple(string_to_visual_cells(line)) for line in art_lines(art))
+
 def overlap_cards(cards, v_spacing=3, h_spacing=1, reverse=False):
     if not cards:
         return ""
 
     # 1. Determine the card images
-    card_images = [c.front for c in cards] if not reverse else [c.back for c in cards]
-    
+    card_images = [card_front(c) for c in cards] if not reverse else [card_back(c) for c in cards]
+    return _overlap_art(tuple(card_images), v_spacing, h_spacing)
+
+@lru_cache(maxsize=1024)
+def _overlap_art(card_images, v_spacing, h_spacing):
     # 2. Calculate total canvas dimensions
-    # Get dimensions of a single card (assuming all are same size)
-    sample_lines = card_images[0].split('\n')
-    card_h = len(sample_lines)
-    # We must calculate card width based on VISIBLE characters, not string length
-    card_w = len(string_to_visual_cells(sample_lines[0]))
+    # Get dimensions of a single card (assuming all are same size), in VISIBLE characters
+    sample = art_cells(card_images[0])
+    card_h = len(sample)
+    card_w = len(sample[0])
 
-    total_width = (len(cards) - 1) * h_spacing + card_w
-    total_height = (len(cards) - 1) * v_spacing + card_h
+    total_width = (len(card_images) - 1) * h_spacing + card_w
+    total_height = (len(card_images) - 1) * v_spacing + card_h
 
     # 3. Create a 2D Grid (The Canvas) filled with empty spaces
     # grid[y][x] will hold the specific string for that coordinate
-    grid = [[" " for _ in range(total_width)] for _ in range(total_height)]
+    grid = [[" "] * total_width for _ in range(total_height)]
 
     i_0, j_0 = 0, 0 
 
-    # 4. Paint cards onto the grid
+    # 4. Paint the cards' cached cell grids onto the canvas
     for image in card_images:
-        lines = image.split('\n')
-        for j, line in enumerate(lines):
-            # Convert the string line into a list of visual blocks
-            visual_cells = string_to_visual_cells(line)
-            
-            # Determine where to place this line on the canvas
-            start_x = i_0
+        for j, visual_cells in enumerate(art_cells(image)):
             start_y = j_0 + j
-            
+            if start_y >= total_height: break
             # Overwrite the canvas cells with the new card's cells
-            for x, cell in enumerate(visual_cells):
-                if start_x + x < total_width and start_y < total_height:
-                    grid[start_y][start_x + x] = cell
+            end_x = min(total_width, i_0 + len(visual_cells))
+            grid[start_y][i_0:end_x] = visual_cells[:end_x - i_0]
 
         # Update offsets for the next card
         j_0 += v_spacing
@@ -281,9 +317,9 @@ def combine_cards(cards: list[str], n_cards_per_line: int = 13,  discarded_cards
     
     
     if overlap[0]: card_strings = [overlap_cards(cards, reverse = reverse[0], v_spacing = 1 if reverse[0] else 3)]
-    else: card_strings = [c.front for c in cards] if reverse[0] == 0 else [c.back for c in cards]
+    else: card_strings = [card_front(c) for c in cards] if reverse[0] == 0 else [card_back(c) for c in cards]
     if overlap[1]: discards_to_process = [overlap_cards(discards_to_process, reverse = reverse[1], v_spacing = 1 if reverse[1] else 3)]
-    else: discards_to_process = [d.front for d in discards_to_process] if reverse[1] == 0 else [d.back for d in discards_to_process]
+    else: discards_to_process = [card_front(d) for d in discards_to_process] if reverse[1] == 0 else [card_back(d) for d in discards_to_process]
     
     # 1. Create a unified sequence of card art (list of 9-line strings)
     # This list will contain either a 9-line card string, or the GAP_ART list.
@@ -301,7 +337,7 @@ def combine_cards(cards: list[str], n_cards_per_line: int = 13,  discarded_cards
         if isinstance(unit, list): # It's the GAP_ART list
             processed_art_sequence.append(unit)
         else: # It's a normal card art string
-            processed_art_sequence.append(unit.split('\n'))
+            processed_art_sequence.append(art_lines(unit))
             
     num_units = len(processed_art_sequence) # Max 8 units (5 cards + 1 gap + 2 discards)
     final_output_lines = []
@@ -337,6 +373,7 @@ def combine_cards(cards: list[str], n_cards_per_line: int = 13,  discarded_cards
     return "\n".join(final_output_lines)
 
 
+@lru_cache(maxsize=None)
 def title_ascii():
     inner_lines = [
     " ▞▚             ▟▙ ", # Line 0: Top rank and suit
@@ -1,7 +1,9 @@
+import argparse
+import importlib.util
+import time
+from functools import lru_cache
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import Model
-from tensorflow.keras.layers import Input, Dense, concatenate
+from poker_utils import format_time
 
 # --- Configuration Constants ---
 # Max features needed for the fixed-size input vector
@@ -19,32 +21,21 @@ INPUT_VECTOR_SIZE = 104 + (MAX_COMMUNITY_CARDS * NUM_CARD_FEATURES) + 8 + (MAX_P
 INPUT_VECTOR_SIZE = 104 + 260 + 8 + 70 # Total: 442
 # We will use 7 opponent slots.
 
-# --- Helper Functions for Encoding ---
-
-def card_to_one_hot(card):
-    """Converts a standard playing card string (e.g., 'Ah', 'Ts') into a 52-feature one-hot vector."""
-    if card is None:
-        return np.zeros(NUM_CARD_FEATURES)
-
-    ranks = '23456789TJQKA'
-    suits = 'shdc' # Spades, Hearts, Diamonds, Clubs
-    
-    rank = card[0].upper()
-    suit = card[1].lower()
-    
-    rank_index = ranks.find(rank)
-    suit_index = suits.find(suit)
-    
-    if rank_index == -1 or suit_index == -1:
-        # Should not happen with valid input
-        return np.zeros(NUM_CARD_FEATURES)
-
-    # Index = (rank_index * 4) + suit_index
-    index = (rank_index * 4) + suit_index
-    
-    one_hot = np.zeros(NUM_CARD_FEATURES)
-    one_hot[index] = 1.0
-    return one_hot
+# --- Feature Encoding ---
+# The input vector is written in place into a preallocated float32 row: each block starts at
+# a fixed offset and a card sets the single feature at offset + card id (see
+# poker_hands.card_id), so encoding allocates nothing and needs no string parsing.
+
+HAND_OFFSET = 0                                                # 2 x 52 hole card one-hots
+BOARD_OFFSET = HAND_OFFSET + 2 * NUM_CARD_FEATURES             # 5 x 52 community card one-hots
+BETTING_OFFSET = BOARD_OFFSET + MAX_COMMUNITY_CARDS * NUM_CARD_FEATURES  # pot, to call, stack, min raise
+STAGE_OFFSET = BETTING_OFFSET + 4                              # pre-flop, flop, turn, river one-hot
+OPPONENT_OFFSET = STAGE_OFFSET + 4                             # 7 x 10 opponent slots
+OPPONENT_FEATURES = 10  # stack, folded, bet + 7 last action one-hot [Check, Call, Bet, Raise, Fold, All-in, None/Initial]
+
+# Use simple max values for the normalization bounds (needs refinement based on game type)
+MAX_POT = 1000
+MAX_STACK = 1000
 
 def normalize(value, min_val, max_val):
     """Normalizes a numerical value to be between 0 and 1."""
@@ -52,181 +43,392 @@ def normalize(value, min_val, max_val):
         return 0.0
     return (value - min_val) / (max_val - min_val)
 
+def encode_state(game, player, out=None):
+    """
+    Encodes the game state as seen by 'player' into the fixed-size (442) feature vector.
+
+    Args:
+        game (Engine): the game in progress.
+        player (Player): the player to act.
+        out (np.ndarray): float32 row of INPUT_VECTOR_SIZE to write into (allocated if None).
+
+    Returns:
+        np.ndarray: out.
+    """
+    if out is None: out = np.zeros(INPUT_VECTOR_SIZE, dtype=np.float32)
+    else: out.fill(0.0)
+
+    # --- 1. Private Hand & 2. Community Cards ---
+    for i, card in enumerate(player.hand[:2]):
+        out[HAND_OFFSET + i * NUM_CARD_FEATURES + getattr(card, 'id', card)] = 1.0
+    board = game.table.cards
+    for i, card in enumerate(board[:MAX_COMMUNITY_CARDS]):
+        out[BOARD_OFFSET + i * NUM_CARD_FEATURES + getattr(card, 'id', card)] = 1.0
+
+    # --- 3. Betting Context ---
+    players = game.players
+    to_call = game.minimum_bet - player.total_contribution
+    out[BETTING_OFFSET] = sum(p.total_contribution for p in players) / MAX_POT
+    out[BETTING_OFFSET + 1] = to_call / MAX_POT
+    out[BETTING_OFFSET + 2] = player.stack / MAX_STACK
+    out[BETTING_OFFSET + 3] = (to_call + game.min_raise) / MAX_POT  # smallest legal raise, all in
+    n_board = len(board)
+    out[STAGE_OFFSET + (0 if n_board < 3 else n_board - 2)] = 1.0
+
+    # --- 4. Opponent States ---
+    offset = OPPONENT_OFFSET
+    for opponent in players:
+        if opponent is player: continue
+        if offset >= INPUT_VECTOR_SIZE: break
+        out[offset] = opponent.stack / MAX_STACK
+        out[offset + 2] = opponent.total_contribution / MAX_POT
+        # Note: 'last_action' needs to be tracked on the player object for a real implementation
+        # For now, we infer a simple action state:
+        if opponent.folded:
+            out[offset + 1] = 1.0
+            out[offset + 3 + 4] = 1.0 # Folded
+        elif opponent.last_raised and opponent.total_contribution > 0:
+            out[offset + 3 + 3] = 1.0 # Raised
+        elif opponent.total_contribution > 0 and opponent.total_contribution == game.minimum_bet:
+            out[offset + 3 + 1] = 1.0 # Called
+        else:
+            out[offset + 3 + 6] = 1.0 # Unknown/Initial/Checked
+        offset += OPPONENT_FEATURES
+    # Absent players' slots stay zero
+    return out
+
+def encode_states(decisions, out=None):
+    """
+    Batch variant of encode_state.
+
+    Args:
+        decisions (List[Tuple[Engine, Player]]): (game, player to act) pairs.
+        out (np.ndarray): float32 array of at least (N, INPUT_VECTOR_SIZE) to write into.
+
+    Returns:
+        np.ndarray: the (N, INPUT_VECTOR_SIZE) encoded rows.
+    """
+    n = len(decisions)
+    if out is None: out = np.empty((n, INPUT_VECTOR_SIZE), dtype=np.float32)
+    for row, (game, player) in zip(out, decisions):
+        encode_state(game, player, row)
+    return out[:n]
+
+# --- Network Backends ---
+# TensorFlow is only imported when a Keras model is first needed, so importing this module
+# (and starting a game with AI seats) is instant. Every PokerAI in a process shares one
+# network per backend and weights file (see load_network), however many seats it plays.
+# The 'numpy' backend runs the same Dense layers with NumPy alone, from the weights of a
+# Keras model or an .npz file; it is the default when TensorFlow isn't installed.
+
+# (name, units, activation) of the Dense layers: the shared body, then each head
+BODY_LAYERS = (('shared_dense_1', 512, 'relu'), ('shared_dense_2', 256, 'relu'), ('shared_dense_3', 128, 'relu'))
+ACTION_LAYERS = (('action_head_dense', 32, 'relu'), ('action_output', 3, 'softmax'))        # [Fold, Call/Check, Raise]
+MAGNITUDE_LAYERS = (('magnitude_head_dense', 32, 'relu'), ('magnitude_output', 1, 'sigmoid'))  # normalized raise (0 to 1)
+LAYERS = BODY_LAYERS + ACTION_LAYERS + MAGNITUDE_LAYERS
+
+def tensorflow_available():
+    return importlib.util.find_spec('tensorflow') is not None
+
+def build_keras_models():
+    """
+    Builds the shared-body, dual-head neural network architecture.
+    Policy/Magnitude Network structure: 512 -> 256 -> 128 -> Split Heads.
+
+    Returns:
+        Tuple[Model, Model, Model]: the action model and magnitude model (compiled, for
+        training) and the combined model giving both heads (for inference).
+    """
+    from tensorflow.keras.models import Model
+    from tensorflow.keras.layers import Input, Dense
+
+    def stack(x, layers):
+        for name, units, activation in layers:
+            x = Dense(units, activation=activation, name=name)(x)
+        return x
+
+    input_layer = Input(shape=(INPUT_VECTOR_SIZE,), name='input_layer')
+    body = stack(input_layer, BODY_LAYERS)
+    action_output = stack(body, ACTION_LAYERS)
+    magnitude_output = stack(body, MAGNITUDE_LAYERS)
+
+    action_model = Model(inputs=input_layer, outputs=action_output, name='ActionPolicyNet')
+    magnitude_model = Model(inputs=input_layer, outputs=magnitude_output, name='MagnitudeNet')
+    # Shares every layer with the two models above, so one forward pass of the shared body
+    # gives both heads; used for (batched) decisions.
+    model = Model(inputs=input_layer, outputs=[action_output, magnitude_output], name='PokerNet')
+
+    # Compilation (We will fine-tune the loss/optimizer during the RL phase)
+    action_model.compile(optimizer='adam', loss='categorical_crossentropy')
+    magnitude_model.compile(optimizer='adam', loss='mse')
+
+    return action_model, magnitude_model, model
+
+
+class NumpyPokerNet:
+    """
+    The PokerNet forward pass in NumPy. Called like the Keras model: net(inputs) returns
+    (action probabilities (N, 3), normalized raise amounts (N, 1)).
+
+    The two heads run as one: their first layers are concatenated into a single 128 -> 64
+    layer and their output layers into one block-diagonal 64 -> 4 layer, so a forward pass is
+    five matrix products computed in place, whatever the batch size.
+
+    Args:
+        layers (Dict[str, Tuple[np.ndarray, np.ndarray]]): (kernel, bias) of each layer in LAYERS.
+    """
+    def __init__(self, layers):
+        self.layers = {name: (np.asarray(kernel, np.float32), np.asarray(bias, np.float32)) for name, (kernel, bias) in layers.items()}
+        (action_hidden, action_out), (magnitude_hidden, magnitude_out) = ([self.layers[name] for name, _, _ in head]
+                                                                          for head in (ACTION_LAYERS, MAGNITUDE_LAYERS))
+        n_action, n_actions = action_out[0].shape
+        out_kernel = np.zeros((len(action_out[0]) + len(magnitude_out[0]), n_actions + 1), np.float32)
+        out_kernel[:n_action, :n_actions] = action_out[0]
+        out_kernel[n_action:, n_actions:] = magnitude_out[0]
+        self._n_actions = n_actions
+        self._plan = [self.layers[name] for name, _, _ in BODY_LAYERS] + [
+            (np.ascontiguousarray(np.concatenate([action_hidden[0], magnitude_hidden[0]], axis=1)),
+             np.concatenate([action_hidden[1], magnitude_hidden[1]])),
+            (out_kernel, np.concatenate([action_out[1], magnitude_out[1]]))]
+
+    @classmethod
+    def random(cls, seed=0):
+        """Untrained weights, initialised as Keras does (Glorot uniform kernels, zero biases)."""
+        rng = np.random.default_rng(seed)
+        layers, n_in = {}, INPUT_VECTOR_SIZE
+        for name, units, _ in LAYERS:
+            if name == ACTION_LAYERS[0][0] or name == MAGNITUDE_LAYERS[0][0]: n_in = BODY_LAYERS[-1][1] # the heads start from the body
+            limit = np.sqrt(6.0 / (n_in + units))
+            layers[name] = (rng.uniform(-limit, limit, (n_in, units)), np.zeros(units))
+            n_in = units
+        return cls(layers)
+
+    @classmethod
+    def from_keras(cls, model):
+        return cls({name: model.get_layer(name).get_weights() for name, _, _ in LAYERS})
+
+    @classmethod
+    def load(cls, path):
+        """Reads weights saved by save(), in any of its dtypes; they are computed with in float32."""
+        layers = {}
+        with np.load(path) as f:
+            for name, _, _ in LAYERS:
+                kernel = f[name + '/kernel'].astype(np.float32)
+                if name + '/scale' in f: kernel *= f[name + '/scale']
+                layers[name] = (kernel, f[name + '/bias'])
+        return cls(layers)
+
+    def save(self, path, dtype='float32'):
+        """
+        Saves the weights to one .npz file.
+
+        Args:
+            dtype (str): kernel storage: 'float32', 'float16', or 'int8' (symmetric, with one
+                         float32 scale per output unit). Biases are always float32.
+        """
+        arrays = {}
+        for name, (kernel, bias) in self.layers.items():
+            if dtype == 'int8':
+                scale = np.abs(kernel).max(axis=0) / 127.0
+                scale[scale == 0] = 1.0
+                arrays[name + '/kernel'] = np.round(kernel / scale).astype(np.int8)
+                arrays[name + '/scale'] = scale.astype(np.float32)
+            else:
+                arrays[name + '/kernel'] = kernel.astype(dtype)
+            arrays[name + '/bias'] = bias
+        np.savez(path, **arrays)
+
+    def __call__(self, inputs, training=False):
+        x = np.asarray(inputs, np.float32)
+        for kernel, bias in self._plan[:-1]:
+            x = x @ kernel
+            x += bias
+            np.maximum(x, 0.0, out=x)
+        kernel, bias = self._plan[-1]
+        x = x @ kernel
+        x += bias
+        # Softmax of the action logits and sigmoid of the magnitude with a single exp
+        probabilities, magnitudes = x[:, :self._n_actions], x[:, self._n_actions:]
+        probabilities -= probabilities.max(axis=1, keepdims=True)
+        magnitudes *= -1.0
+        np.exp(x, out=x)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return probabilities, 1.0 / (1.0 + magnitudes)
+
+
+@lru_cache(maxsize=None)
+def load_network(backend, weights=None):
+    """
+    The network shared by every PokerAI with this backend and weights file, built on first use.
+
+    Args:
+        backend (str): 'keras' or 'numpy'.
+        weights (str): a Keras weights file, or an .npz saved by NumpyPokerNet.save (numpy
+                       backend only); None for untrained weights.
+
+    Returns:
+        The (action model, magnitude model, combined model) for 'keras'; a NumpyPokerNet for 'numpy'.
+    """
+    if backend == 'keras':
+        models = build_keras_models()
+        if weights: models[2].load_weights(weights)
+        return models
+    if weights is None: return NumpyPokerNet.random()
+    if str(weights).endswith('.npz'): return NumpyPokerNet.load(weights)
+    return NumpyPokerNet.from_keras(load_network('keras', weights)[2])
+
+
+# --- Export ---
+# export_network() turns a trained Keras PokerNet into an .npz for the numpy backend, optionally
+# with float16 or int8 kernels, and checks the exported network against the original.
+
+def sample_inputs(n, seed=0):
+    """n random but well-formed input vectors: distinct hole and board cards for a random street, random betting."""
+    rng = np.random.default_rng(seed)
+    out = np.zeros((n, INPUT_VECTOR_SIZE), dtype=np.float32)
+    for row in out:
+        n_board = rng.choice([0, 3, 4, 5])
+        cards = rng.choice(NUM_CARD_FEATURES, 2 + n_board, replace=False)
+        for i, card in enumerate(cards[:2]): row[HAND_OFFSET + i * NUM_CARD_FEATURES + card] = 1.0
+        for i, card in enumerate(cards[2:]): row[BOARD_OFFSET + i * NUM_CARD_FEATURES + card] = 1.0
+        row[BETTING_OFFSET:STAGE_OFFSET] = rng.random(4)
+        row[STAGE_OFFSET + (0 if n_board < 3 else n_board - 2)] = 1.0
+        for offset in range(OPPONENT_OFFSET, INPUT_VECTOR_SIZE, OPPONENT_FEATURES):
+            row[offset] = rng.random()
+            row[offset + 2] = rng.random()
+            row[offset + 3 + rng.integers(7)] = 1.0
+    return out
+
+def check_accuracy(reference, network, n=2048, seed=0):
+    """
+    Compares two networks (Keras or NumPy, called as model(inputs)) on sample_inputs.
+
+    Returns:
+        dict: the largest absolute differences of the action probabilities and of the raise
+              amounts, and the fraction of inputs where the most likely action agrees.
+    """
+    inputs = sample_inputs(n, seed)
+    (p_ref, m_ref), (p, m) = ([np.asarray(y) for y in model(inputs, training=False)] for model in (reference, network))
+    return {'max_probability_error': float(np.abs(p - p_ref).max()),
+            'max_magnitude_error': float(np.abs(m - m_ref).max()),
+            'action_agreement': float((p.argmax(axis=1) == p_ref.argmax(axis=1)).mean())}
+
+def time_network(network, batch_size=1, repeats=2000):
+    """Average seconds per forward pass of a batch of batch_size."""
+    inputs = sample_inputs(batch_size)
+    for _ in range(repeats // 10): network(inputs, training=False)
+    t_0 = time.perf_counter()
+    for _ in range(repeats): network(inputs, training=False)
+    return (time.perf_counter() - t_0) / repeats
+
+def export_network(model, path, dtype='float32'):
+    """
+    Saves a Keras PokerNet (or a PokerAI's network) for the numpy backend and checks it.
+
+    Args:
+        model: the combined Keras model, a PokerAI, or a NumpyPokerNet.
+        path (str): the .npz file to write.
+        dtype (str): kernel storage, see NumpyPokerNet.save.
+
+    Returns:
+        Tuple[NumpyPokerNet, dict]: the network as loaded back from the file, and check_accuracy against model.
+    """
+    if isinstance(model, PokerAI): model = model.model
+    network = model if isinstance(model, NumpyPokerNet) else NumpyPokerNet.from_keras(model)
+    network.save(path, dtype)
+    exported = NumpyPokerNet.load(path)
+    return exported, check_accuracy(model, exported)
+
+
 # --- Poker AI Class ---
 
 class PokerAI:
-    def __init__(self, player_id):
+    """
+    A player's policy. Nothing is loaded until the first decision (or the first use of a model).
+
+    Args:
+        player_id (int): the Player.idx of the player it decides for.
+        weights (str): weights file for load_network (None: untrained).
+        backend (str): 'keras' or 'numpy' (default: 'keras' if TensorFlow is installed).
+    """
+    def __init__(self, player_id, weights=None, backend=None):
         self.player_id = player_id
-        # Initialize the dual neural network structure
-        self.action_model, self.magnitude_model = self._build_models()
-        print(f"PokerAI initialized for Player ID: {self.player_id}. Input size: {INPUT_VECTOR_SIZE}")
+        self.weights = weights
+        self.backend = backend or ('keras' if tensorflow_available() else 'numpy')
+        self._inputs = np.empty((0, INPUT_VECTOR_SIZE), dtype=np.float32)
+
+    @property
+    def model(self):
+        """The network used for decisions: the combined Keras model or a NumpyPokerNet."""
+        if self.backend == 'numpy': return load_network('numpy', self.weights)
+        return load_network('keras', self.weights)[2]
+
+    @property
+    def action_model(self):
+        return load_network('keras', self.weights)[0]
 
-    def _build_models(self):
+    @property
+    def magnitude_model(self):
+        return load_network('keras', self.weights)[1]
+
+    def _position(self, game):
+        """Index of this AI's player in game.players, which rotates with the button."""
+        return next(i for i, p in enumerate(game.players) if p.idx == self.player_id)
+
+    def _get_input_vector(self, game, player_id=None):
         """
-        Builds the shared-body, dual-head neural network architecture.
-        Policy/Magnitude Network structure: 512 -> 256 -> 128 -> Split Heads.
+        Converts the Game object state into the fixed-size (442) feature vector, as seen by
+        the player at position player_id (default: this AI's player).
         """
-        # --- Shared Body ---
-        input_layer = Input(shape=(INPUT_VECTOR_SIZE,), name='input_layer')
-        
-        # Dense Layers - Increased capacity for high-dimensional input
-        shared_dense_1 = Dense(512, activation='relu', name='shared_dense_1')(input_layer)
-        shared_dense_2 = Dense(256, activation='relu', name='shared_dense_2')(shared_dense_1)
-        shared_dense_3 = Dense(128, activation='relu', name='shared_dense_3')(shared_dense_2)
-        
-        # --- Head 1: Action Policy Network (Fold, Call/Check, Raise) ---
-        action_head = Dense(32, activation='relu', name='action_head_dense')(shared_dense_3)
-        # 3 actions: [Fold, Call/Check, Raise]
-        action_output = Dense(3, activation='softmax', name='action_output')(action_head)
-        
-        action_model = Model(inputs=input_layer, outputs=action_output, name='ActionPolicyNet')
-        
-        # --- Head 2: Magnitude Network (Raise Amount) ---
-        magnitude_head = Dense(32, activation='relu', name='magnitude_head_dense')(shared_dense_3)
-        # 1 output: normalized raise amount (0.0 to 1.0)
-        magnitude_output = Dense(1, activation='sigmoid', name='magnitude_output')(magnitude_head)
-        
-        magnitude_model = Model(inputs=input_layer, outputs=magnitude_output, name='MagnitudeNet')
-
-        # Compilation (We will fine-tune the loss/optimizer during the RL phase)
-        action_model.compile(optimizer='adam', loss='categorical_crossentropy')
-        magnitude_model.compile(optimizer='adam', loss='mse')
-
-        return action_model, magnitude_model
-
-    def _get_input_vector(self, game):
+        if player_id is None: player_id = self._position(game)
+        return encode_state(game, game.players[player_id])
+
+    def predict_batch(self, inputs):
         """
-        Converts the Game object state into the fixed-size (442) feature vector.
-        This is the most crucial part of feature engineering.
+        Runs the shared body once over a batch of input vectors and reads both heads.
+
+        Args:
+            inputs (np.ndarray): (N, INPUT_VECTOR_SIZE) float32 input vectors.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: action probabilities (N, 3) and normalized raise amounts (N,).
         """
-        features = []
-        
-        current_player = game.players[self.player_id]
-        
-        # --- 1. Private Hand Encoding (104 features) ---
-        card1_oh = card_to_one_hot(current_player.hole_cards[0] if current_player.hole_cards else None)
-        card2_oh = card_to_one_hot(current_player.hole_cards[1] if current_player.hole_cards else None)
-        features.extend(card1_oh)
-        features.extend(card2_oh)
-        
-        # --- 2. Community Cards Encoding (260 features) ---
-        community_cards = game.table.cards
-        for i in range(MAX_COMMUNITY_CARDS):
-            card = community_cards[i] if i < len(community_cards) else None
-            features.extend(card_to_one_hot(card))
-
-        # --- 3. Betting Context (8 features) ---
-        
-        # Use simple max/min values for initial normalization bounds (needs refinement based on game type)
-        MAX_POT = 1000 
-        MAX_STACK = 1000
-        
-        # Normalize pot and stacks
-        pot_size_norm = normalize(game.pot, 0, MAX_POT)
-        to_call_norm = normalize(game.total_contribution - current_player.total_contribution, 0, MAX_POT)
-        stack_norm = normalize(current_player.chips, 0, MAX_STACK)
-        # Minimum legal raise amount (can be complex, but for now use total_contribution as a proxy max)
-        min_raise_norm = normalize(game.total_contribution * 2, 0, MAX_POT) 
-        
-        features.extend([pot_size_norm, to_call_norm, stack_norm, min_raise_norm])
-
-        # Stage of the Game (One-hot 4 features: Pre-flop, Flop, Turn, River)
-        stage_oh = np.zeros(4)
-        if   len(game.table.cards)  <  3: stage_oh[0] = 1 # pre flop
-        elif len(game.table.cards)  == 3: stage_oh[1] = 1 # flop
-        elif len(game.table.cards)  == 4: stage_oh[2] = 1 # turn
-        elif len(game.table.cards)  == 5: stage_oh[3] = 1 # river
-        features.extend(stage_oh)
-        
-        # --- 4. Opponent State Encoding (70 features) ---
-        
-        opponents = [p for p in game.players.values() if p.id != self.player_id]
-        
-        opponent_features = []
-        
-        for i in range(MAX_PLAYERS - 1): # 7 opponent slots
-            if i < len(opponents):
-                opponent = opponents[i]
-                
-                # 1. Normalized Stack Size (1 feature)
-                opp_stack_norm = normalize(opponent.chips, 0, MAX_STACK)
-                # 2. Has Folded (1 feature)
-                opp_folded = 1.0 if opponent.folded else 0.0
-                # 3. Normalized Current Bet (1 feature)
-                opp_bet_norm = normalize(opponent.total_contribution, 0, MAX_POT)
-                # 4. Last Action (7 features - simple one-hot encoding for last action)
-                # (e.g., [Check, Call, Bet, Raise, Fold, All-in, None/Initial])
-                last_action_oh = np.zeros(7)
-                # Note: 'last_action' needs to be tracked on the player object for a real implementation
-                # For now, we simulate a simple action state:
-                if opponent.folded:
-                    last_action_oh[4] = 1
-                elif opponent.total_contribution > 0 and opponent.total_contribution == game.total_contribution:
-                    last_action_oh[1] = 1 # Called
-                elif opponent.total_contribution > 0 and opponent.total_contribution > game.total_contribution:
-                    last_action_oh[3] = 1 # Raised
-                else:
-                    last_action_oh[6] = 1 # Unknown/Initial/Checked
-
-                opponent_features.extend([opp_stack_norm, opp_folded, opp_bet_norm])
-                opponent_features.extend(last_action_oh)
-                # Total for one opponent: 1 + 1 + 1 + 7 = 10 features
-            else:
-                # Zero-padding for absent players
-                opponent_features.extend(np.zeros(10)) 
-
-        features.extend(opponent_features)
-        
-        # Final check: the length must exactly match the expected INPUT_VECTOR_SIZE (442)
-        if len(features) != INPUT_VECTOR_SIZE:
-            print(f"ERROR: Feature vector size mismatch. Expected {INPUT_VECTOR_SIZE}, got {len(features)}")
-            # Fallback: Pad or truncate if needed, but this indicates a code bug.
-            
-        return np.array(features, dtype=np.float32)
+        # Calling the model directly skips predict()'s per-call set-up, which dominates at small N
+        action_probabilities, magnitudes = self.model(inputs, training=False)
+        return np.asarray(action_probabilities), np.asarray(magnitudes)[:, 0]
 
-    def get_ai_action(self, game):
+    def _decode_action(self, game, player_id, action_probabilities, normalized_raise, rng=None):
         """
-        The main function to get the AI's action based on the current game state.
-        It uses the dual network approach.
+        Turns the network outputs for one decision into an (action, amount) for game.act.
+        The action is the most likely one, or sampled from the probabilities if an rng
+        (np.random.Generator) is given, as in self-play training.
         """
-        # 1. Transform game state into the input vector
-        input_vector = self._get_input_vector(game)
-        # Reshape for the model: (1, 442)
-        input_vector = input_vector.reshape(1, INPUT_VECTOR_SIZE) 
-
-        # 2. Get the Policy Action (Fold, Call/Check, Raise)
-        action_probabilities = self.action_model.predict(input_vector, verbose=0)[0]
-        
-        # In a real training environment, you would use these probabilities to sample an action.
-        # For a simple deterministic implementation (for testing):
-        action_index = np.argmax(action_probabilities) 
+        player = game.players[player_id]
+        to_call = game.minimum_bet - player.total_contribution
+
+        if rng is None: action_index = np.argmax(action_probabilities)
+        else: action_index = rng.choice(len(action_probabilities), p=action_probabilities / action_probabilities.sum())
 
         if action_index == 0:
             return 'fold', 0 # Fold
-        
+
         elif action_index == 1:
             # Check if we can check (0 to call) or must call
-            to_call = game.total_contribution - game.players[self.player_id].total_contribution
             if to_call == 0:
                 return 'check', 0 # Check
             else:
-                return 'call', to_call # Call
-        
+                return 'call', 0 # Call
+
         elif action_index == 2:
-            # 3. Get the Raise Magnitude if the Policy decided to Raise
-            normalized_raise = self.magnitude_model.predict(input_vector, verbose=0)[0][0]
-            
-            # Convert normalized value (0 to 1) back to a real bet amount.
-            # This is complex in poker (needs to respect minimum raise, stack size, etc.)
-            
-            # Simple example conversion: 
-            # Bet size is between min_raise and max_stack
-            min_raise = game.total_contribution # Placeholder: needs to be true min legal raise
-            max_raise = game.players[self.player_id].chips
-            
+            # Convert normalized value (0 to 1) back to a raise on top of the call.
+            # Bet size is between the minimum raise and the rest of the stack
+            min_raise = game.min_raise
+            max_raise = player.stack - to_call
+            if max_raise <= 0: return 'call', 0 # Not enough chips to raise: call all in
+
             # Linear interpolation of the normalized amount
             raise_amount = min_raise + normalized_raise * (max_raise - min_raise)
-            
+
             # Ensure the raise amount is an integer and at least the minimum required
             # And that it doesn't exceed the player's chips
             final_raise = max(min_raise, int(raise_amount))
@@ -234,4 +436,83 @@ class PokerAI:
 
             return 'raise', final_raise
 
-        return 'check', 0 # Default fallback
\ No newline at end of file
+        return 'check', 0 # Default fallback
+
+    def get_ai_actions(self, decisions, rng=None):
+        """
+        Decides many pending decisions (from any number of tables and seats) in one forward pass.
+
+        Args:
+            decisions (List[Tuple[Game, int]]): (game, position in game.players) for every player to act.
+            rng (np.random.Generator): sample the actions from the policy instead of taking the argmax.
+
+        Returns:
+            List[Tuple[str, int]]: (action, amount) for each decision, in the same order.
+        """
+        if not decisions: return []
+        # Encode into a batch buffer kept between calls (grown as needed)
+        if len(self._inputs) < len(decisions):
+            self._inputs = np.empty((len(decisions), INPUT_VECTOR_SIZE), dtype=np.float32)
+        inputs = encode_states([(game, game.players[player_id]) for game, player_id in decisions], self._inputs)
+        action_probabilities, magnitudes = self.predict_batch(inputs)
+        return [self._decode_action(game, player_id, probs, magnitude, rng)
+                for (game, player_id), probs, magnitude in zip(decisions, action_probabilities, magnitudes)]
+
+    def get_ai_action(self, game):
+        """
+        The main function to get the AI's action based on the current game state.
+        It reads both heads of the dual network from a single forward pass.
+        """
+        return self.get_ai_actions([(game, self._position(game))])[0]
+
+
+# --- Batched Play ---
+# Many headless tables (poker_engine.Engine) are played in lock-step: every table waiting on
+# a decision contributes one row to a single forward pass, and each decision goes back to
+# the table it came from.
+
+def step_tables(ai, engines):
+    """Makes the pending decision of every engine with one, in one batch. Returns the number made."""
+    pending = [engine for engine in engines if engine.to_act is not None]
+    # player_id is the position in engine.players, which rotates with the button (unlike Player.idx)
+    actions = ai.get_ai_actions([(engine, engine.players.index(engine.to_act)) for engine in pending])
+    for engine, (action, amount) in zip(pending, actions):
+        engine.act(action, amount)
+    return len(pending)
+
+def play_tables(ai, engines, n_hands=1):
+    """
+    Plays up to n_hands hands on every engine, batching the decisions across tables.
+    Returns the number of decisions made.
+    """
+    played = {id(engine): 0 for engine in engines}
+    active = [engine for engine in engines if engine.start_hand()]
+    n_decisions = 0
+    while active:
+        n_decisions += step_tables(ai, active)
+        still_active = []
+        for engine in active:
+            if engine.to_act is not None:
+                still_active.append(engine)
+                continue
+            # Hand over: move the button on and deal the next one
+            engine.end_hand()
+            played[id(engine)] += 1
+            if played[id(engine)] < n_hands and engine.start_hand():
+                still_active.append(engine)
+        active = still_active
+    return n_decisions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Export PokerAI weights for the NumPy backend.')
+    parser.add_argument('weights', help = 'Keras weights file (or .npz) to export')
+    parser.add_argument('out', help = '.npz file to write')
+    parser.add_argument('--dtype', default = 'float32', choices = ['float32', 'float16', 'int8'])
+    args = parser.parse_args()
+
+    source = load_network('numpy', args.weights) if args.weights.endswith('.npz') else load_network('keras', args.weights)[2]
+    exported, accuracy = export_network(source, args.out, args.dtype)
+    print(f"{args.out} ({args.dtype}):", ', '.join(f'{k} {v:.2e}' for k, v in accuracy.items()))
+    print(f"NumPy forward pass: {format_time(time_network(exported))} per decision, "
+          f"{format_time(time_network(exported, 256) / 256)} per decision in batches of 256")
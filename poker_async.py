@@ -0,0 +1,201 @@
+import asyncio
+import collections
+import curses
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import poker_lib
+from poker_lib import *
+
+# --- Event-Loop Front-End ---
+# Plays the curses game on an asyncio event loop instead of pacing it with sleeps.
+# The Engine and the drawing code stay synchronous, but while the loop drives the game
+# every present() and pause is recorded in a FrameQueue rather than shown: a render task
+# plays the frames back on schedule, an input task polls the keyboard so that ESC and
+# terminal resizes are handled at once, and bot decisions (or any other slow call, such
+# as an equity estimate) run in an executor while the animation carries on.
+
+KEY_POLL_INTERVAL = 0.01 # seconds between keyboard polls
+MAX_QUEUED_FRAMES = 32   # the game waits for the animation once it is this many frames ahead
+
+
+class FrameQueue:
+    """Frames waiting to be shown, each a [chars, attrs, hold] with the hold in seconds."""
+    def __init__(self):
+        self.frames = collections.deque()
+        self.changed = asyncio.Event()
+        self.idle = asyncio.Event() # set once the last frame has been shown and held
+        self.idle.set()
+        self.cleared = asyncio.Event() # cuts short the hold being played
+
+    def __len__(self):
+        return len(self.frames)
+
+    def push(self, chars, attrs):
+        if self.frames and not self.frames[-1][2]:
+            # The previous frame would be replaced at once, so only the new one is kept
+            self.frames[-1][:2] = chars, attrs
+        else:
+            self.frames.append([chars, attrs, 0.0])
+        self._wake()
+
+    def hold(self, seconds):
+        """Holds the last frame queued (or, with none queued, the one on screen) for 'seconds' more."""
+        if self.frames: self.frames[-1][2] += seconds
+        else: self.frames.append([None, None, seconds])
+        self._wake()
+
+    def clear(self):
+        self.frames.clear()
+        self.cleared.set()
+        self.changed.set()
+
+    def fast_forward(self):
+        """Jumps to the last frame queued, cutting short the hold being played (for instant speed)."""
+        last = next((f for f in reversed(self.frames) if f[0] is not None), None)
+        self.frames.clear()
+        if last: self.frames.append([last[0], last[1], 0.0])
+        self.cleared.set()
+        self._wake()
+
+    def _wake(self):
+        self.idle.clear()
+        self.changed.set()
+
+
+class AsyncTUI:
+    """
+    Drives a curses Game (already set up, see Game.__init__) on the running event loop.
+
+    Args:
+        game (Game): a Game with a visualizer.
+        executor: where bot decisions run (default: a single worker thread, so decisions
+                  keep their order and never overlap).
+    """
+    def __init__(self, game, executor = None):
+        self.game = game
+        self.visualizer = game.visualizer
+        self.executor = executor or ThreadPoolExecutor(max_workers = 1)
+        self.frames = None
+
+    async def run(self, max_rounds = 50):
+        self.frames = FrameQueue()
+        self.visualizer.frames = self.frames
+        tasks = [asyncio.create_task(self._render()), asyncio.create_task(self._poll_keys())]
+        try:
+            await self._play(max_rounds)
+            await self.drain()
+        finally:
+            for task in tasks: task.cancel()
+            await asyncio.gather(*tasks, return_exceptions = True)
+            self.visualizer.frames = None
+            self.visualizer.present()
+            self.executor.shutdown(wait = False)
+
+    async def run_in_executor(self, fn, *args):
+        """Runs fn(*args) off the event loop, so the animation keeps playing meanwhile."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def drain(self):
+        """Waits until every queued frame has been shown."""
+        await self.frames.idle.wait()
+
+    # --- Tasks ---
+
+    async def _play(self, max_rounds):
+        game = self.game
+        while game.running and game.n_rounds < max_rounds:
+            if len([p for p in game.players if not p.is_out]) < 3:
+                game.running = False
+                game.end_game()
+                break
+            if not game.start_hand(): break
+            while game.running and game.to_act is not None:
+                player = game.to_act
+                if player.is_human:
+                    # The prompt blocks and reads the keyboard itself, so the table is brought up to date first
+                    await self.drain()
+                    if not game.running: break
+                    with self.visualizer.direct():
+                        action, amount = player.get_action(game)
+                else:
+                    action, amount = await self.run_in_executor(player.get_action, game)
+                if not game.running: break
+                game.act(action, amount)
+                await self._throttle()
+            if not game.running: break
+            game.end_hand()
+            if game._check_for_quit(): break
+            await self._throttle()
+
+    async def _throttle(self):
+        """Lets the other tasks run, and waits while the game is too far ahead of the animation."""
+        await asyncio.sleep(0)
+        while len(self.frames) > MAX_QUEUED_FRAMES:
+            self.frames.changed.clear()
+            await self.frames.changed.wait()
+
+    async def _render(self):
+        frames = self.frames
+        while True:
+            if not frames.frames:
+                frames.idle.set()
+                frames.changed.clear()
+                await frames.changed.wait()
+                continue
+            chars, attrs, hold = frames.frames.popleft()
+            frames.changed.set() # room in the queue for _throttle
+            if chars is not None: self.visualizer._write(chars, attrs)
+            if hold:
+                frames.cleared.clear()
+                try:
+                    await asyncio.wait_for(frames.cleared.wait(), hold)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _poll_keys(self):
+        visualizer = self.visualizer
+        while True:
+            key = visualizer.poll_key()
+            if key == curses.KEY_RESIZE: self._resize()
+            elif visualizer.handle_key(key):
+                if visualizer.quit_requested: self._quit()
+                elif visualizer.instant: self.frames.fast_forward()
+            await asyncio.sleep(KEY_POLL_INTERVAL)
+
+    def _quit(self):
+        """ESC: drops the frames still to be shown and stops the game after the current decision."""
+        self.visualizer.quit_requested = True
+        self.game.running = False
+        self.frames.clear()
+        self.visualizer.addstr(0, self.visualizer.max_x - UIConfig.MARGIN_X - len(EXIT_MSG), "Quitting game...".ljust(len(EXIT_MSG)))
+
+    def _resize(self):
+        """The queued frames were laid out for the old size, so they are dropped and the table is redrawn."""
+        self.frames.clear()
+        self.game.redraw()
+
+
+def main_tui_async(stdscr, n_players = 5, buyin = 100, sb = 2, max_rounds = 50):
+    """
+    The Curses entry point for the event-loop front-end: the game is set up (animation
+    and player prompts) as in main_tui, then played by an AsyncTUI.
+    """
+    try:
+        game = Game(buyin = buyin, sb = sb, stdscr = stdscr)
+        asyncio.run(AsyncTUI(game).run(max_rounds = max_rounds))
+    except Exception:
+        poker_lib.CURSES_ERROR_TRACEBACK = traceback.format_exc()
+        raise
+
+
+def poker_tui_async(**kwargs):
+    """Wrapper function to initialize and terminate curses safely."""
+    if not sys.stdout.isatty():
+        print("Error: Not running in a proper terminal environment for curses.")
+        return
+    curses.wrapper(main_tui_async, **kwargs)
+
+
+if __name__ == '__main__':
+    poker_tui_async()
@@ -0,0 +1,329 @@
+import argparse
+import curses
+import json
+import os
+import random
+import statistics
+import sys
+import timeit
+from contextlib import ExitStack, nullcontext
+from typing import List
+from unittest import mock
+import numpy as np
+from card_ascii import _overlap_art, art_lines, combine_cards, overlap_cards
+from poker_ai import PokerAI
+from poker_engine import BasePlayer, Engine, resolve_showdown
+from poker_hands import *
+from poker_utils import format_time
+
+# --- Benchmarks ---
+# Times the hot paths of the game (hand evaluation, pots and showdown, card art, drawing,
+# AI input encoding and whole headless hands) and compares them with stored baselines.
+#
+#   python poker_bench.py               run every benchmark and compare with the baselines
+#   python poker_bench.py pots hand     only the benchmarks whose names contain 'pots' or 'hand'
+#   python poker_bench.py --save        store the results as the new baselines
+#
+# Each benchmark is timed over REPEATS runs of as many calls as fill about RUN_TIME seconds,
+# and reported as the calls per second of its best run (noise only ever slows a run down)
+# with the spread (standard deviation) of the runs. The benchmarks take turns run by run, so
+# a slow spell of the machine is shared out rather than landing on every run of one of them.
+# A plain Python workload (REFERENCE) takes its turn too, and the baselines are scaled by how
+# fast it runs now compared with when they were stored, so a machine that is slower as a
+# whole (busy, throttled, a noisy neighbour) doesn't show up as regressions.
+#
+# A benchmark is a regression when it drops below its scaled baseline by more than the
+# threshold plus its spread, and the runner then exits with status 1. Baselines are machine
+# specific: store them (--save) on the machine that checks for regressions before comparing.
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baselines.json')
+REGRESSION_THRESHOLD = 0.2 # fraction of the baseline's calls per second that may be lost (beyond the spread)
+REPEATS = 9
+RUN_TIME = 0.25 # seconds per run
+REFERENCE = 'reference' # the benchmark that gauges the machine's speed
+
+BENCHMARKS = {} # name -> (set-up function, context), in the order they are defined
+
+
+def benchmark(name, context = nullcontext):
+    """
+    Registers a set-up function: it builds the inputs and returns the call to be timed.
+
+    Args:
+        context: returns a context manager entered around the set-up and the timing.
+    """
+    def register(setup):
+        BENCHMARKS[name] = (setup, context)
+        return setup
+    return register
+
+
+class BenchResult:
+    def __init__(self, name, rates):
+        self.name = name
+        self.rates = rates # calls per second of each run
+
+    @property
+    def ops(self) -> float:
+        """Calls per second of the best run."""
+        return max(self.rates)
+
+    @property
+    def spread(self) -> float:
+        """Standard deviation of the runs, as a fraction of their median."""
+        return statistics.stdev(self.rates) / statistics.median(self.rates) if len(self.rates) > 1 else 0.0
+
+    def __repr__(self):
+        return f"BenchResult({self.name}, {self.ops:.0f} ops/s ± {self.spread:.1%})"
+
+
+def measure(names, repeats = REPEATS, run_time = RUN_TIME) -> List[BenchResult]:
+    """Times the benchmarks, taking turns: each round runs every one of them once."""
+    with ExitStack() as contexts:
+        timers = []
+        for name in names:
+            setup, context = BENCHMARKS[name]
+            contexts.enter_context(context())
+            timer = timeit.Timer(setup())
+            number, elapsed = timer.autorange()
+            timers.append((timer, max(1, int(number * run_time / elapsed))))
+        rates = [[] for _ in names]
+        for _ in range(repeats):
+            for (timer, number), runs in zip(timers, rates): runs.append(number / timer.timeit(number))
+    return [BenchResult(name, runs) for name, runs in zip(names, rates)]
+
+
+# --- Inputs ---
+
+def _random_hands(n, n_cards, seed = 0):
+    """n hands of n_cards distinct card ids."""
+    rng = random.Random(seed)
+    return [rng.sample(range(N_CARDS), n_cards) for _ in range(n)]
+
+def _cycle(items):
+    """A call that returns the items one after another, round and round."""
+    state = {'i': 0}
+    def next_item():
+        i = state['i']
+        state['i'] = (i + 1) % len(items)
+        return items[i]
+    return next_item
+
+def _bots(n):
+    return [BasePlayer(i, name = f'Bot #{i+1}') for i in range(n)]
+
+def _side_pot_engine():
+    """An Engine at the end of a pre-flop round with three all-ins of different sizes, i.e. four pots."""
+    players = _bots(6)
+    engine = Engine(players, sb = 2, buyin = 100, seed = 0)
+    for p, stack in zip(players, (100, 100, 100, 20, 45, 70)): p.stack = stack
+    engine.start_hand()
+    while engine.to_act is not None and engine.street == 'preflop':
+        player = engine.to_act
+        engine.act('raise', player.stack) if player.idx >= 3 else engine.act('call')
+    return engine
+
+
+class _FakeScreen:
+    """Stands in for the curses screen: the size of the ideal terminal, and writes that go nowhere."""
+    def __init__(self, rows = 50, cols = 200):
+        self.size = (rows, cols)
+
+    def getmaxyx(self):
+        return self.size
+
+    def addnstr(self, *args): pass
+    def noutrefresh(self): pass
+    def refresh(self): pass
+    def clear(self): pass
+    def nodelay(self, flag): pass
+    def timeout(self, delay): pass
+    def bkgd(self, *args): pass
+    def chgat(self, *args): pass
+    def getch(self): return -1
+
+
+def _fake_curses():
+    """Lets a Visualizer run without a terminal, while in effect: the curses calls it makes outside the screen do nothing."""
+    return mock.patch.multiple(curses, create = True, color_pair = lambda n: n << 8, has_colors = lambda: False,
+                               curs_set = lambda visibility: None, set_escdelay = lambda ms: None, doupdate = lambda: None)
+
+
+# --- Reference ---
+
+@benchmark(REFERENCE)
+def bench_reference():
+    """Plain Python (a loop, dict and list work, calls) that none of the game's code changes."""
+    def work():
+        counts = {}
+        for i in range(200): counts[i % 17] = counts.get(i % 17, 0) + i
+        return sorted(counts.values())
+    return work
+
+# --- Hands ---
+
+@benchmark('get_poker_hand_rank')
+def bench_get_poker_hand_rank():
+    hands = [[(CARD_RANKS[c], CARD_SUITS[c]) for c in hand] for hand in _random_hands(1000, 5)]
+    next_hand = _cycle(hands)
+    return lambda: get_poker_hand_rank(next_hand())
+
+@benchmark('get_best_5_card_hand')
+def bench_get_best_5_card_hand():
+    next_hand = _cycle(_random_hands(1000, 7))
+    return lambda: get_best_5_card_hand(next_hand())
+
+@benchmark('evaluate_hand')
+def bench_evaluate_hand():
+    next_hand = _cycle(_random_hands(1000, 7))
+    return lambda: evaluate_hand(next_hand())
+
+@benchmark('evaluate_batch')
+def bench_evaluate_batch():
+    """10,000 seven-card hands per call."""
+    cards = np.array(_random_hands(10000, 7))
+    return lambda: evaluate_batch(cards)
+
+@benchmark('rank_players')
+def bench_rank_players():
+    players = _bots(8)
+    for p, hand in zip(players, _random_hands(8, 7)): p.score = evaluate_hand(hand)
+    return lambda: rank_players(players)
+
+# --- Pots and Showdown ---
+
+@benchmark('distribute_chips_to_pots')
+def bench_distribute_chips_to_pots():
+    return _side_pot_engine().distribute_chips_to_pots
+
+@benchmark('resolve_showdown')
+def bench_resolve_showdown():
+    engine = _side_pot_engine()
+    engine.distribute_chips_to_pots()
+    strengths = [evaluate_hand(hand) for hand in _random_hands(len(engine.players), 7)]
+    return lambda: resolve_showdown(strengths, engine.table.pots, engine.rng)
+
+# --- Cards and Drawing ---
+
+@benchmark('DeckOfCards')
+def bench_deck():
+    from poker_lib import DeckOfCards
+    return DeckOfCards
+
+@benchmark('combine_cards')
+def bench_combine_cards():
+    """
+    A winner's panel (the best five and the two discarded) of a different hand each call,
+    uncached: the composed-art caches are cleared first, so the art is built every time.
+    """
+    next_cards = _cycle(_random_hands(1000, 7))
+    def combine():
+        art_lines.cache_clear()
+        _overlap_art.cache_clear()
+        cards = next_cards()
+        return combine_cards(cards[:5], discarded_cards = cards[5:], overlap = (0, 1))
+    return combine
+
+@benchmark('overlap_cards')
+def bench_overlap_cards():
+    """A different pair of hole cards each call, uncached: the overlap is composed every time."""
+    next_cards = _cycle(_random_hands(1000, 2))
+    def overlap():
+        _overlap_art.cache_clear()
+        return overlap_cards(next_cards())
+    return overlap
+
+@benchmark('Visualizer.addstr', context = _fake_curses)
+def bench_addstr():
+    """
+    Draws the art of a different hand each call (so every call draws and presents), uncached:
+    the Visualizer's parsed-line cache is cleared first, so every line is parsed.
+    """
+    from poker_ui import Visualizer
+    visualizer = Visualizer(_FakeScreen())
+    next_art = _cycle([combine_cards(hand) for hand in _random_hands(200, 5)])
+    def draw():
+        visualizer._parse_line.cache_clear()
+        return visualizer.addstr(10, 20, next_art())
+    return draw
+
+# --- AI and Whole Hands ---
+
+@benchmark('PokerAI._get_input_vector')
+def bench_get_input_vector():
+    engine = Engine(_bots(6), sb = 2, buyin = 100, seed = 0)
+    engine.start_hand()
+    engine.act('raise', 10)
+    engine.act('call')
+    ai = PokerAI(engine.to_act.idx, backend = 'numpy')
+    position = engine.players.index(engine.to_act)
+    return lambda: ai._get_input_vector(engine, position)
+
+@benchmark('headless hand')
+def bench_headless_hand():
+    """One hand of six placeholder bots (calls per second is hands per second)."""
+    state = {'engine': None, 'seed': 0}
+    def play():
+        if state['engine'] is None or not state['engine'].play_hand():
+            state['seed'] += 1
+            state['engine'] = Engine(_bots(6), sb = 2, buyin = 100, seed = state['seed'])
+    return play
+
+
+# --- Runner ---
+
+def load_baselines(path = BASELINE_FILE) -> dict:
+    if not os.path.exists(path): return {}
+    with open(path) as f: return json.load(f)
+
+def save_baselines(results, path = BASELINE_FILE):
+    baselines = load_baselines(path)
+    baselines.update({r.name: round(r.ops, 1) for r in results})
+    with open(path, 'w') as f: f.write(json.dumps(baselines, indent = 2) + '\n')
+
+def run(names = None, baselines = None, threshold = REGRESSION_THRESHOLD, verbose = True):
+    """
+    Runs the benchmarks (all, or those whose names contain one of 'names'), with the
+    reference, and compares them with 'baselines' (name -> calls per second).
+
+    Returns:
+        Tuple[List[BenchResult], List[str]]: the results (the reference first), and the names
+        of the regressions.
+    """
+    selected = [name for name in BENCHMARKS if name != REFERENCE and (not names or any(n.lower() in name.lower() for n in names))]
+    baselines = baselines or {}
+    results, regressions = measure([REFERENCE] + selected), []
+    # How fast the machine runs now compared with when the baselines were stored
+    speed = results[0].ops / baselines[REFERENCE] if REFERENCE in baselines else 1.0
+    if verbose: print(f"{'benchmark':<28}{'ops/s':>14}{'spread':>9}{'per call':>12}{'baseline':>14}{'change':>9}")
+    for result in results:
+        name = result.name
+        line = f"{name:<28}{result.ops:>14,.0f}{result.spread:>9.1%}{format_time(1 / result.ops):>12}"
+        if name == REFERENCE and name in baselines:
+            line += f"{baselines[name]:>14,.0f}{speed - 1:>+9.1%}  (baselines scaled by this)"
+        elif name in baselines:
+            change = result.ops / (baselines[name] * speed) - 1
+            line += f"{baselines[name] * speed:>14,.0f}{change:>+9.1%}"
+            if -change > threshold + result.spread:
+                regressions.append(name)
+                line += '  REGRESSION'
+        if verbose: print(line)
+    return results, regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Benchmark the hot paths of the game against stored baselines.')
+    parser.add_argument('names', nargs = '*', help = 'run only the benchmarks whose names contain one of these')
+    parser.add_argument('--save', action = 'store_true', help = 'store the results as the new baselines')
+    parser.add_argument('--threshold', type = float, default = REGRESSION_THRESHOLD,
+                        help = 'slow-down (fraction of the baseline) that counts as a regression')
+    parser.add_argument('--baselines', default = BASELINE_FILE)
+    args = parser.parse_args()
+
+    results, regressions = run(args.names, load_baselines(args.baselines), args.threshold)
+    if args.save:
+        save_baselines(results, args.baselines)
+        print(f"Baselines saved to {args.baselines}")
+    elif regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
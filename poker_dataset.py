@@ -0,0 +1,236 @@
+import argparse
+import os
+import queue
+import threading
+import time
+import numpy as np
+from poker_ai import INPUT_VECTOR_SIZE, encode_state
+from poker_history import read_hands
+from poker_utils import format_time
+
+# --- Training Dataset ---
+# Turns hand histories (see poker_history) into PokerAI training examples. build_dataset()
+# replays every recorded hand, encodes the state before each decision with encode_state
+# and writes one row per decision to .npy files in a directory:
+#   states.npy      float32 (N, INPUT_VECTOR_SIZE)  the input vector of the player to act
+#   actions.npy     int8 (N,)      index of the action head: 0 fold, 1 check/call, 2 raise
+#   magnitudes.npy  float32 (N,)   raise on top of the call, normalized as in PokerAI._decode_action (0 if no raise)
+#   rewards.npy     float32 (N,)   the acting player's net chips for the whole hand
+# HandDataset memory-maps the files, so a dataset far larger than RAM can be trained on:
+# only the rows of the batches in flight are ever read.
+
+ARRAYS = ('states', 'actions', 'magnitudes', 'rewards')
+ACTION_INDEX = {'fold': 0, 'check': 1, 'call': 1, 'raise': 2}
+BLINDS = ('small blind', 'big blind')
+STREET_CARDS = {'preflop': 0, 'flop': 3, 'turn': 4, 'river': 5}
+
+
+class _Seat:
+    """The attributes of a Player that encode_state reads, rebuilt from a HandRecord."""
+    def __init__(self, seat):
+        self.idx = seat.seat
+        self.hand = seat.cards
+        self.stack = seat.stack
+        self.total_contribution = 0.0
+        self.folded = False
+        self.last_raised = False
+
+
+class _Table:
+    def __init__(self):
+        self.cards = []
+
+
+class _Replay:
+    """The attributes of an Engine that encode_state reads, stepped through one recorded hand."""
+    def __init__(self, record):
+        self.players = [_Seat(s) for s in record.seats]
+        self.table = _Table()
+        self.min_raise = record.sb # the Engine's minimum raise is the small blind
+        self.minimum_bet = 0.0
+        self.street = 'preflop'
+
+
+def replay_decisions(record):
+    """
+    Yields (game, player, action) for every decision of a recorded hand, with game and player
+    in the state they were in just before it (duck-typed for encode_state). The blinds are
+    applied but not yielded.
+    """
+    game = _Replay(record)
+    seats = {p.idx: p for p in game.players}
+    for a in record.actions:
+        player = seats[a.seat]
+        if a.street != game.street:
+            # A new betting round: the bet to match is the largest contribution so far
+            game.street = a.street
+            game.table.cards = record.board[:STREET_CARDS[a.street]]
+            game.minimum_bet = max(p.total_contribution for p in game.players)
+        if a.action not in BLINDS: yield game, player, a
+        player.stack -= a.bet
+        player.total_contribution += a.bet
+        if a.action == 'fold':
+            player.folded = True
+        elif a.action == 'big blind' or (a.action == 'raise' and player.total_contribution > game.minimum_bet):
+            game.minimum_bet = max(game.minimum_bet, player.total_contribution)
+            for p in game.players: p.last_raised = False
+            player.last_raised = True
+        if a.action == 'big blind': game.minimum_bet = record.bb
+
+
+def raise_magnitude(game, player, amount) -> float:
+    """Inverse of the raise decoding in PokerAI._decode_action: the normalized raise (0 to 1)."""
+    to_call = game.minimum_bet - player.total_contribution
+    max_raise = player.stack - to_call
+    if max_raise <= game.min_raise: return 1.0
+    return min(1.0, max(0.0, (amount - game.min_raise) / (max_raise - game.min_raise)))
+
+
+def count_decisions(paths) -> int:
+    return sum(sum(1 for a in record.actions if a.action not in BLINDS) for path in paths for record in read_hands(path))
+
+
+def build_dataset(paths, directory, verbose = True):
+    """
+    Encodes every decision in the given hand history files into a dataset directory.
+    The arrays are written through memory maps, one hand at a time, so memory use stays flat.
+
+    Args:
+        paths (List[str]): hand history files, in either format.
+        directory (str): output directory (created if needed); existing arrays are replaced.
+
+    Returns:
+        int: the number of decisions written.
+    """
+    t_0 = time.time()
+    n = count_decisions(paths) # a first pass sizes the arrays
+    os.makedirs(directory, exist_ok = True)
+    open_array = lambda name, dtype, shape: np.lib.format.open_memmap(os.path.join(directory, name + '.npy'), mode = 'w+', dtype = dtype, shape = shape)
+    states = open_array('states', np.float32, (n, INPUT_VECTOR_SIZE))
+    actions = open_array('actions', np.int8, (n,))
+    magnitudes = open_array('magnitudes', np.float32, (n,))
+    rewards = open_array('rewards', np.float32, (n,))
+
+    row = 0
+    for path in paths:
+        for record in read_hands(path):
+            start = row
+            acting = []
+            for game, player, a in replay_decisions(record):
+                encode_state(game, player, states[row])
+                actions[row] = ACTION_INDEX[a.action]
+                magnitudes[row] = raise_magnitude(game, player, a.amount) if a.action == 'raise' else 0.0
+                acting.append(player.idx)
+                row += 1
+            # Each decision is rewarded with its player's result for the hand
+            net = {s.seat: s.won for s in record.seats}
+            for a in record.actions: net[a.seat] -= a.bet
+            rewards[start:row] = [net[seat] for seat in acting]
+
+    for array in (states, actions, magnitudes, rewards): array.flush()
+    if verbose: print(f"{row} decisions from {len(paths)} file(s) in {format_time(time.time() - t_0)} -> {directory}")
+    return row
+
+
+class HandDataset:
+    """
+    A dataset directory written by build_dataset, memory-mapped.
+
+        dataset = HandDataset('data/')
+        for states, actions, magnitudes, rewards in dataset.batches(1024, seed = 0):
+            ...
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        for name in ARRAYS:
+            setattr(self, name, np.load(os.path.join(directory, name + '.npy'), mmap_mode = 'r'))
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __getitem__(self, index):
+        return tuple(getattr(self, name)[index] for name in ARRAYS)
+
+    def batches(self, batch_size = 1024, shuffle = True, seed = None, prefetch = 2, drop_last = False):
+        """
+        Yields (states, actions, magnitudes, rewards) batches of NumPy arrays.
+
+        Args:
+            batch_size (int): rows per batch.
+            shuffle (bool): visit the rows in a random order (a new one per call). Without
+                            shuffling and prefetching each batch is a slice of the memory
+                            maps, i.e. no copy.
+            seed (int): seed of the shuffle.
+            prefetch (int): batches read ahead by a background thread (0 reads in the caller).
+            drop_last (bool): skip the last, smaller batch.
+        """
+        n = len(self)
+        order = np.random.default_rng(seed).permutation(n) if shuffle else None
+        stop = n - n % batch_size if drop_last else n
+
+        def read():
+            for start in range(0, stop, batch_size):
+                if order is None:
+                    yield self[start:start + batch_size]
+                else:
+                    # Sorted indices read the file front to back; the order within a batch doesn't matter
+                    yield self[np.sort(order[start:start + batch_size])]
+
+        if not prefetch:
+            yield from read()
+            return
+        yield from _prefetch(read(), prefetch)
+
+    def tf_dataset(self, batch_size = 1024, shuffle = True, seed = None):
+        """The batches as a tf.data.Dataset of (states, actions, magnitudes, rewards), prefetched by tf.data."""
+        import tensorflow as tf
+        signature = (tf.TensorSpec((None, INPUT_VECTOR_SIZE), tf.float32), tf.TensorSpec((None,), tf.int8),
+                     tf.TensorSpec((None,), tf.float32), tf.TensorSpec((None,), tf.float32))
+        dataset = tf.data.Dataset.from_generator(lambda: self.batches(batch_size, shuffle, seed, prefetch = 0),
+                                                 output_signature = signature)
+        return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+_END = object()
+
+def _prefetch(iterator, size):
+    """Runs 'iterator' in a background thread, keeping up to 'size' items ready."""
+    items = queue.Queue(maxsize = size)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterator:
+                # Copy slices of the memory maps here, so the reads from disk happen off the
+                # training thread (the rows of a shuffled batch have been read already)
+                item = tuple(np.array(a) if isinstance(a, np.memmap) else a for a in item)
+                while not stop.is_set():
+                    try:
+                        items.put(item, timeout = 0.1)
+                        break
+                    except queue.Full:
+                        pass
+                if stop.is_set(): return
+        except BaseException as e:
+            items.put(e)
+            return
+        items.put(_END)
+
+    thread = threading.Thread(target = produce, daemon = True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _END: return
+            if isinstance(item, BaseException): raise item
+            yield item
+    finally:
+        stop.set()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Build a PokerAI training dataset from hand history files.')
+    parser.add_argument('paths', nargs = '+')
+    parser.add_argument('--out', default = 'dataset')
+    args = parser.parse_args()
+    build_dataset(args.paths, args.out)
@@ -0,0 +1,642 @@
+import random
+from typing import List
+from poker_hands import *
+
+# --- Headless Poker Engine ---
+# The rules of the game (blinds, betting, side pots, showdown) as a state machine with
+# no I/O, no sleeps and no string formatting. Front-ends (the curses TUI and the console
+# in poker_lib.Game) follow the game by subscribing observers; anything that only needs
+# to play (simulations, bot training) drives the Engine directly.
+#
+# Observers are plain objects with any of these methods, each called with the engine first:
+#   on_hand_start(engine)
+#   on_deal(engine)                                  hole cards have been dealt
+#   on_post(engine, player, role, amount)            role: 'dealer', 'small blind', 'big blind'
+#   on_betting_round(engine, street)                 street: 'preflop', 'flop', 'turn', 'river'
+#   on_action(engine, player, action, amount, bet)   amount: raise requested, bet: chips put in
+#   on_pots(engine)                                  a betting round ended, table.pots brought up to date
+#   on_street(engine, street)                        flop/turn/river cards are on the table
+#   on_showdown(engine)                              showdown starts
+#   on_reveal(engine, player, i, order)              the i-th hand of 'order' is shown
+#   on_pot_won(engine, pot_idx, pot, player, winnings)
+#   on_pot_unclaimed(engine, pot_idx, pot)
+#   on_hand_end(engine)                              pots have been paid out
+#   on_eliminated(engine, player)
+#   on_game_over(engine)
+
+STREETS = ('preflop', 'flop', 'turn', 'river')
+
+
+# --- Chips ---
+# Chips are counted in integer units (CHIP_UNITS to a chip, i.e. pennies of the £ shown) by
+# the Engine's ChipLedger, so no amount ever drifts however many hands are played. Player.stack
+# and Player.total_contribution are still plain numbers of chips for display and the AI, but
+# they are set from the ledger's integers rather than accumulated.
+
+CHIP_UNITS = 100
+
+def to_units(chips) -> int:
+    return round(chips * CHIP_UNITS)
+
+def from_units(units: int) -> float:
+    return units / CHIP_UNITS
+
+def split_pot(units: int, n_winners: int) -> List[int]:
+    """
+    Shares of a pot among n_winners, in units. Whole chips are shared out and the odd ones go
+    one each to the first shares; the first share also takes any fraction of a chip.
+    """
+    chips, fraction = divmod(units, CHIP_UNITS)
+    base, odd = divmod(chips, n_winners)
+    shares = [(base + (k < odd)) * CHIP_UNITS for k in range(n_winners)]
+    shares[0] += fraction
+    return shares
+
+
+class Pot:
+    def __init__(self, eligible_players, amount: float = 0.0, cap: float = float('inf'), mask: int = 0):
+        self.eligible_players = eligible_players # List of players who can win this pot
+        self.units = to_units(amount)            # Total chips in this pot, in CHIP_UNITS
+        self.cap_units = None if cap == float('inf') else to_units(cap) # Max contribution from any player to this pot
+        self.mask = mask                         # Bitmask of the ChipLedger seats who can win this pot
+
+    @property
+    def amount(self) -> float:
+        return from_units(self.units)
+
+    @property
+    def cap(self) -> float:
+        return float('inf') if self.cap_units is None else from_units(self.cap_units)
+
+    def __repr__(self):
+        names = ", ".join([p.name for p in self.eligible_players])
+        return f"Pot(amount={self.amount:.2f}, cap={self.cap:.2f}, eligible=[{names}])"
+
+
+class ChipLedger:
+    """
+    The chips of one hand in integer units: every seat's stack and contribution, and the pots.
+
+    Seats are the positions in engine.players when the hand starts. The pots are tiers of
+    contribution, in order: each all-in level caps the pot below it and the last pot is
+    uncapped. They are kept up to date as the chips go in, so each change costs one pass over
+    the pots (at most one per player) and nothing is ever rebuilt:
+      put_in   spreads the chips over the tiers they reach
+      all-in   splits the tier holding the player's level in two, and clears the player's
+               bit from the pots above it
+      fold     clears the player's bit from every pot; the chips stay where they are
+    """
+    def __init__(self):
+        self.players = []
+        self.stacks = []      # units behind, per seat
+        self.contributed = [] # units put in this hand, per seat
+        self.pots = []        # List[Pot], capped tiers in order, then the uncapped one
+        self.total = 0        # units at the table, conserved through the hand
+        self._seats = {}      # id(player) -> seat
+
+    def start_hand(self, players):
+        self.players = list(players)
+        self._seats = {id(p): i for i, p in enumerate(players)}
+        self.stacks = [to_units(p.stack) for p in players]
+        self.contributed = [0] * len(players)
+        self.total = sum(self.stacks)
+        self.pots = [Pot([], mask = sum(1 << i for i, p in enumerate(players) if not p.is_out))]
+        for p, units in zip(players, self.stacks): p.stack = from_units(units)
+
+    def seat(self, player) -> int:
+        return self._seats[id(player)]
+
+    def put_in(self, player, units) -> int:
+        """Moves up to 'units' from the player's stack into the pots; returns the units moved."""
+        i = self._seats[id(player)]
+        units = min(units, self.stacks[i])
+        if units <= 0: return 0
+        old = self.contributed[i]
+        new = self.contributed[i] = old + units
+        self.stacks[i] -= units
+        player.stack, player.total_contribution = from_units(self.stacks[i]), from_units(new)
+
+        low = 0
+        for pot in self.pots:
+            high = new if pot.cap_units is None else pot.cap_units
+            if high > old: pot.units += min(new, high) - max(old, low)
+            if new <= high: break
+            low = high
+        if self.stacks[i] == 0: self._all_in(i, new)
+        return units
+
+    def _all_in(self, i, level):
+        low = 0
+        for k, pot in enumerate(self.pots):
+            high = pot.cap_units
+            if high is None or level < high:
+                # The level falls inside this tier: the chips up to it become a pot of their own
+                lower = Pot([], mask = pot.mask)
+                lower.cap_units = level
+                lower.units = sum(min(c, level) - low for c in self.contributed if c > low)
+                pot.units -= lower.units
+                self.pots.insert(k, lower)
+                break
+            if level == high: break
+            low = high
+        for pot in self.pots[k + 1:]: pot.mask &= ~(1 << i)
+
+    def fold(self, player):
+        bit = ~(1 << self._seats[id(player)])
+        for pot in self.pots: pot.mask &= bit
+
+    def award(self, player, units):
+        i = self._seats[id(player)]
+        self.stacks[i] += units
+        player.stack = from_units(self.stacks[i])
+
+    def pots_in_play(self) -> List[Pot]:
+        """
+        The pots with chips in them, with their eligible_players filled in from the masks.
+        A tier whose players have all folded (the last of them folding to an all-in player)
+        is nobody's to win, so its chips go down into the pot below.
+        """
+        pots = []
+        for pot in self.pots:
+            if pots and not pot.mask and pot.units:
+                pots[-1].units += pot.units
+                pot.units = 0
+            if pot.units: pots.append(pot)
+        for pot in pots:
+            pot.eligible_players = [p for i, p in enumerate(self.players) if pot.mask >> i & 1]
+        return pots
+
+    def check(self):
+        """Asserts that the pots hold exactly the chips put in, and no chip was made or lost."""
+        contributed = sum(self.contributed)
+        assert sum(pot.units for pot in self.pots) == contributed
+        assert sum(self.stacks) + contributed == self.total
+
+
+# --- Showdown ---
+
+class ShowdownResult:
+    """The outcome of a showdown per ChipLedger seat, as paid by the Engine and shown by the front-ends."""
+    def __init__(self, strengths, ranks, payouts, awards, unclaimed):
+        self.strengths = strengths # integer hand strength (poker_hands.evaluate_hand), 0 if not in the showdown
+        self.ranks = ranks         # 0-based rank, tied seats sharing one (as poker_hands.rank_players)
+        self.payouts = payouts     # units won over all the pots
+        self.awards = awards       # (pot index, seat, units) of every share of every pot, in pot order
+        self.unclaimed = unclaimed # indices of the pots nobody could win
+
+    def __repr__(self):
+        return f"ShowdownResult(payouts={self.payouts}, ranks={self.ranks})"
+
+
+def resolve_showdown(strengths, pots, rng = None) -> ShowdownResult:
+    """
+    Finds the winners of every pot and splits it, in one pass. The seats are sorted by strength
+    once; the winners of a pot are then the first seats in that order whose bit is in its mask.
+
+    Args:
+        strengths (List[int]): hand strength per seat, 0 for seats not in the showdown.
+        pots (List[Pot]): the pots; only .mask and .units are read.
+        rng (random.Random): draws who gets the odd chips of a split pot (by default the first winners by seat).
+    """
+    n = len(strengths)
+    order = sorted(range(n), key = strengths.__getitem__, reverse = True)
+    ranks = [0] * n
+    for k in range(1, n):
+        ranks[order[k]] = ranks[order[k-1]] if strengths[order[k]] == strengths[order[k-1]] else k
+
+    payouts, awards, unclaimed = [0] * n, [], []
+    for i, pot in enumerate(pots):
+        winners, best = 0, None
+        for seat in order:
+            if not pot.mask >> seat & 1: continue
+            if best is None: best = strengths[seat]
+            elif strengths[seat] != best: break
+            winners |= 1 << seat
+        if not winners:
+            unclaimed.append(i)
+            continue
+        seats = [seat for seat in range(n) if winners >> seat & 1]
+        lucky_order = seats[:]
+        if rng: rng.shuffle(lucky_order)
+        shares = dict(zip(lucky_order, split_pot(pot.units, len(seats))))
+        for seat in seats:
+            payouts[seat] += shares[seat]
+            awards.append((i, seat, shares[seat]))
+    return ShowdownResult(list(strengths), ranks, payouts, awards, unclaimed)
+
+
+class Board:
+    """The cards and pots in the middle of the table (poker_lib.Table adds the UI on top)."""
+    def __init__(self):
+        self.cards = []
+        self.pots: List[Pot] = []
+
+    @property
+    def total_pot_amount(self) -> float:
+        return sum(p.amount for p in self.pots)
+
+    @property
+    def cards_mask(self) -> int:
+        """Bitmask of the community cards."""
+        return hand_mask(self.cards)
+
+    def reset(self):
+        out = self.cards
+        self.cards = []
+        self.pots = [] # Clear all pots for a new hand
+        return out
+
+
+class IdDeck:
+    """A deck of integer card ids (0-51); the default, render-free deck of the Engine."""
+    def __init__(self, n_decks = 1):
+        self.cards = list(range(N_CARDS)) * n_decks
+        self.discard = []
+
+    def reset(self):
+        self.cards += self.discard
+        self.discard = []
+        assert(len(self.cards)%52 == 0)
+
+
+class BasePlayer:
+    """
+    A seat at the table: the state the Engine plays with, and the placeholder betting rules
+    (or a PokerAI). poker_lib.Player adds human input and the UI on top.
+    """
+    def __init__(self, idx, name = "", ai = None):
+        self.idx = idx
+        self.name = name
+        self.hand = []
+        self.stack = 0
+        self.folded = False
+        self.score = 0 # integer hand strength (see poker_hands.evaluate_hand)
+        self.rank = 0
+        self.total_contribution: float = 0.0  # Total money bet in the ENTIRE hand
+        self.current_round_bet: float = 0.0   # Money bet in the CURRENT betting round
+        self.is_all_in: bool = False
+        self.is_out = False
+        self.last_raised = False
+        self.dealer = False
+        self.sb = False
+        self.bb = False
+        self.ai = ai # PokerAI deciding for the seat; None plays the placeholder rules
+
+    @property
+    def hand_mask(self) -> int:
+        """Bitmask of the hole cards."""
+        return hand_mask(self.hand)
+
+    def reset(self):
+        out = self.hand
+        self.hand = []
+        self.current_round_bet = 0.0
+        self.total_contribution = 0.0
+        self.folded = False
+        self.is_all_in = False
+        return out
+
+    def get_action(self, engine):
+        """
+        Returns:
+            Tuple[str, float]: (action, amount), from the PokerAI if there is one, otherwise
+            check or call when possible and fold when not.
+        """
+        if self.ai is not None: return self.ai.get_ai_action(engine)
+        to_call = engine.minimum_bet - self.total_contribution
+        if to_call == 0: return 'check', 0
+        if self.stack >= to_call: return 'call', to_call
+        return 'fold', 0
+
+    def __repr__(self):
+        status = []
+        if self.is_all_in: status.append("ALL-IN")
+        if self.folded: status.append("FOLDED")
+        status_str = f" ({', '.join(status)})" if status else ""
+        return f"{type(self).__name__}(name='{self.name}', stack={self.stack:.2f}, total_contrib={self.total_contribution:.2f}{status_str})"
+
+    def __str__(self):
+        status = " (ALL-IN)" if self.is_all_in else ""
+        folded = " (FOLDED)" if self.folded else ""
+        return f"{self.name} | Stack: £{self.stack:.2f} | Bet: £{self.total_contribution:.2f}{status}{folded}"
+
+
+class Engine:
+    def __init__(self, players = [], sb = 2, buyin = 0, deck = None, table = None, seed = None):
+        """
+        Args:
+            players: Player objects (see poker_lib.Player), at least 3 to play.
+            sb: small blind (the big blind is twice this).
+            buyin: chips added to every player's stack.
+            deck: any deck with .cards/.discard lists and reset(); defaults to an IdDeck.
+            table: any table with .cards/.pots and reset(); defaults to a Board.
+            seed: seed of the engine's random number generator (shuffles and odd chips).
+        """
+        self.sb = sb # small blind
+        self.bb = 2*sb # big blind
+        self.min_raise = self.sb
+        self.minimum_bet = 0
+        self.n_rounds = 0 # completed orbits of the dealer button
+        self.n_hands = 0
+        self.blind_increment = 1 # added to the small blind after every orbit
+        self.table = table if table is not None else Board()
+        self.deck = deck if deck is not None else IdDeck()
+        self.rng = random.Random(seed)
+        self.players = players
+        self.visualizer = None # headless; poker_lib.Player.get_action checks this for human input
+        self.running = True
+        self.observers = []
+        self.chips = ChipLedger()
+        self.showdown = None # ShowdownResult of the last hand that reached the river
+
+        self.street = None
+        self._to_act = None # player whose decision is pending
+        self._idx = 0       # seat index of the next player to consider
+        self._pending = 0   # players who still have to act in this betting round
+
+        for p in players: p.stack += buyin
+        self._assign_roles()
+
+    def subscribe(self, observer):
+        self.observers.append(observer)
+
+    def emit(self, event, *args):
+        for observer in self.observers:
+            handler = getattr(observer, 'on_' + event, None)
+            if handler: handler(self, *args)
+
+    @property
+    def to_act(self):
+        """The player who has to act next, or None when no decision is pending."""
+        return self._to_act
+
+    def _check_for_quit(self):
+        """Hook for front-ends: return True to stop the game after the current betting round."""
+        return False
+
+    # --- Hand Lifecycle ---
+
+    def _assign_roles(self):
+        for p in self.players:
+            p.sb, p.bb, p.dealer = False, False, False
+        if len(self.players) < 3: return
+        self.players[0].dealer = True
+        self.players[1].sb = True
+        self.players[2].bb = True
+
+    def reset(self, raise_blinds = False, cycle = True):
+        for p in self.players: self.deck.cards += p.reset()
+        self.deck.cards += self.table.reset()
+        self.deck.reset()
+        self.minimum_bet = 0
+        self.street = None
+        self._to_act = None
+
+        if cycle: self.players[:] = self.players[1:] + self.players[:1] # move dealer, sb, and bb one place on
+
+        for p in self.players:
+            if p.stack == 0 and not p.is_out:
+                p.is_out = True
+                self.emit('eliminated', p)
+
+        self.players = [p for p in self.players if not p.is_out] + [p for p in self.players if p.is_out]
+
+        if cycle: self._assign_roles()
+
+        if raise_blinds:
+            self.sb += raise_blinds
+            self.bb = 2 * self.sb
+            self.min_raise = self.sb
+
+        assert(len(self.deck.discard) == 0)
+        assert(len(self.deck.cards)%52 == 0)
+
+    def start_hand(self):
+        """
+        Shuffles, deals the hole cards, posts the blinds and opens the pre-flop betting.
+        Returns False (and stops the game) if fewer than 3 players are left.
+        """
+        if len([p for p in self.players if not p.is_out]) < 3:
+            self.running = False
+            return False
+        self.rng.shuffle(self.deck.cards)
+        self.chips.start_hand(self.players)
+        self.emit('hand_start')
+        self.deal()
+        self._begin_betting_round('preflop')
+        self._advance()
+        return True
+
+    def end_hand(self):
+        """Collects the cards and moves the button on; blinds go up after every orbit."""
+        self.n_hands += 1
+        if self.n_hands % len(self.players) == 0:
+            self.reset(raise_blinds=self.blind_increment)
+            self.n_rounds += 1
+        else:
+            self.reset()
+
+    def play_hand(self, policy = None):
+        """
+        Plays one complete hand. 'policy(engine, player)' returns (action, amount) for every
+        decision; it defaults to player.get_action(engine).
+        Returns False if the game stopped (too few players or a quit request).
+        """
+        if not self.start_hand(): return False
+        while self._to_act is not None:
+            player = self._to_act
+            action, amount = policy(self, player) if policy else player.get_action(self)
+            self.act(action, amount)
+        if not self.running: return False
+        self.end_hand()
+        return self.running and not self._check_for_quit()
+
+    def play(self, max_rounds = 5, policy = None):
+        while self.running and self.n_rounds < max_rounds:
+            if len([p for p in self.players if not p.is_out]) < 3:
+                self.running = False # End game if not enough players
+                self.end_game()
+                break
+            if not self.play_hand(policy): break
+
+    def end_game(self):
+        for p in self.players:
+            p.sb, p.bb, p.dealer = False, False, False
+        self.emit('game_over')
+
+    # --- Dealing ---
+
+    def _deal(self, receivers, n_cards, burn = False):
+        """Deals n_cards to each receiver (players, or the table); burns one card per round if asked."""
+        cards = self.deck.cards
+        if not isinstance(receivers, list): receivers = [receivers]
+        for _ in range(n_cards):
+            if burn: self.deck.discard.append(cards.pop())
+            for r in receivers:
+                if r is self.table: r.cards.append(cards.pop())
+                elif not r.is_out: r.hand.append(cards.pop())
+
+    def deal(self):
+        self._deal(self.players, 2)
+        self.emit('deal')
+
+    def flop(self):
+        assert(len(self.table.cards) == 0)
+        self.deck.discard.append(self.deck.cards.pop()) # discard only once on the flop
+        self._deal(self.table, 3)
+        self.emit('street', 'flop')
+
+    def turn(self):
+        assert(len(self.table.cards) == 3)
+        self._deal(self.table, 1, burn = True)
+        self.emit('street', 'turn')
+
+    def river(self):
+        assert(len(self.table.cards) == 4)
+        self._deal(self.table, 1, burn = True)
+        self.emit('street', 'river')
+
+    # --- Betting ---
+
+    def _put_in(self, player, amount):
+        """Moves up to 'amount' chips from the player's stack into the pots; returns the chips moved."""
+        bet = from_units(self.chips.put_in(player, to_units(amount)))
+        if bet <= 0: return 0
+        player.current_round_bet += bet
+        if player.stack == 0: player.is_all_in = True
+        return bet
+
+    def _can_act(self, player):
+        return not (player.folded or player.is_all_in or player.is_out)
+
+    def _begin_betting_round(self, street):
+        self.street = street
+        # Reset current round bets before the action starts
+        for p in self.players:
+            p.current_round_bet = 0.0
+        self.emit('betting_round', street)
+
+        if street == 'preflop':
+            self.emit('post', self.players[0], 'dealer', 0)
+            self.emit('post', self.players[1], 'small blind', self._put_in(self.players[1], self.sb))
+            self.emit('post', self.players[2], 'big blind', self._put_in(self.players[2], self.bb))
+            for pl in self.players: pl.last_raised = False
+            self.players[2].last_raised = True
+            self.minimum_bet = self.bb
+            self._idx = 3 # Action starts UTG
+        else:
+            # Action starts with the first active player after the dealer (Player 0)
+            self._idx = 1
+            # minimum_bet is the highest total_contribution currently in the pot
+            self.minimum_bet = max(p.total_contribution for p in self.players) if self.players else 0
+
+        can_act = [p for p in self.players if self._can_act(p)]
+        self._pending = len(can_act)
+        # Nobody to bet against: everyone else is all-in and the bet is already matched
+        if self._pending == 1 and can_act[0].total_contribution >= self.minimum_bet:
+            self._pending = 0
+
+    def act(self, action, amount = 0):
+        """
+        Applies the pending player's decision and advances the hand to the next decision.
+        action: 'fold', 'check', 'call' or 'raise'; amount: the raise on top of the call.
+        """
+        player = self._to_act
+        assert player is not None, "No decision is pending"
+        to_call = self.minimum_bet - player.total_contribution
+
+        if action == 'fold':
+            self.deck.discard += player.hand
+            player.hand = []
+            player.folded = True
+            self.chips.fold(player)
+            bet = 0
+            self._pending -= 1
+        elif action == 'raise':
+            bet = self._put_in(player, to_call + amount)
+            if player.total_contribution > self.minimum_bet:
+                # A raise re-opens the action for every other player who can still act
+                self.minimum_bet = player.total_contribution
+                for pl in self.players: pl.last_raised = False
+                player.last_raised = True
+                self._pending = sum(1 for p in self.players if p is not player and self._can_act(p))
+            else:
+                self._pending -= 1
+        else: # call or check
+            bet = self._put_in(player, to_call)
+            self._pending -= 1
+
+        self.emit('action', player, action, amount, bet)
+        self._idx += 1
+        self._advance()
+
+    def _advance(self):
+        """Finds the next player to act; closes betting rounds and deals streets until one is found."""
+        self._to_act = None
+        n_players = len(self.players)
+        while True:
+            # Everyone else folded: nobody is left to bet against
+            if sum(1 for p in self.players if not p.folded and not p.is_out) < 2:
+                self._pending = 0
+            while self._pending > 0:
+                player = self.players[self._idx % n_players]
+                if self._can_act(player):
+                    self._to_act = player
+                    return
+                self._idx += 1
+
+            # The betting round is over
+            self.distribute_chips_to_pots()
+            self.emit('pots')
+            if self._check_for_quit():
+                self.running = False
+                return
+
+            if self.street == 'river':
+                self.show_hands()
+                self.street = None
+                return
+            street = STREETS[STREETS.index(self.street) + 1]
+            getattr(self, street)() # self.flop(), self.turn() or self.river()
+            self._begin_betting_round(street)
+
+    # --- Pots and Showdown ---
+
+    def distribute_chips_to_pots(self):
+        """
+        Puts the pots on the table. The ChipLedger has kept them up to date with every bet,
+        so this only checks that they hold exactly the chips contributed.
+        """
+        self.chips.check()
+        self.table.pots = self.chips.pots_in_play()
+
+    def show_hands(self):
+        """
+        Scores every live hand (p.score is the integer strength from poker_hands.evaluate_hand,
+        0 for folded players), then ranks the players (p.rank) and pays out every pot with
+        resolve_showdown; the result is kept in self.showdown.
+        """
+        self.emit('showdown')
+        start_idx = [p.last_raised for p in self.players].index(True)
+        reordered_players = self.players[start_idx:] + self.players[:start_idx] #show last person that raised first
+        # 1. Evaluate hands and Rank players
+        for i, p in enumerate(reordered_players):
+            if not p.folded and not p.is_out: # Only evaluate hands of active players
+                p.score = evaluate_hand(self.table.cards + p.hand)
+                self.emit('reveal', p, i, reordered_players)
+            else:
+                p.score = 0 # Folded players have the lowest score
+
+        # 2. Resolve every pot at once and pay out
+        seats = self.chips.players
+        result = self.showdown = resolve_showdown([p.score for p in seats], self.table.pots, self.rng)
+        for p, rank, units in zip(seats, result.ranks, result.payouts):
+            p.rank = rank
+            if units: self.chips.award(p, units)
+        for i, seat, units in result.awards:
+            self.emit('pot_won', i, self.table.pots[i], seats[seat], from_units(units))
+        for i in result.unclaimed:
+            self.emit('pot_unclaimed', i, self.table.pots[i])
+
+        self.emit('hand_end')
+        assert sum(self.chips.stacks) == self.chips.total # every chip went back to a stack
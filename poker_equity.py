@@ -0,0 +1,316 @@
+import argparse
+import math
+import os
+import time
+from functools import lru_cache
+from itertools import combinations
+import numpy as np
+from poker_hands import *
+from poker_utils import format_time
+
+# --- Monte Carlo Equity ---
+# Estimates a hand's chance to win against n random opponent hands by sampling the rest of
+# the board and the opponents' hole cards from the cards the player cannot see. Trials are
+# drawn and scored in NumPy batches on 64-bit hand masks (see poker_hands.hand_mask), using
+# poker_hands.evaluate_masks, the vectorised poker_hands.evaluate_mask.
+
+BATCH_SIZE = 2500
+Z_95 = 1.96
+
+
+class EquityResult:
+    """Outcome of an equity estimate. Probabilities are fractions of the trials played."""
+    def __init__(self, win, tie, lose, equity, ci, trials):
+        self.win = win
+        self.tie = tie
+        self.lose = lose
+        self.equity = equity  # expected share of the pot: win + split shares of the ties
+        self.ci = ci          # half-width of the 95% confidence interval on equity (0 when exact)
+        self.trials = trials
+
+    @property
+    def interval(self):
+        return max(0.0, self.equity - self.ci), min(1.0, self.equity + self.ci)
+
+    def __repr__(self):
+        return (f"EquityResult(win={self.win:.4f}, tie={self.tie:.4f}, lose={self.lose:.4f}, "
+                f"equity={self.equity:.4f}±{self.ci:.4f}, trials={self.trials})")
+
+
+def _sample(rng, pool: np.ndarray, n: int, k: int) -> np.ndarray:
+    """n uniformly random ordered draws of k distinct cards from pool, as an (n, k) array."""
+    # Partial Fisher-Yates shuffle of n copies of the pool at once: only the first k slots are drawn
+    decks = np.tile(pool.astype(np.int8), (n, 1))
+    rows = np.arange(n)
+    for j in range(k):
+        swap = rng.integers(j, len(pool), n)
+        drawn = decks[rows, swap]
+        decks[rows, swap] = decks[:, j]
+        decks[:, j] = drawn
+    return decks[:, :k].astype(np.int64)
+
+
+def _outcomes(hero: np.ndarray, opponents: np.ndarray):
+    """Per-trial (win, tie, pot share) of hero strengths (n,) against opponent strengths (n, n_opponents)."""
+    best = opponents.max(axis = 1)
+    win = hero > best
+    tie = hero == best
+    n_tied = (opponents == hero[:, None]).sum(axis = 1)
+    share = np.where(win, 1.0, np.where(tie, 1.0 / (n_tied + 1), 0.0))
+    return win, tie, share
+
+
+def _play_trials(rng, pool, hero_mask, board_mask, n_board, n_opponents, n, known = None):
+    """Plays n random trials; returns per-trial (win, tie, pot share) arrays. known: masks of known opponent hands."""
+    cards = _sample(rng, pool, n, n_board + (0 if known is not None else 2 * n_opponents))
+    bits = np.left_shift(np.int64(1), cards)
+    # Cards are distinct, so summing their bits is the same as OR-ing them
+    board = board_mask + bits[:, :n_board].sum(axis = 1)
+    hero = evaluate_masks(board + hero_mask)
+    if known is not None:
+        opponents = evaluate_masks(board[:, None] + known)
+    else:
+        opponents = evaluate_masks(board[:, None] + bits[:, n_board:].reshape(n, n_opponents, 2).sum(axis = 2))
+    return _outcomes(hero, opponents)
+
+
+def _unseen(*masks) -> np.ndarray:
+    """Card ids in none of the given masks."""
+    known = 0
+    for mask in masks: known |= mask
+    return np.array([i for i in range(N_CARDS) if not known >> i & 1], dtype = np.int64)
+
+
+def estimate_equity(hand, board = (), n_opponents = 1, dead = (), trials = 10000, tolerance = None,
+                    batch_size = BATCH_SIZE, rng = None, opponents = None) -> EquityResult:
+    """
+    Monte Carlo estimate of a hand's equity against n_opponents random hands.
+
+    Args:
+        hand: the player's 2 hole cards (Cards or card ids).
+        board: the 0-5 community cards dealt so far.
+        n_opponents (int): live opponents still in the hand.
+        dead: other cards known not to be in play (e.g. exposed or mucked cards).
+        trials (int): maximum number of trials.
+        tolerance (float): stop early once the 95% confidence half-width on equity is at most this.
+        batch_size (int): trials drawn and scored per NumPy batch.
+        rng: np.random.Generator or seed.
+        opponents: the opponents' hands, when known (e.g. replaying a showdown); overrides n_opponents.
+
+    Returns:
+        EquityResult: win/tie/lose probabilities, equity and its confidence half-width.
+    """
+    known = None if opponents is None else np.array([hand_mask(h) for h in opponents], dtype = np.int64)
+    if known is not None: n_opponents = len(known)
+    if n_opponents < 1: raise ValueError("Need at least one opponent.")
+    rng = np.random.default_rng(rng)
+    hero_mask = hand_mask(hand)
+    board_mask = hand_mask(board)
+    pool = _unseen(hero_mask, board_mask, hand_mask(dead), *([] if known is None else known.tolist()))
+    n_board = 5 - len(board)
+    if n_board + (0 if known is not None else 2 * n_opponents) > len(pool): raise ValueError("Not enough cards left to deal every opponent.")
+
+    n = wins = ties = 0
+    total = total_sq = 0.0
+    ci = math.inf
+    while n < trials:
+        size = min(batch_size, trials - n)
+        win, tie, share = _play_trials(rng, pool, hero_mask, board_mask, n_board, n_opponents, size, known)
+        n += size
+        wins += int(win.sum())
+        ties += int(tie.sum())
+        total += float(share.sum())
+        total_sq += float(share @ share)
+        mean = total / n
+        ci = Z_95 * math.sqrt(max(0.0, total_sq / n - mean * mean) / n)
+        if tolerance is not None and ci <= tolerance: break
+
+    return EquityResult(wins / n, ties / n, (n - wins - ties) / n, total / n, ci, n)
+
+
+# --- Exact Equity ---
+# From the flop on, the remaining runouts are few enough to enumerate every one. Each
+# runout (and each opponent hand) is reduced once to its bits and rank key, and the key of
+# the cards already known is computed once, so every combination is scored from two sums
+# and one table lookup rather than by re-ranking all 7 cards.
+
+EXACT_WORK_LIMIT = 250_000  # combinations above which equity() falls back to Monte Carlo (a heads-up turn is ~46k)
+
+_CARD_BIT = np.left_shift(np.int64(1), np.arange(N_CARDS, dtype = np.int64))
+_CARD_KEY = np.array([5 ** (i % 13) for i in range(N_CARDS)], dtype = np.int64)  # MASK_KEY of the card's bit
+
+
+def _combos(pool: np.ndarray, k: int):
+    """Every k-card combination of pool, reduced to (bits, rank keys) arrays."""
+    rows = list(combinations(pool.tolist(), k))
+    ids = np.array(rows, dtype = np.int64).reshape(len(rows), k)
+    return _CARD_BIT[ids].sum(axis = 1), _CARD_KEY[ids].sum(axis = 1)
+
+
+def _evaluate_from(base_mask: int, n_added: int, masks: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """
+    Strengths of base_mask extended by n_added cards, whose combined bits and rank keys are
+    masks and keys. Only the suits that can still reach five cards are checked for a flush.
+    """
+    flush, mask_key, nf_keys, nf_values = np_lookup_tables()
+    suits = [(base_mask >> (13 * s)) & SUIT_BITS for s in range(4)]
+    base_key = sum(int(mask_key[m]) for m in suits)
+    strength = nf_values[np.searchsorted(nf_keys, base_key + keys)]
+    masks = base_mask + masks
+    for s, m in enumerate(suits):
+        if bin(m).count('1') + n_added >= 5:
+            np.maximum(strength, flush[(masks >> (13 * s)) & SUIT_BITS], out = strength)
+    return strength
+
+
+def exact_work(board = (), n_opponents = 1, opponents = None, dead = ()) -> int:
+    """Number of combinations exact_equity would score (0 if the spot cannot be enumerated)."""
+    n_board = 5 - len(board)
+    n_unseen = N_CARDS - 2 - len(board) - len(dead)
+    if opponents is not None:
+        return math.comb(n_unseen - 2 * len(opponents), n_board) * (1 + len(opponents))
+    if n_opponents != 1: return 0
+    return math.comb(n_unseen, n_board) * (1 + math.comb(n_unseen - n_board, 2))
+
+
+def exact_equity(hand, board = (), n_opponents = 1, opponents = None, dead = ()) -> EquityResult:
+    """
+    Exact equity by enumerating every remaining runout, and every opponent hand when the
+    opponent's cards are unknown (heads-up only; with more unknown hands use estimate_equity).
+
+    Args:
+        hand: the player's 2 hole cards (Cards or card ids).
+        board: the 0-5 community cards dealt so far.
+        n_opponents (int): live opponents; must be 1 unless their hands are given.
+        opponents: the opponents' hands, when known.
+        dead: other cards known not to be in play.
+
+    Returns:
+        EquityResult: with ci = 0 and trials = the number of outcomes enumerated.
+    """
+    hero_mask = hand_mask(hand)
+    board_mask = hand_mask(board)
+    n_board = 5 - len(board)
+
+    if opponents is not None:
+        known = [hand_mask(h) for h in opponents]
+        if not known: raise ValueError("Need at least one opponent.")
+        bits, keys = _combos(_unseen(hero_mask, board_mask, hand_mask(dead), *known), n_board)
+        hero = _evaluate_from(board_mask | hero_mask, n_board, bits, keys)
+        villains = np.stack([_evaluate_from(board_mask | m, n_board, bits, keys) for m in known], axis = 1)
+    else:
+        if n_opponents != 1: raise ValueError("Exact equity against unknown hands is heads-up only.")
+        pool = _unseen(hero_mask, board_mask, hand_mask(dead))
+        run_bits, run_keys = _combos(pool, n_board)
+        pair_bits, pair_keys = _combos(pool, 2)
+        hero = _evaluate_from(board_mask | hero_mask, n_board, run_bits, run_keys)
+        # Every (runout, opponent hand) pair that shares no card is one equally likely outcome
+        r, p = np.nonzero((run_bits[:, None] & pair_bits[None, :]) == 0)
+        villains = _evaluate_from(board_mask, n_board + 2, run_bits[r] + pair_bits[p], run_keys[r] + pair_keys[p])[:, None]
+        hero = hero[r]
+
+    win, tie, share = _outcomes(hero, villains)
+    n = len(hero)
+    wins, ties = int(win.sum()), int(tie.sum())
+    return EquityResult(wins / n, ties / n, (n - wins - ties) / n, float(share.mean()), 0.0, n)
+
+
+def equity(hand, board = (), n_opponents = 1, opponents = None, dead = (), max_work = EXACT_WORK_LIMIT, **kwargs) -> EquityResult:
+    """
+    Equity of a hand, enumerated exactly when that takes at most max_work combinations and
+    estimated by Monte Carlo otherwise. kwargs are passed on to estimate_equity.
+    """
+    work = exact_work(board, n_opponents, opponents, dead)
+    if 0 < work <= max_work:
+        return exact_equity(hand, board, n_opponents, opponents, dead)
+    return estimate_equity(hand, board, n_opponents, dead, opponents = opponents, **kwargs)
+
+
+def player_equity(player, game, **kwargs) -> EquityResult:
+    """
+    Equity of a player at the current point of a game, against every other player still in
+    the hand. Only what the player can see is used: their own hand and the board, so the
+    opponents' hands (and the burnt and mucked cards) are sampled from everything else.
+
+    Args:
+        player (Player): the player to evaluate (must hold a hand).
+        game (Engine): the game in progress.
+        **kwargs: passed on to equity (max_work, trials, tolerance, rng, ...).
+    """
+    n_opponents = sum(1 for p in game.players if p is not player and not p.folded and not p.is_out)
+    return equity(player.hand, game.table.cards, max(1, n_opponents), **kwargs)
+
+
+# --- Preflop Table ---
+# Preflop, only the ranks of the hole cards and whether they are suited matter, leaving 169
+# distinct starting hands. Their all-in equities against 1-7 random opponents are computed
+# once by build_preflop_table (run this module) and stored next to it as a .npy file, which
+# preflop_equity loads on first use. Hands are laid out on a 13x13 grid of rank indices
+# (0 = deuce ... 12 = ace): pairs on the diagonal, suited hands as (high, low) and offsuit
+# hands as (low, high).
+
+PREFLOP_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'preflop_equity.npy')
+MAX_PREFLOP_OPPONENTS = 7
+RANK_CHARS = '23456789TJQKA'
+
+
+def preflop_index(hand) -> int:
+    """Index (0-168) of a 2 card hand's starting hand class."""
+    a, b = to_card_ids(hand)
+    high, low = max(a % 13, b % 13), min(a % 13, b % 13)
+    if a // 13 == b // 13: return high * 13 + low  # suited (pairs cannot be suited, so never on the diagonal)
+    return low * 13 + high
+
+
+def preflop_name(index: int) -> str:
+    """Name of a starting hand class, e.g. 'AA', 'AKs' or 'T9o'."""
+    row, col = divmod(index, 13)
+    if row == col: return RANK_CHARS[row] * 2
+    if row > col: return f"{RANK_CHARS[row]}{RANK_CHARS[col]}s"
+    return f"{RANK_CHARS[col]}{RANK_CHARS[row]}o"
+
+
+def _preflop_hand(index: int) -> List[int]:
+    """A representative pair of card ids for a starting hand class."""
+    row, col = divmod(index, 13)
+    return [row, col] if row > col else [row, 13 + col]  # suited: both clubs; otherwise clubs and diamonds
+
+
+def build_preflop_table(trials = 100000, seed = 0, path = PREFLOP_TABLE_PATH) -> np.ndarray:
+    """
+    Precomputes the (169, 7) table of preflop equities (column n-1 is against n opponents)
+    by Monte Carlo and saves it to path as float32.
+    """
+    rng = np.random.default_rng(seed)
+    table = np.zeros((169, MAX_PREFLOP_OPPONENTS), dtype = np.float32)
+    for index in range(169):
+        hand = _preflop_hand(index)
+        for n in range(1, MAX_PREFLOP_OPPONENTS + 1):
+            table[index, n - 1] = estimate_equity(hand, (), n, trials = trials, rng = rng).equity
+    if path: np.save(path, table)
+    _preflop_table.cache_clear()
+    return table
+
+
+@lru_cache(maxsize = None)
+def _preflop_table() -> np.ndarray:
+    return np.load(PREFLOP_TABLE_PATH)
+
+
+def preflop_equity(hand, n_opponents = 1) -> float:
+    """All-in equity of 2 hole cards before the flop against n_opponents (1-7) random hands."""
+    return float(_preflop_table()[preflop_index(hand), min(max(n_opponents, 1), MAX_PREFLOP_OPPONENTS) - 1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Build the preflop equity table.')
+    parser.add_argument('--trials', type = int, default = 100000)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--path', default = PREFLOP_TABLE_PATH)
+    args = parser.parse_args()
+
+    t_0 = time.time()
+    table = build_preflop_table(args.trials, args.seed, args.path)
+    print(f"Wrote {args.path} in {format_time(time.time() - t_0)}")
+    for index in np.argsort(-table[:, 0])[:10]:
+        print(f"{preflop_name(index):<4}" + "".join(f"{e:>7.3f}" for e in table[index]))
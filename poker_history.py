@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import struct
+from collections import namedtuple
+from poker_engine import from_units, to_units
+from poker_hands import to_card_ids
+
+# --- Hand History ---
+# HandHistoryWriter is an Engine observer that records every hand played: the seats and
+# stacks, the hole cards, each blind and betting action, the board and the pot results.
+# Each finished hand is appended to a file through a large write buffer, in one of two formats:
+#   .jsonl  one JSON object per hand, with cards as text ('As', 'Td'), for reading and grepping
+#   other   compact binary of fixed-width little-endian records with integer card ids and
+#           action codes, for training data and bulk analysis
+# read_hands() streams the hands of either format back one at a time, so files of millions
+# of hands can be processed without loading them.
+#
+# A binary file starts with a FILE_HEADER (MAGIC and FORMAT_VERSION), so readers can reject
+# other files and older formats. Each hand is then a HEADER followed by n_seats SEAT,
+# n_actions ACTION and n_results RESULT records. Cards are ids 0-51 (see poker_hands), -1
+# where there is no card. Amounts are integer chip units (see poker_engine.CHIP_UNITS), as
+# the Engine counts them, so they are exact; HandRecords hold them in chips. Names are only
+# kept in the JSONL format.
+
+MAGIC = b'PKHH'
+FORMAT_VERSION = 1
+FILE_HEADER = struct.Struct('<4sH')   # magic, format version
+HEADER = struct.Struct('<IBBHB5bii')  # hand number, n_seats, dealer seat, n_actions, n_results, board, sb, bb
+SEAT = struct.Struct('<B2bxii')       # seat, hole cards, stack at the start of the hand, chips won
+ACTION = struct.Struct('<BBBxii')     # seat, street, action code, amount (the raise), bet (chips put in)
+RESULT = struct.Struct('<BBxxi')      # pot index, seat, winnings
+
+STREET_CODES = {'preflop': 0, 'flop': 1, 'turn': 2, 'river': 3}
+STREET_NAMES = list(STREET_CODES)
+ACTION_CODES = {'fold': 0, 'check': 1, 'call': 2, 'raise': 3, 'small blind': 4, 'big blind': 5}
+ACTION_NAMES = list(ACTION_CODES)
+
+RANK_CHARS, SUIT_CHARS = '23456789TJQKA', 'cdhs' # in card id order
+WRITE_BUFFER_SIZE = 1 << 20
+
+Seat = namedtuple('Seat', 'seat name cards stack won')
+Action = namedtuple('Action', 'seat street action amount bet')
+PotResult = namedtuple('PotResult', 'pot seat winnings')
+
+
+class HandRecord:
+    """One hand as recorded by HandHistoryWriter; cards are integer ids."""
+    def __init__(self, hand, sb, bb, dealer, seats = None, board = None, actions = None, results = None):
+        self.hand = hand          # number of the hand in the game (Engine.n_hands)
+        self.sb, self.bb = sb, bb
+        self.dealer = dealer      # seat (Player.idx) of the dealer
+        self.seats = seats if seats is not None else []        # List[Seat], every seat in playing order from the dealer
+        self.board = board if board is not None else []        # community card ids
+        self.actions = actions if actions is not None else []  # List[Action], blinds first
+        self.results = results if results is not None else []  # List[PotResult]
+
+    def to_json(self) -> dict:
+        return {'hand': self.hand, 'sb': self.sb, 'bb': self.bb, 'dealer': self.dealer,
+                'seats': [{'seat': s.seat, 'name': s.name, 'cards': [card_name(c) for c in s.cards],
+                           'stack': s.stack, 'won': s.won} for s in self.seats],
+                'board': [card_name(c) for c in self.board],
+                'actions': [[a.seat, a.street, a.action, a.amount, a.bet] for a in self.actions],
+                'results': [list(r) for r in self.results]}
+
+    @classmethod
+    def from_json(cls, d):
+        return cls(d['hand'], d['sb'], d['bb'], d['dealer'],
+                   [Seat(s['seat'], s['name'], [card_from_name(c) for c in s['cards']], s['stack'], s['won']) for s in d['seats']],
+                   [card_from_name(c) for c in d['board']],
+                   [Action(*a) for a in d['actions']],
+                   [PotResult(*r) for r in d['results']])
+
+    def to_bytes(self) -> bytes:
+        board = self.board + [-1] * (5 - len(self.board))
+        parts = [HEADER.pack(self.hand, len(self.seats), self.dealer, len(self.actions), len(self.results),
+                             *board, to_units(self.sb), to_units(self.bb))]
+        for s in self.seats:
+            cards = list(s.cards) + [-1] * (2 - len(s.cards))
+            parts.append(SEAT.pack(s.seat, *cards, to_units(s.stack), to_units(s.won)))
+        for a in self.actions:
+            parts.append(ACTION.pack(a.seat, STREET_CODES[a.street], ACTION_CODES[a.action], to_units(a.amount), to_units(a.bet)))
+        for r in self.results:
+            parts.append(RESULT.pack(r.pot, r.seat, to_units(r.winnings)))
+        return b''.join(parts)
+
+    def __repr__(self):
+        return f"HandRecord(hand={self.hand}, seats={len(self.seats)}, actions={len(self.actions)}, board={[card_name(c) for c in self.board]})"
+
+
+def card_name(card_id: int) -> str:
+    """Two-character name of a card id, e.g. 'As' or 'Td'."""
+    return RANK_CHARS[card_id % 13] + SUIT_CHARS[card_id // 13]
+
+
+def card_from_name(name: str) -> int:
+    return SUIT_CHARS.index(name[1]) * 13 + RANK_CHARS.index(name[0])
+
+
+def is_jsonl(path) -> bool:
+    return str(path).endswith('.jsonl')
+
+
+class HandHistoryWriter:
+    """
+    Engine observer that appends every finished hand to 'path' (JSONL if it ends in .jsonl,
+    binary otherwise). Use it as a context manager, or call close() when the game is over.
+
+        with HandHistoryWriter('hands.bin') as history:
+            engine.subscribe(history)
+            engine.play(max_rounds = 50)
+    """
+    def __init__(self, path, buffer_size = WRITE_BUFFER_SIZE):
+        self.path = path
+        self.jsonl = is_jsonl(path)
+        if not self.jsonl and os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'rb') as f: _check_file_header(f) # only append to a file of the same format
+        self.file = open(path, 'ab', buffering = buffer_size)
+        if not self.jsonl and self.file.tell() == 0: self.file.write(FILE_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self.n_hands = 0
+        self._record = None
+
+    def on_hand_start(self, engine):
+        # Players who are out are kept (with no chips and no cards), so a replay sees the same table
+        dealer = next(p for p in engine.players if not p.is_out)
+        self._record = HandRecord(engine.n_hands, engine.sb, engine.bb, dealer.idx)
+        self._stacks = {p.idx: p.stack for p in engine.players}
+        self._won = dict.fromkeys(self._stacks, 0)
+
+    def on_deal(self, engine):
+        # Before anyone folds, as folding gives the cards back to the deck
+        self._cards = {p.idx: to_card_ids(p.hand) for p in engine.players}
+
+    def on_post(self, engine, player, role, amount):
+        if role in ACTION_CODES: self._record.actions.append(Action(player.idx, 'preflop', role, 0, amount))
+
+    def on_action(self, engine, player, action, amount, bet):
+        if action in ('check', 'call'): action = 'call' if bet > 0 else 'check'
+        self._record.actions.append(Action(player.idx, engine.street, action, amount if action == 'raise' else 0, bet))
+
+    def on_pot_won(self, engine, pot_idx, pot, player, winnings):
+        self._record.results.append(PotResult(pot_idx, player.idx, winnings))
+        self._won[player.idx] += winnings
+
+    def on_hand_end(self, engine):
+        record = self._record
+        if record is None: return
+        record.board = to_card_ids(engine.table.cards)
+        record.seats = [Seat(p.idx, p.name, self._cards.get(p.idx, []), self._stacks[p.idx], self._won[p.idx])
+                        for p in engine.players if p.idx in self._stacks]
+        self.write(record)
+        self._record = None
+
+    def write(self, record):
+        if self.jsonl: self.file.write(json.dumps(record.to_json(), separators = (',', ':')).encode() + b'\n')
+        else: self.file.write(record.to_bytes())
+        self.n_hands += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _check_file_header(f):
+    """Reads the FILE_HEADER of a binary history; raises ValueError if it is not one of this format version."""
+    data = f.read(FILE_HEADER.size)
+    if len(data) < FILE_HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{f.name} is not a binary hand history (or predates format version 1).")
+    version = FILE_HEADER.unpack(data)[1]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{f.name} is a version {version} hand history; this reader handles version {FORMAT_VERSION}.")
+
+
+def _read_binary(f):
+    _check_file_header(f)
+    header_size = HEADER.size
+    while True:
+        header = f.read(header_size)
+        if len(header) < header_size: return
+        hand, n_seats, dealer, n_actions, n_results, *rest = HEADER.unpack(header)
+        board, sb, bb = [c for c in rest[:5] if c >= 0], from_units(rest[5]), from_units(rest[6])
+        body = f.read(n_seats * SEAT.size + n_actions * ACTION.size + n_results * RESULT.size)
+        offset = 0
+        seats = []
+        for _ in range(n_seats):
+            seat, c1, c2, stack, won = SEAT.unpack_from(body, offset)
+            seats.append(Seat(seat, '', [c for c in (c1, c2) if c >= 0], from_units(stack), from_units(won)))
+            offset += SEAT.size
+        actions = []
+        for _ in range(n_actions):
+            seat, street, code, amount, bet = ACTION.unpack_from(body, offset)
+            actions.append(Action(seat, STREET_NAMES[street], ACTION_NAMES[code], from_units(amount), from_units(bet)))
+            offset += ACTION.size
+        results = []
+        for _ in range(n_results):
+            pot, seat, winnings = RESULT.unpack_from(body, offset)
+            results.append(PotResult(pot, seat, from_units(winnings)))
+            offset += RESULT.size
+        yield HandRecord(hand, sb, bb, dealer, seats, board, actions, results)
+
+
+def read_hands(path):
+    """
+    Yields the HandRecords of a history file one at a time (the format follows the extension,
+    as for HandHistoryWriter). Nothing is read ahead beyond the file buffer.
+    """
+    if is_jsonl(path):
+        with open(path, 'rb') as f:
+            for line in f:
+                if line.strip(): yield HandRecord.from_json(json.loads(line))
+    else:
+        with open(path, 'rb', buffering = WRITE_BUFFER_SIZE) as f:
+            yield from _read_binary(f)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Summarise or convert a hand history file.')
+    parser.add_argument('path')
+    parser.add_argument('--to', default = None, help = 'write the hands to this file (format from its extension)')
+    args = parser.parse_args()
+
+    n_hands = n_actions = 0
+    writer = HandHistoryWriter(args.to) if args.to else None
+    for record in read_hands(args.path):
+        n_hands += 1
+        n_actions += len(record.actions)
+        if writer: writer.write(record)
+    if writer: writer.close()
+    print(f"{args.path}: {n_hands} hands, {n_actions} actions ({os.path.getsize(args.path)} bytes)")
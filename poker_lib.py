@@ -3,8 +3,10 @@ import sys
 import traceback
 from poker_ui import *
 from poker_hands import *
+from poker_engine import *
 from poker_utils import * 
-# from poker_ai import *
+from poker_history import HandHistoryWriter
+from poker_ai import PokerAI
 from contextlib import redirect_stdout 
 from config import UIConfig
 
@@ -13,38 +15,115 @@ slow = True
 if slow: DEAL_DELAY, BETTING_DELAY, SHOW_HANDS_DELAY = 0.1, 0.25, 2
 else: DEAL_DELAY, BETTING_DELAY, SHOW_HANDS_DELAY = 0.0, 0.0, 0.0
 
+AI_WEIGHTS = None # weights file for the bots' PokerAI (see poker_ai.load_network); None plays the placeholder rules
+
 CURSES_ERROR_TRACEBACK = None 
 EXIT_MSG = 'Press ESC to exit'
 
-class Game:
+def bot_ai(idx):
+    """The PokerAI of a bot seat, or None for the placeholder rules. Its network loads on its first decision."""
+    return PokerAI(idx, AI_WEIGHTS) if AI_WEIGHTS else None
+
+def action_message(player, action, amount, bet):
+    """Describes a betting action, e.g. 'Alex raises £10.00 (Total bet: £14.00)'."""
+    if action == 'fold': return player.name + ' folds'
+    if action == 'raise':
+        if player.is_all_in: return player.name + f' goes all in £{bet:.2f}'
+        return player.name + f' raises £{amount:.2f} (Total bet: £{bet:.2f})'
+    if bet <= 0: return player.name + ' checks'
+    return player.name + (f' calls (all in) £{bet:.2f}' if player.is_all_in else ' calls')
+
+def pot_message(pot):
+    """Describes a pot over two lines: its amount and cap, padded to the pot panel's width, then who can win it."""
+    width = UIConfig.POT_WIDTH
+    names = "\n              ".join([p.name.ljust(width - 14) for p in pot.eligible_players])
+    cap_str = f" (Cap: £{pot.cap:.2f})" if pot.cap != float('inf') else ""
+    return f"£{pot.amount:.2f}{cap_str} ".ljust(width) + f"\n    Eligible: {names}"
+
+
+class ConsoleObserver:
+    """Console front-end: prints the Engine's events as the game is played."""
+
+    def on_post(self, game, player, role, amount):
+        print(f'{player.name} is the {role}')
+
+    def on_betting_round(self, game, street):
+        print('\n--- Starting Betting Round ---')
+
+    def on_action(self, game, player, action, amount, bet):
+        print(action_message(player, action, amount, bet))
+        if player.folded: print(f"{player.name} folded")
+        elif player.last_raised and player.total_contribution == game.minimum_bet and action == 'raise':
+            print(f"{player.name} raised. New bet to call: £{game.minimum_bet:.2f}")
+
+    def on_pots(self, game):
+        print(f'\nBetting Done. Total Pot: £{game.table.total_pot_amount:.2f} across {len(game.table.pots)} pot(s).')
+        for i, pot in enumerate(game.table.pots):
+            print(f"Pot {i+1}: {pot_message(pot)}")
+
+    def on_street(self, game, street):
+        print('\n' + street.capitalize())
+        print(combine_cards(game.table.cards))
+
+    def on_showdown(self, game):
+        print('\n\nCards on the Table:')
+        print(combine_cards(game.table.cards) + '\n\n\n')
+        print('\n--- Pot Distribution ---')
+
+    def on_reveal(self, game, player, i, order):
+        player.hand_name, player.best_hand, _, player.discarded = get_best_5_card_hand(game.table.cards + player.hand)
+
+    def on_pot_won(self, game, i, pot, player, winnings):
+        print(f"{player.name} wins £{winnings:.2f} from Pot {i+1}".ljust(5 * CARD_WIDTH + 4, ' '))
+
+    def on_pot_unclaimed(self, game, i, pot):
+        print(f"Pot {i+1} (£{pot.amount:.2f}) had no eligible winners and remains unclaimed.")
+
+    def on_hand_end(self, game):
+        # Show Final Hands and Stacks
+        print('\n--- Final Hands ---')
+        for p in sorted([pl for pl in game.players if not pl.is_out], key=lambda player: player.rank):
+            if p.folded:
+                print(f"\n{p.name} Folded")
+                continue
+            print( f"\n#{p.rank + 1}: {p.name} - {p.hand_name}")
+            print(combine_cards(p.best_hand , discarded_cards=p.discarded, overlap = (0,1), reverse = (0,0)))
+
+        print('\n--- Final Stacks ---')
+        for p in game.players: print( p.name + f' has: £{p.stack:.2f}' if not p.is_out else p.name + f' is out' )
+
+    def on_eliminated(self, game, player):
+        print('\n' + player.name + ' is eliminated')
+
+    def on_game_over(self, game):
+        print('\n' + 'Too few players remaining; ending game...')
+
+
+class Game(Engine):
+    """
+    The playable game: the Engine's rules plus the curses TUI (when stdscr is given)
+    or the console. Both front-ends follow the Engine as observers.
+    """
     def __init__(self, players = [], buyin = 100, sb = 2, stdscr = None):
-        self.sb = sb # small blind
-        self.bb = 2*sb # big blind
-        self.min_raise = self.sb
-        self.minimum_bet = 0
-        self.n_rounds = 0
-        self.table = Table() # class to store info about what's on the table
+        Engine.__init__(self, [], sb, deck = DeckOfCards(back_color=MAGENTA), table = Table())
         self.players = players
-        self.visualizer =  None
-        self.running = True # NEW: State variable for controlling the main game loop
 
         if stdscr:
             # Initialize the visualizer if stdscr is provided   
             self.visualizer = Visualizer(stdscr)
+        self.subscribe(self if self.visualizer else ConsoleObserver())
 
-        self.deck = DeckOfCards(back_color=MAGENTA)
-        if self.visualizer: self.visualizer.starting_animation(deck1 = DeckOfCards( back_color=MAGENTA), 
-                                                               deck2 = DeckOfCards( back_color=BLUE) )
-            
-        self.redraw(table = False)
-        time.sleep(DEAL_DELAY * 5 )
-        self.deck.deal(self.table, 5, discard=False, visualizer = self.visualizer, delay = DEAL_DELAY, hdr = False )
-        self.visualizer.addstr(self.table.y , self.table.x , 'WELCOME!'.center(4 + 5 * CARD_WIDTH, '-'))
-        time.sleep(DEAL_DELAY * 10 )
-        self.reset(cycle = False, redraw=False)
-
-        if self.visualizer:
-            players = self.player_startup()
+        if self.visualizer: 
+            self.visualizer.starting_animation(deck1 = DeckOfCards( back_color=MAGENTA), 
+                                               deck2 = DeckOfCards( back_color=BLUE) )
+            if self.visualizer.quit_requested: raise Exception("User requested exit.")
+            self.redraw(table = False)
+            self.visualizer.wait(DEAL_DELAY * 5 )
+            self.deck.deal(self.table, 5, discard=False, visualizer = self.visualizer, delay = DEAL_DELAY, hdr = False )
+            self.visualizer.addstr(self.table.y , self.table.x , 'WELCOME!'.center(4 + 5 * CARD_WIDTH, '-'))
+            self.visualizer.wait(DEAL_DELAY * 10 )
+            self.reset(cycle = False, redraw=False)
+            with self.visualizer.direct(): players = self.player_startup()
 
         if len(players) < 3: 
             raise Exception("Too few players")
@@ -133,7 +212,7 @@ class Game:
 
             # 3. Create Player object
             if is_ai:
-                player_list.append(Player(player_id_counter, player_name))
+                player_list.append(Player(player_id_counter, player_name, ai = bot_ai(player_id_counter)))
             else:
                 player_list.append(Player(player_id_counter, player_name, is_human=True))
             
@@ -171,7 +250,7 @@ class Game:
                             n_ai_to_add = max_players - n_current_players
                         for i in range(n_ai_to_add):
                             ai_name = f"Bot #{player_id_counter + 1}"
-                            player_list.append(Player(player_id_counter, ai_name))
+                            player_list.append(Player(player_id_counter, ai_name, ai = bot_ai(player_id_counter)))
                             self.players = player_list
                             player_id_counter += 1                      
 
@@ -189,18 +268,14 @@ class Game:
 
 
     def end_game(self):
-
-        for p in self.players:
-            p.sb, p.bb, p.dealer = False, False, False
+        Engine.end_game(self)
         if self.visualizer: 
             self.redraw()
             self.deck.sort()
             self.visualizer.addstr(self.table.y + 2 , self.table.x, 'TOO FEW PLAYERS; END OF GAME'.center(4 + 5 * CARD_WIDTH, ' '))
             self.deck.deal(self.table, 5, discard=False, visualizer=self.visualizer, delay = DEAL_DELAY)
-            time.sleep(5 if slow else 1)
-        else: 
-            print('\n' + 'Too few players remaining; ending game...')
-            return
+            self.visualizer.flush()
+            self.visualizer.wait(5 if slow else 1)
 
     def __repr__(self):
         player_names = ", ".join([p.name for p in self.players])
@@ -223,25 +298,28 @@ class Game:
                 if self.visualizer:
                     # Optional: Display a quick message before exiting
                     self.visualizer.addstr(0, self.visualizer.max_x - UIConfig.MARGIN_X - len(EXIT_MSG), "Quitting game...".ljust(len(EXIT_MSG)), 1)
+                    self.visualizer.flush()
                 return True
         return False
         
     
     def redraw(self, table= True):
         if not self.visualizer: return 
-        time.sleep(BETTING_DELAY)
+        self.visualizer.wait(BETTING_DELAY)
 
         self.visualizer.get_screen_dimensions()
-        self.visualizer.clear_area(UIConfig.MARGIN_Y, UIConfig.MARGIN_X, self.visualizer.max_y, self.visualizer.max_x)
-        self.get_positions()
-
-        self.visualizer.addstr(0, self.visualizer.max_x - UIConfig.MARGIN_X - len(EXIT_MSG),  EXIT_MSG )
-        self.visualizer.addstr(UIConfig.MARGIN_Y, self.visualizer.center[0] - UIConfig.TITLE_WIDTH//2, UIConfig.TITLE_ART)
-        self.visualizer.addstr(self.deck.y, self.deck.x, self.deck.deck_info())
-        if table: self.visualizer.addstr(self.table.y, self.table.x, self.table.table_info())
-        self.visualizer.addstr(self.table.bety, self.table.betx, self.betting_info())  
-        self.visualizer.addstr(self.table.poty, self.table.potx, self.table.pot_info())
-        self.visualizer.addstrs([(p.y, p.x, p.player_info()) for p in self.players])
+        with self.visualizer.frame():
+            self.visualizer.clear_area(UIConfig.MARGIN_Y, UIConfig.MARGIN_X, self.visualizer.max_y, self.visualizer.max_x)
+            self.get_positions()
+
+            self.visualizer.draw_speed()
+            self.visualizer.draw_panel('exit', 0, self.visualizer.max_x - UIConfig.MARGIN_X - len(EXIT_MSG), EXIT_MSG, lambda: EXIT_MSG)
+            self.visualizer.draw_panel('title', UIConfig.MARGIN_Y, self.visualizer.center[0] - UIConfig.TITLE_WIDTH//2, UIConfig.TITLE_ART, lambda: UIConfig.TITLE_ART)
+            self.deck.draw(self.visualizer)
+            if table: self.table.draw(self.visualizer)
+            self.draw_betting()
+            self.table.draw_pots(self.visualizer)
+            for p in self.players: p.draw(self.visualizer)
 
     def get_positions(self):
 
@@ -261,171 +339,15 @@ class Game:
 
 
     def reset(self, raise_blinds = False, cycle = True, redraw = True):
-        for p in self.players: self.deck.cards += p.reset()
-        self.deck.cards += self.table.reset()
-        self.deck.reset()
-        self.minimum_bet = 0
-        
-        if cycle: self.players[:] = self.players[1:] + self.players[:1] # move dealer, sb, and bb one place on
-
-        for p in self.players:
-            if p.stack == 0 and not p.is_out:
-                p.is_out = True
-                if not self.visualizer: print('\n' + p.name + ' is eliminated')
-        
-        self.players = [p for p in self.players if not p.is_out] + [p for p in self.players if p.is_out] 
-        
-        if cycle:   
-            for p in self.players:
-                p.sb, p.bb, p.dealer = False, False, False
-            self.players[0].dealer = True
-            self.players[1].sb = True
-            self.players[2].bb = True
-
-        if raise_blinds: 
-            self.sb += raise_blinds
-            self.bb = 2 * self.sb
-            self.min_raise = self.sb
-        
+        Engine.reset(self, raise_blinds, cycle)
         if redraw: self.redraw()
          # Ensure total contribution is reset for all players
         for p in self.players: assert(p.total_contribution == 0.0) 
         for p in self.players: assert(len(p.hand) == 0)
-        assert(len(self.deck.discard) == 0)
-        assert(len(self.deck.cards)%52 == 0)
-
-    def deal(self): 
-        self.deck.deal(self.players, 2, visualizer=self.visualizer)
-
-    def flop(self):
-        assert(len(self.table.cards) == 0)
-        
-        self.deck.discard += [self.deck.cards.pop()] # discard only once on the flop
-        self.deck.deal(self.table, 3, discard = False, visualizer=self.visualizer)
-        if not self.visualizer: 
-            print('\nFlop')
-            print(combine_cards(self.table.cards))
-
 
-
-    def turn(self):
-        assert(len(self.table.cards) == 3)
-    
-        self.deck.deal(self.table, 1, discard = True, visualizer=self.visualizer) 
-        if not self.visualizer: 
-            print('\nTurn')
-            print(combine_cards(self.table.cards))
-
-    
-    def river(self):
-        assert(len(self.table.cards) == 4)
-
-        self.deck.deal(self.table, 1, discard = True, visualizer=self.visualizer)
-        if not self.visualizer: 
-            print('\nRiver')
-            print(combine_cards(self.table.cards))
-
-    
-    def show_hands(self):
-        if not self.visualizer:
-            print('\n\nCards on the Table:')
-            print(combine_cards(self.table.cards) + '\n\n\n')
-
-        start_idx = [p.last_raised for p in self.players].index(True)
-        reordered_players = self.players[start_idx:] + self.players[:start_idx] #show last person that raised first
-        # 1. Evaluate hands and Rank players
-        for i, p in  enumerate(reordered_players):
-            if not p.folded and not p.is_out: # Only evaluate hands of active players
-                p.hand_name, p.best_hand, p.score, p.discarded = get_best_5_card_hand(self.table.cards + p.hand)
-                if self.visualizer:
-                    self.visualizer.clear_area(self.table.y + 1, self.table.x, self.table.y + CARD_HEIGHT + 6, self.table.x + 7 + 7 * CARD_WIDTH )
-                    self.visualizer.addstr(self.table.y, self.table.x, self.table.table_info(), 0)
-                    self.visualizer.addstrs([(pl.y, pl.x, pl.player_info(show = True if j <= i and not pl.folded else False )) for j, pl in enumerate(reordered_players)], SHOW_HANDS_DELAY)
-                    self.visualizer.addstr(p.y, p.x, p.player_info(show_cards = False), 0)
-                    self.visualizer.addstr(self.table.y + 2, self.table.x, self.winner_info(p), SHOW_HANDS_DELAY)
-            else:
-                p.score = (0, (0,)) # Folded players have the lowest score
-
-        rank_players(self.players) # Assigns p.rank (0-based, handles ties)
- 
-        # 2. Distribute Pots
-        if not self.visualizer: print('\n--- Pot Distribution ---')
-        remaining_pot_amount = self.table.total_pot_amount # Should be zero at the end
-
-        for i, pot in enumerate(self.table.pots):
-            # Find the best eligible player for this pot
-            eligible_winners = sorted(
-                [p for p in self.players if p.rank != 0 and p in pot.eligible_players],
-                key=lambda p: p.score,
-                reverse=True
-            )
-            # Find the highest rank among eligible players (0 is best, 1 is next, etc.)
-            best_rank_in_pot = min(p.rank for p in pot.eligible_players if not p.folded) if pot.eligible_players else None
-
-            # Actual winners are those tied for the best rank among all eligible players
-            winners_of_pot = [p for p in pot.eligible_players 
-                              if not p.folded and p.rank == best_rank_in_pot]
-            
-            n_winners = len(winners_of_pot)
-
-            if n_winners > 0:
-                
-                # Calculate integer winnings and remainder
-                winnings_base = pot.amount // n_winners
-                remainder = pot.amount % n_winners
-                
-                # Randomly determine who gets the remainder
-                winners_for_remainder = winners_of_pot[:]
-                random.shuffle(winners_for_remainder)
-                
-                # Distribute base winnings and the remainder
-                for p in winners_of_pot:
-                    # All winners get the base integer amount
-                    winnings = winnings_base 
-                    
-                    # Check if this player is one of the lucky ones to get +1
-                    if p in winners_for_remainder[:remainder]:
-                        winnings += 1
-                    
-                    p.stack += winnings
-                    
-                    # Formatting the message with the exact winning amount (which is now an integer)
-                    ftr = f"{p.name} wins £{winnings} from Pot {i+1}".ljust(5 * CARD_WIDTH + 4, ' ')
-                    
-                    if not self.visualizer: 
-                        print(ftr)
-                    else: 
-                        self.visualizer.addstrs([(pl.y, pl.x, pl.player_info(show = True if not pl.folded else True)) for  pl in self.players])
-                        self.visualizer.addstr(p.y, p.x, p.player_info(show_cards = False))
-                        lines = self.winner_info(p).split('\n')
-                        self.visualizer.addstr(self.table.y + 2, self.table.x, '\n'.join(lines[:-2] + [ftr + lines[-2][4 + 5 * CARD_WIDTH:]] + [lines[-1]]) , SHOW_HANDS_DELAY)
-                
-                remaining_pot_amount -= pot.amount
-                
-            else:
-                if not self.visualizer: print(f"Pot {i+1} (£{pot.amount:.2f}) had no eligible winners and remains unclaimed.")
-
-# ... (rest of the class)
-                
-        
-        # 3. Show Final Hands and Stacks
-        if not self.visualizer: print('\n--- Final Hands ---')
-        for p in sorted([pl for pl in self.players if not pl.is_out], key=lambda player: player.rank):
-            if p.folded:
-                if not self.visualizer: print(f"\n{p.name} Folded")
-                continue
-
-            if not self.visualizer: 
-                print( f"\n#{p.rank + 1}: {p.name} - {p.hand_name}")
-                print(combine_cards(p.best_hand , discarded_cards=p.discarded, overlap = (0,1), reverse = (0,0)))
-
-
-
-        if not self.visualizer: 
-            print('\n--- Final Stacks ---')
-            for p in self.players: print( p.name + f' has: £{p.stack:.2f}' if not p.is_out else p.name + f' is out' )
-
-        assert(abs(remaining_pot_amount) < 0.01) # Check for zero remaining money
+    def _deal(self, receivers, n_cards, burn = False):
+        # DeckOfCards.deal animates every card when there is a visualizer
+        self.deck.deal(receivers, n_cards, discard = burn, visualizer=self.visualizer)
 
     def winner_info(self, player):
         hdr = (player.name + ' - ' + player.hand_name).ljust(5 * CARD_WIDTH + 4, ' ')
@@ -455,282 +377,96 @@ class Game:
             body += pad
     
         return hdr + '\n\n' + body 
+
+    def draw_betting(self, wait = 0):
+        key = (self.minimum_bet, UIConfig.BETTING_WIDTH, UIConfig.MAX_PLAYER_NAME_LENGTH,
+               tuple((p.name, p.total_contribution, p.folded, p.is_all_in, p.is_out) for p in self.players))
+        self.visualizer.draw_panel('betting', self.table.bety, self.table.betx, key, self.betting_info, wait)
     
 
-    # --- NEW CRUCIAL SIDE POT LOGIC METHOD ---
-    def distribute_chips_to_pots(self):
+    # --- TUI observer: the curses front-end redraws on the Engine's events ---
+
+    def show_action(self, player, hdr):
         """
-        Calculates the side pots based on each player's total contribution 
-        across the entire hand so far.
+        Redraws the player panels and the betting panel, with 'hdr' under the acting player.
+        Only the panels whose state changed are redrawn: typically the actor, the previous
+        actor (whose message goes) and the betting panel.
         """
-        # 1. Collect all contributions from active (non-folded) players
-        active_contributions = sorted(
-            [p.total_contribution for p in self.players if not p.folded and p.total_contribution > 0],
-            key=lambda x: x
-        )
-        
-        # Get unique contribution levels to define the pot caps
-        # Start with 0.0 to handle the tier calculation correctly
-        contribution_levels = sorted(list(set([0.0] + active_contributions)))
-
-        # 2. Iterate through levels to build pots
-        self.table.pots = []
-        
-        # Total contribution from folded players (will be added to the Main Pot)
-        folded_contribution = sum(p.total_contribution for p in self.players if p.folded)
-        
-        # Total money placed by ALL players (including folded)
-        total_money_in_hand = sum(p.total_contribution for p in self.players)
-
-        # Iterate over contribution levels starting from the first actual contribution
-        for i, cap in enumerate(contribution_levels):
-            if i == 0: continue # Skip 0.0 level
-            
-            prev_cap = contribution_levels[i-1]
-            tier_amount = cap - prev_cap
-            
-            # Eligible players are those who contributed AT LEAST the current cap
-            eligible_players = [p for p in self.players 
-                                if p.total_contribution >= cap and not p.folded]
-
-            # Contribution to this tier: (amount of tier) * (number of eligible players)
-            pot_tier_total = tier_amount * len(eligible_players)
-
-            if pot_tier_total > 0:
-                # Create a new pot for this tier
-                new_pot = Pot(eligible_players=eligible_players, cap=cap)
-                new_pot.amount = pot_tier_total
-                self.table.pots.append(new_pot)
-
-        # 3. Add folded money to the MAIN pot (the first pot created)
-        if folded_contribution > 0:
-             if self.table.pots:
-                 self.table.pots[0].amount += folded_contribution
-             else:
-                 # Case where only folded players contributed (shouldn't happen in a real game flow)
-                 self.table.pots = [Pot(eligible_players=[], amount=folded_contribution, cap=float('inf'))]
-                 
-        # Final sanity check: Total money in all pots must equal total money contributed
-        assert(abs(self.table.total_pot_amount - total_money_in_hand) < 0.01)
-
-
-    def round_of_betting(self):
-        if not self.visualizer: print('\n--- Starting Betting Round ---')
-        
-        # Reset current round bets before the action starts
-        for p in self.players:
-            p.current_round_bet = 0.0
-        
-        # Determine current players who can act (not folded and not all-in)
-        active_players = [p for p in self.players if not p.folded and not p.is_all_in]
-        
-        # 1. INITIALIZE BETTING (Blinds)
-        if self.table.total_pot_amount == 0: # Pre-Flop
-            hdr = self.players[0].name +  f' is the dealer'
-            if self.visualizer:
-                self.visualizer.clear_area(UIConfig.BETTING_ROW, 0, UIConfig.BETTING_ROW,  self.visualizer.max_x_table )   
-                self.visualizer.addstrs([(p.y, p.x, p.player_info()) for i, p in enumerate(self.players) if i != 0 ])
-                self.visualizer.addstr(self.players[0].y, self.players[0].x,  self.players[0].player_info(hdr))
-                self.visualizer.addstr(self.table.bety, self.table.betx,  self.betting_info(), BETTING_DELAY)
-            else: print(hdr)
-
-            # SB posts (Player 1)
-            hdr = self.players[1].name + f' is the small blind'
-            self.players[1].raise_bet(self.sb, self.minimum_bet, verbose = False)
-            if self.visualizer:
-                self.visualizer.clear_area(UIConfig.BETTING_ROW, 0, UIConfig.BETTING_ROW,  self.visualizer.max_x_table )
-                self.visualizer.addstrs([(p.y, p.x, p.player_info()) for i, p in enumerate(self.players) if i != 1 ])
-                self.visualizer.addstr(self.players[1].y, self.players[1].x,  self.players[1].player_info(hdr))
-                self.visualizer.addstr(self.table.bety, self.table.betx,  self.betting_info(), BETTING_DELAY)
-
-            else: print(hdr)
-            
-            # BB posts (Player 2)
-            hdr = self.players[2].name + f' is the big blind'
-            self.players[2].raise_bet(self.bb, self.minimum_bet, verbose = False)
-            if self.visualizer:
-                self.visualizer.clear_area(UIConfig.BETTING_ROW, 0, UIConfig.BETTING_ROW, self.visualizer.max_x_table )
-                self.visualizer.addstrs([(p.y, p.x, p.player_info()) for i, p in enumerate(self.players) if i != 2 ])
-                self.visualizer.addstr(self.players[2].y, self.players[2].x,  self.players[2].player_info(hdr))
-                self.visualizer.addstr(self.table.bety, self.table.betx,  self.betting_info(), BETTING_DELAY)
-
-            else: print(hdr)
-
-            for pl in self.players: pl.last_raised = False 
-            self.players[2].last_raised = True
-            
-            self.minimum_bet = self.bb
-            idx = 3 # Action starts UTG
-            
-        else: # Post-Flop
-            # Find the first player after the dealer (Player 0) who is active
-            idx = 1 
-            while self.players[idx % len(self.players)].folded:
-                idx += 1
-            
-            # minimum_bet is the highest total_contribution currently in the pot
-            self.minimum_bet = max(p.total_contribution for p in self.players) if self.players else 0
-
-        
-        # 2. COLLECT BETS
-        all_called_checked = 0
-        n_players_to_act = len(active_players)
-        
-        # Loop until all players who can act have called the current minimum_bet
-        while all_called_checked < n_players_to_act:
-            
-            player_obj = self.players[idx % len(self.players)]
-            
-            # Skip folded or already all-in players
-            if player_obj.folded or player_obj.is_all_in or player_obj.is_out:
-                if player_obj.is_all_in: all_called_checked += 1
-                idx += 1
-                continue
-            
-
-            action, raise_amount = player_obj.get_action(self)
-
-            if action == 'call' or action == 'check': 
-                bet_placed, hdr = player_obj.call_check_bet(self.minimum_bet, verbose = False if self.visualizer else True)
-            elif action == 'raise':
-                bet_placed, hdr = player_obj.raise_bet(raise_amount, self.minimum_bet, verbose = False if self.visualizer else True)
-            elif action == 'fold':
-                cards_to_discard, hdr = player_obj.fold(verbose = False if self.visualizer else True)
-                self.deck.cards += cards_to_discard
+        with self.visualizer.frame():
+            for p in self.players:
+                if p is not player: p.draw(self.visualizer)
+            player.draw(self.visualizer, hdr)
+            self.draw_betting(BETTING_DELAY)
 
-            if player_obj.folded:
-                if self.visualizer:
-                    self.visualizer.clear_area(UIConfig.BETTING_ROW, 0,UIConfig.BETTING_ROW, self.visualizer.max_x_table )
-                    self.visualizer.addstrs([(p.y, p.x, p.player_info()) for i, p in enumerate(self.players) if i != idx % len(self.players) ])
-                    self.visualizer.addstr(self.players[idx % len(self.players)].y, self.players[idx % len(self.players)].x,  self.players[idx % len(self.players)].player_info(hdr))
-                    self.visualizer.addstr(self.table.bety, self.table.betx,  self.betting_info(), BETTING_DELAY)
-                else: print(f"{player_obj.name} folded")
-                idx +=1 
-                continue
+    def on_post(self, game, player, role, amount):
+        self.show_action(player, f'{player.name} is the {role}')
 
-            # Check if player raised (i.e., new total contribution > old minimum_bet)
-            if player_obj.total_contribution > self.minimum_bet:
-                
-                # New minimum bet to call is the player's new total contribution
-                self.minimum_bet = player_obj.total_contribution 
-                
-                # A raise restarts the loop condition for all players who still need to act
-                all_called_checked = 1 
-                for pl in self.players: pl.last_raised = False 
-                player_obj.last_raised = True
-                
-                if self.visualizer:
-                    self.visualizer.clear_area(UIConfig.BETTING_ROW, 0,UIConfig.BETTING_ROW, self.visualizer.max_x_table )
-                    self.visualizer.addstrs([(p.y, p.x, p.player_info()) for i, p in enumerate(self.players) if i != idx % len(self.players) ])
-                    self.visualizer.addstr(self.players[idx % len(self.players)].y, self.players[idx % len(self.players)].x,  self.players[idx % len(self.players)].player_info(hdr))
-                    self.visualizer.addstr(self.table.bety, self.table.betx,  self.betting_info(), BETTING_DELAY)
-                else: print(f"{player_obj.name} raised. New bet to call: £{self.minimum_bet:.2f}")
-            else:
-                # Player called or checked
-                all_called_checked += 1 
-                if self.visualizer: 
-                    self.visualizer.clear_area(UIConfig.BETTING_ROW, 0,UIConfig.BETTING_ROW, self.visualizer.max_x_table )
-                    self.visualizer.addstrs([(p.y, p.x, p.player_info()) for i, p in enumerate(self.players) if i != idx % len(self.players) ])
-                    self.visualizer.addstr(self.players[idx % len(self.players)].y, self.players[idx % len(self.players)].x,  self.players[idx % len(self.players)].player_info(hdr))
-                    self.visualizer.addstr(self.table.bety, self.table.betx,  self.betting_info(), BETTING_DELAY)
-
-            idx += 1
-                
+    def on_action(self, game, player, action, amount, bet):
+        self.show_action(player, action_message(player, action, amount, bet))
 
-        # 3. DISTRIBUTE CHIPS
-        self.distribute_chips_to_pots()
-        if not self.visualizer:
-            print(f'\nBetting Done. Total Pot: £{self.table.total_pot_amount:.2f} across {len(self.table.pots)} pot(s).')
-            for i, pot in enumerate(self.table.pots):
-                print(f"Pot {i+1}: {pot}")
-        else:
+    def on_pots(self, game):
+        with self.visualizer.frame():
             self.visualizer.clear_area(UIConfig.BETTING_ROW, 0,UIConfig.BETTING_ROW, self.visualizer.max_x_table )
-            self.visualizer.addstr(self.table.poty, self.table.potx, self.table.pot_info())
-            self.visualizer.addstr(self.table.bety, self.table.betx, self.betting_info(), BETTING_DELAY)
-
-
-
-    
-    
-    
-    def play(self, max_rounds = 5, suppress_output = False):
-
-        n = 0
+            self.table.draw_pots(self.visualizer)
+            self.draw_betting(BETTING_DELAY)
+        self.visualizer.flush() # the end of a street
+
+    def on_reveal(self, game, player, i, order):
+        player.hand_name, player.best_hand, _, player.discarded = get_best_5_card_hand(self.table.cards + player.hand)
+        with self.visualizer.frame():
+            self.visualizer.clear_area(self.table.y + 1, self.table.x, self.table.y + CARD_HEIGHT + 6, self.table.x + 7 + 7 * CARD_WIDTH )
+            self.table.draw(self.visualizer)
+            for j, pl in enumerate(order): pl.draw(self.visualizer, show = True if j <= i and not pl.folded else False)
+        self.visualizer.wait(SHOW_HANDS_DELAY)
+        player.draw(self.visualizer, show_cards = False)
+        self.visualizer.addstr(self.table.y + 2, self.table.x, self.winner_info(player), SHOW_HANDS_DELAY)
+
+    def on_pot_won(self, game, i, pot, player, winnings):
+        ftr = f"{player.name} wins £{winnings:.2f} from Pot {i+1}".ljust(5 * CARD_WIDTH + 4, ' ')
+        with self.visualizer.frame():
+            for pl in self.players: pl.draw(self.visualizer, show = True)
+            player.draw(self.visualizer, show_cards = False)
+            lines = self.winner_info(player).split('\n')
+            self.visualizer.addstr(self.table.y + 2, self.table.x, '\n'.join(lines[:-2] + [ftr + lines[-2][4 + 5 * CARD_WIDTH:]] + [lines[-1]]) , SHOW_HANDS_DELAY)
+        self.visualizer.flush()
+
+    def play(self, max_rounds = 5, suppress_output = False, history = None, profiler = None):
+        """
+        Plays the game; 'history' is a file to append the hand history to (see poker_history).
+        'profiler' is a poker_profile.PhaseProfiler: the time of each phase is reported at the end.
+        """
         context = open(os.devnull, 'w') if suppress_output and not self.visualizer else sys.stdout
+        writer = HandHistoryWriter(history) if history else None
+        if writer: self.subscribe(writer)
+        if profiler: profiler.attach(self)
         t_0 = time.time()
-        with redirect_stdout(context):
-            while self.running and self.n_rounds < max_rounds:
-                if len([p for p in self.players if not p.is_out]) < 3: 
-                    self.running = False # End game if not enough players 
-                    self.end_game()
-                    break
-                self.deal()
-                self.round_of_betting()
-                if self._check_for_quit(): break
-                self.flop()
-                self.round_of_betting()
-                if self._check_for_quit(): break
-                self.turn()
-                self.round_of_betting()
-                if self._check_for_quit(): break
-                self.river()
-                self.round_of_betting()
-                if self._check_for_quit(): break
-                self.show_hands()
-                n += 1
-                if n%len(self.players) == 0:
-                    self.reset(raise_blinds=1) 
-                    self.n_rounds += 1
-                else:
-                    self.reset()
-                if self._check_for_quit(): break # Exit the loop if Q was pressed here too
+        try:
+            with redirect_stdout(context):
+                Engine.play(self, max_rounds)
+        finally:
+            if writer: writer.close()
+            if profiler: profiler.detach()
         print(f'Game Over: ' + format_time(time.time() - t_0))
+        if profiler: print(profiler.report())
 
-class Player:
-    def __init__(self, idx, name="", is_human = False):
-        self.name = name
-        self.hand = []
+class Player(BasePlayer):
+    def __init__(self, idx, name="", is_human = False, ai = None):
+        super().__init__(idx, name, ai)
         self.best_hand = [] 
         self.hand_name = ''
         self.discarded = []
-        self.stack = 0
-        self.folded = False
-        self.score = (0,0)
-        self.rank = 0
-        self.total_contribution: float = 0.0  # Total money bet in the ENTIRE hand
-        self.current_round_bet: float = 0.0   # Money bet in the CURRENT betting round
-        self.is_all_in: bool = False
-        self.is_out = False
-        self.last_raised = False
         self.is_human = is_human # Store flag
 
-        self.idx = idx
         self.x = UIConfig.MARGIN_X + idx * UIConfig.PLAYER_WIDTH
         self.y = UIConfig.PLAYER_START_ROW
 
-        self.dealer = False
-        self.sb = False
-        self.bb = False
-
-        # self.ai = PokerAI(self.idx) 
-
     def show_hand(self):
         print(combine_cards([c for c in self.hand]))
 
-    def reset(self):
-        out = self.hand
-        self.hand = []
-        self.stake = 0
-        self.current_round_bet = 0.0
-        self.total_contribution = 0.0 # Crucial: Reset total contribution for a new hand
-        self.folded = False
-        self.is_all_in = False
-        assert(len(self.hand) == 0)
-        return out
-    
     def get_action(self, game):
         """
-        [PLACEHOLDER] This method will contain the logic for the AI (e.g., calling a Neural Network).
+        Asks a human player for their action (in the TUI or at the console); bots play
+        BasePlayer.get_action.
 
         Args:
             game (Game): The current Game instance, providing access to all state information.
@@ -744,7 +480,11 @@ class Player:
         to_call = game.minimum_bet - self.total_contribution
 
         if self.is_human:
-            if game.visualizer: return game.visualizer.get_human_action(self, to_call, game.min_raise)
+            if game.visualizer:
+                if game.visualizer.skipping:
+                    game.visualizer.skipping = False # this is the decision being skipped to
+                    game.visualizer.draw_speed()
+                with game.visualizer.direct(): return game.visualizer.get_human_action(self, to_call, game.min_raise)
             else:
                 while True:
                     choice = input('Call/Check (C), Fold (F), or Raise (R)? >> ')
@@ -764,82 +504,8 @@ class Player:
                         return 'raise', float(amount)
                     print('Please enter a valid choice')
             
-        # --- Current Placeholder Logic: Always call/check if possible, otherwise fold ---
-        
-   
-        
-        if to_call == 0:
-            # If no bet has been made, check
-            return 'check', 0
-        elif self.stack >= to_call:
-            # If we have enough chips, call
-            return 'call', to_call 
-        else:
-            # If we don't have enough chips, we must either fold or go all-in (we'll fold for now)
-            return 'fold', 0 
-        
-        # NOTE: Your Neural Network logic will replace this simple logic.
-        # It will use the game state (self.hand, game.table.community_cards, game.minimum_bet, 
-        # other players' actions) to decide.
-    
-    
-    def call_check_bet(self, minimum_bet, verbose = True):
-        # Bet required to match the minimum_bet (the highest total contribution)
-        bet_required = minimum_bet - self.total_contribution 
-        
-        # Calculate actual amount to bet (capped by stack)
-        bet_amount = min(bet_required, self.stack)
-        
-        if bet_amount <= 0: # Check
-            out_str = self.name + ' checks' 
-            if verbose: print( out_str)
-            return 0.0, out_str
-        
-        out_str = self.name + ' calls'  if bet_amount < self.stack or self.stake == 0 else self.name + f' calls (all in) £{bet_amount:.2f}'
-
-        if verbose: 
-            print( out_str)
-
-        self.stack -= bet_amount
-        self.total_contribution += bet_amount
-        self.current_round_bet += bet_amount
+        return super().get_action(game)
 
-        if self.stack == 0:
-            self.is_all_in = True
-        
-        return bet_amount, out_str
-        
-    def raise_bet(self, amount, minimum_bet, verbose = True):
-        # Calculate the amount needed to call the minimum_bet
-        call_amount = minimum_bet - self.total_contribution
-        
-        # The total amount the player wants to put in (call + raise amount)
-        total_bet_amount = call_amount + amount 
-        
-        # Check if they can cover the entire intended bet
-        if total_bet_amount >= self.stack:
-            bet_amount = self.stack
-            self.is_all_in = True
-            out_str = self.name + f' goes all in £{bet_amount:.2f}'
-        else:
-            bet_amount = total_bet_amount
-            out_str = self.name + f' raises £{amount:.2f} (Total bet: £{bet_amount:.2f})'
-        if verbose: print(out_str )
-
-        self.stack -= bet_amount
-        self.total_contribution += bet_amount
-        self.current_round_bet += bet_amount
-
-        return bet_amount, out_str
-
-    def fold(self, verbose = True):
-        out = self.hand
-        self.hand = []
-        out_str = self.name + ' folds'
-        self.folded = True
-        if verbose: print(out_str )
-        return out, out_str
-    
     def player_info(self, betting_str = '', show_cards = True, show = False, height = 13):
         hdr = self.name 
         if not self.is_human: hdr += ' (AI)'
@@ -857,59 +523,27 @@ class Player:
               if not self.is_out else '\nOut'.ljust(UIConfig.PLAYER_WIDTH) + '\n'.ljust(UIConfig.PLAYER_WIDTH)
         return hdr + '\n' + body + '\n' + ftr + 3 * pad
 
+    def panel_key(self, betting_str = '', show_cards = True, show = False, height = 13):
+        """Snapshot of everything player_info shows (see Visualizer.draw_panel)."""
+        return (self.name, self.is_human, self.dealer, self.sb, self.bb, tuple(to_card_ids(self.hand)), self.stack,
+                self.total_contribution, self.is_out, betting_str, show_cards, show, height, UIConfig.PLAYER_WIDTH)
 
+    def draw(self, visualizer, betting_str = '', show_cards = True, show = False, height = 13, wait = 0):
+        """Draws player_info at the player's position if it changed since it was last drawn."""
+        visualizer.draw_panel(('player', self.idx), self.y, self.x, self.panel_key(betting_str, show_cards, show, height),
+                              lambda: self.player_info(betting_str, show_cards, show, height), wait)
 
-    def __repr__(self):
-        status = []
-        if self.is_all_in: status.append("ALL-IN")
-        if self.folded: status.append("FOLDED")
-        status_str = f" ({', '.join(status)})" if status else ""
-        return f"Player(name='{self.name}', stack={self.stack:.2f}, total_contrib={self.total_contribution:.2f}{status_str})"
-
-    def __str__(self):
-        status = " (ALL-IN)" if self.is_all_in else ""
-        folded = " (FOLDED)" if self.folded else ""
-        return f"{self.name} | Stack: £{self.stack:.2f} | Bet: £{self.total_contribution:.2f}{status}{folded}"
-  
-
-class Pot:
-    def __init__(self, eligible_players, amount: float = 0.0, cap: float = float('inf')):
-        self.eligible_players = eligible_players # List of players who can win this pot
-        self.amount = amount                     # Total chips in this pot
-        self.cap = cap                           # Max contribution from any player to this pot
-   
-
-    def __repr__(self):
-        names = ", ".join([p.name for p in self.eligible_players])
-        return f"Pot(amount={self.amount:.2f}, cap={self.cap:.2f}, eligible=[{names}])"
 
-    def __str__(self):
-        names = "\n              ".join([p.name.ljust(UIConfig.POT_WIDTH - 14) for p in self.eligible_players])
-        cap_str = f" (Cap: £{self.cap:.2f})" if self.cap != float('inf') else ""
-        return f"£{self.amount:.2f}{cap_str} ".ljust(UIConfig.POT_WIDTH) + f"\n    Eligible: {names}"
-
-    
-class Table:
+class Table(Board):
     def __init__(self):
-        self.cards = []
-        self.pots: List[Pot] = []
+        Board.__init__(self)
         self.x = UIConfig.COMMUNITY_X
         self.y = UIConfig.COMMUNITY_Y
         self.potx = UIConfig.COMMUNITY_X + 6 + 7 * CARD_WIDTH + UIConfig.MARGIN_X
         self.poty = UIConfig.POT_Y
         self.betx = self.potx
         self.bety = UIConfig.PLAYER_START_ROW
-        
-    @property
-    def total_pot_amount(self) -> float:
-        return sum(p.amount for p in self.pots)
 
-    def reset(self):
-        out = self.cards
-        self.cards = []
-        self.pots = [] # Clear all pots for a new hand
-        return out
-    
     def table_info(self, hdr = True): 
         hdr = 'COMMUNITY CARDS'.center(5 * CARD_WIDTH + 4, '-') + '\n\n\n' if hdr else '\n\n\n'
         body = combine_cards(self.cards)
@@ -917,6 +551,9 @@ class Table:
         while len(body.split('\n')) < 10:
             body += pad
         return hdr + '\n' + body 
+
+    def draw(self, visualizer, hdr = True, wait = 0):
+        visualizer.draw_panel('table', self.y, self.x, (hdr, tuple(to_card_ids(self.cards))), lambda: self.table_info(hdr), wait)
     
     def pot_info(self): 
         hdr = 'POT'.center(UIConfig.POT_WIDTH, '-') +'\n\n'
@@ -924,13 +561,18 @@ class Table:
         if self.total_pot_amount != 0: 
             body = f'Total Pot: £{self.total_pot_amount:.2f} across {len(self.pots)} pot(s)'.ljust(UIConfig.POT_WIDTH) 
             for i, pot in enumerate(self.pots):
-                body += '\n\n' + f"Pot {i+1}: {pot}"
+                body += '\n\n' + f"Pot {i+1}: {pot_message(pot)}"
         pad = '\n' + ' ' * UIConfig.POT_WIDTH
         while len((hdr + body).split('\n')) < self.bety - self.poty :
             body += pad
     
         return hdr + body 
 
+    def draw_pots(self, visualizer, wait = 0):
+        key = (UIConfig.POT_WIDTH, self.bety - self.poty,
+               tuple((pot.amount, pot.cap, tuple(p.name for p in pot.eligible_players)) for pot in self.pots))
+        visualizer.draw_panel('pots', self.poty, self.potx, key, self.pot_info, wait)
+
 
     def __repr__(self):
         return f"Table(cards={len(self.cards)}, pots={self.pots})"
@@ -951,8 +593,21 @@ class Card:
         else:            name = str(rank) + ' of '
         name = name + suit
         self.name = name      
-        self.front = card_ascii(rank, suit)
-        self.back = card_ascii(rank, suit, back = True, back_color=back_color)
+        self.id = card_id(rank, suit) # compact integer id (0-51), see poker_hands
+        self.back_color = back_color
+
+    # Art is looked up in the shared card_ascii registry rather than rendered per card
+    @property
+    def front(self):
+        return card_art(self.rank, self.suit)
+
+    @property
+    def back(self):
+        return card_art(self.rank, self.suit, back = True, back_color=self.back_color)
+
+    @classmethod
+    def from_id(cls, card_id, back_color = RED):
+        return cls(CARD_SUITS[card_id], CARD_RANKS[card_id], back_color=back_color)
 
     def __repr__(self):
         return f"Card('{self.suit}', {self.rank})"
@@ -962,26 +617,35 @@ class Card:
 
 
 class DeckOfCards:
-    def __init__(self, n_decks = 1, back_color = RED):
+    def __init__(self, n_decks = 1, back_color = RED, as_ids = False):
+        """
+        as_ids: hold integer card ids (0-51) instead of Card objects. Hands dealt from such a
+        deck are plain ints, which the poker_hands evaluators and card_ascii rendering accept.
+        """
         self.cards = []
         self.discard = []
         self.x = UIConfig.DECK_X
         self.y = UIConfig.DECK_Y
         for i in range(n_decks):
+            if as_ids:
+                self.cards += list(range(N_CARDS)) # same order as the Card objects below
+                continue
             for suit in SUITS:
                 for rank in RANKS:
                     self.cards += [Card(suit, rank, back_color=back_color)]
 
+    @property
+    def cards_mask(self) -> int:
+        """Bitmask of the cards still in the deck (not dealt or discarded)."""
+        return hand_mask(self.cards)
+
     def shuffle(self):
         random.shuffle(self.cards)
 
     def sort(self):
-        def sort_key(card):
-            suit_index = SUITS.index(card.suit)
-            adjusted_rank = 14 if card.rank == 1 else card.rank
-            return (suit_index, adjusted_rank)
-        self.cards.sort(key=sort_key)
-        self.discard.sort(key=sort_key)
+        # Card ids are ordered by suit, then rank (Ace high)
+        self.cards.sort(key=to_card_id)
+        self.discard.sort(key=to_card_id)
 
     def cut(self, n = None):
         if not n: n = random.randint(0,len(self.cards))
@@ -995,23 +659,25 @@ class DeckOfCards:
         if not isinstance(recievers, list): recievers = [recievers]
         for _ in range(0, n_cards):
             if discard: 
-                if visualizer: visualizer.addstr(self.y, self.x, self.deck_info(), delay)
+                if visualizer: self.draw(visualizer, delay)
                 
                 self.discard += [self.cards.pop()]
-                if visualizer: visualizer.addstr(self.y, self.x, self.deck_info(), delay)
+                if visualizer: self.draw(visualizer, delay)
             
             for r in recievers:
                 if isinstance(r, Player): 
                     if not r.is_out: r.hand += [self.cards.pop()]
                     if visualizer: 
-                        visualizer.addstr(r.y, r.x, r.player_info())
-                        visualizer.addstr(self.y, self.x, self.deck_info(), delay)
+                        with visualizer.frame():
+                            r.draw(visualizer)
+                            self.draw(visualizer, delay)
                         
                 elif isinstance(r, Table): 
                     r.cards += [self.cards.pop()]
                     if visualizer: 
-                        visualizer.addstr(r.y, r.x, r.table_info(hdr = hdr))
-                        visualizer.addstr(self.y, self.x, self.deck_info(), delay)
+                        with visualizer.frame():
+                            r.draw(visualizer, hdr = hdr)
+                            self.draw(visualizer, delay)
             
             
 
@@ -1024,6 +690,10 @@ class DeckOfCards:
             body += pad
         return hdr + '\n' + body 
 
+    def draw(self, visualizer, wait = 0):
+        key = (len(self.cards), len(self.discard), tuple(to_card_ids(self.cards[:2])), tuple(to_card_ids(self.discard[:2])))
+        visualizer.draw_panel('deck', self.y, self.x, key, self.deck_info, wait)
+
 
     
     def __repr__(self):
@@ -0,0 +1,215 @@
+import argparse
+import cProfile
+import time
+from poker_ai import PokerAI
+from poker_engine import BasePlayer, Engine
+from poker_utils import format_time
+
+# --- Phase Profiler ---
+# Splits the time a game spends into phases, with a histogram of each, so hot spots can be
+# found under real play. PhaseProfiler.attach(engine) wraps the engine's phase methods and
+# every player's get_action on the instances; nothing is changed on the classes, so an
+# engine without a profiler attached runs exactly as before, at no cost.
+#
+# Phases are timed exclusively: the time of a phase excludes the phases nested in it (the
+# events emitted while paying the pots count as 'render', not 'showdown'), so the phases add
+# up to the time played.
+#   start hand  shuffling and the blinds        pots      distribute_chips_to_pots
+#   deal        hole cards, flop, turn, river   showdown  evaluating the hands and paying out
+#   betting     applying the actions            render    the observers: the front-ends' drawing
+#   decision    get_action (also per player)              and printing, the hand history...
+#   end hand    collecting the cards, moving the button (and the curses redraw)
+#
+# A range of hands can also be run under cProfile, with the stats dumped to a file for
+# pstats or snakeviz:
+#   profiler = PhaseProfiler(cprofile_hands = range(100, 110), cprofile_path = 'hands.prof')
+
+PHASE_METHODS = (('start_hand', 'start hand'), ('deal', 'deal'), ('flop', 'deal'), ('turn', 'deal'), ('river', 'deal'),
+                 ('act', 'betting'), ('distribute_chips_to_pots', 'pots'), ('show_hands', 'showdown'),
+                 ('emit', 'render'), ('redraw', 'render'), ('end_hand', 'end hand'))
+PHASES = ('start hand', 'deal', 'betting', 'decision', 'pots', 'showdown', 'render', 'end hand')
+
+
+class Histogram:
+    """Durations in power-of-two buckets of nanoseconds: bucket b holds [2**(b-1), 2**b) ns."""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max: self.max = seconds
+        bucket = int(seconds * 1e9).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q) -> float:
+        """Upper bound of the bucket holding the q-th quantile (0 to 1), capped by the maximum."""
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= q * self.count: return min(self.max, 2 ** bucket * 1e-9)
+        return self.max
+
+    def summary(self) -> dict:
+        return {'count': self.count, 'total': self.total, 'mean': self.mean,
+                'p50': self.percentile(0.5), 'p99': self.percentile(0.99), 'max': self.max}
+
+    def format(self, width = 40) -> str:
+        """One bar per bucket, e.g. '  1.02 μs - 2.05 μs  ########  1234'."""
+        if not self.count: return ''
+        most = max(self.buckets.values())
+        lines = []
+        for bucket in range(min(self.buckets), max(self.buckets) + 1):
+            n = self.buckets.get(bucket, 0)
+            low = format_time(2 ** (bucket - 1) * 1e-9) if bucket else '0'
+            bar = '#' * max(1 if n else 0, round(width * n / most))
+            lines.append(f"  {low:>10} - {format_time(2 ** bucket * 1e-9):<10} {bar:<{width}} {n}")
+        return '\n'.join(lines)
+
+
+class PhaseProfiler:
+    """
+    Times the phases of every hand an Engine (or Game) plays; see the notes above.
+
+        profiler = PhaseProfiler()
+        profiler.attach(game)
+        game.play(max_rounds = 10)
+        profiler.detach()
+        print(profiler.report())
+
+    Args:
+        cprofile_hands (range): hands (engine.n_hands when they start) to run under cProfile,
+                                in the first engine that plays them.
+        cprofile_path (str): where the cProfile stats are dumped when the last of them ends.
+    """
+    def __init__(self, cprofile_hands = None, cprofile_path = 'hands.prof'):
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.decisions = {} # player name -> Histogram of its get_action
+        self.hands = Histogram()
+        self.cprofile_hands = cprofile_hands
+        self.cprofile_path = cprofile_path
+        self.engine = None
+        self._profile = None
+        self._stack = [] # time spent in the nested phases of each phase running
+        self._wrapped = []
+
+    # --- Attaching ---
+
+    def attach(self, engine):
+        self.engine = engine
+        for method, phase in PHASE_METHODS:
+            if hasattr(engine, method): self._wrap(engine, method, self.phases[phase])
+        for player in engine.players:
+            self._wrap(player, 'get_action', self.phases['decision'], self.decisions.setdefault(player.name, Histogram()))
+        engine.subscribe(self)
+        return self
+
+    def detach(self):
+        """Removes the wrappers (and stops a cProfile run still going, dumping what it has)."""
+        for obj, method in self._wrapped: delattr(obj, method)
+        self._wrapped = []
+        if self.engine is not None and self in self.engine.observers: self.engine.observers.remove(self)
+        self._stop_cprofile()
+        self.engine = None
+
+    def _wrap(self, obj, method, histogram, player_histogram = None):
+        fn = getattr(obj, method)
+        stack, perf_counter = self._stack, time.perf_counter
+        def timed(*args, **kwargs):
+            stack.append(0.0)
+            t_0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - t_0
+                own = elapsed - stack.pop()
+                histogram.add(own)
+                if player_histogram is not None: player_histogram.add(own)
+                if stack: stack[-1] += elapsed
+        setattr(obj, method, timed)
+        self._wrapped.append((obj, method))
+
+    # --- Hands (as an Engine observer) ---
+    # These run inside the wrapped emit, so their own time is passed up as nested time to keep
+    # it out of 'render'.
+
+    def on_hand_start(self, engine):
+        t_0 = self._hand_start = time.perf_counter()
+        if self.cprofile_hands is not None and self._profile is None and engine.n_hands in self.cprofile_hands:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._exclude(t_0)
+
+    def on_hand_end(self, engine):
+        t_0 = time.perf_counter()
+        self.hands.add(t_0 - self._hand_start)
+        if self._profile is not None and engine.n_hands >= self.cprofile_hands[-1]: self._stop_cprofile()
+        self._exclude(t_0)
+
+    def _exclude(self, t_0):
+        if self._stack: self._stack[-1] += time.perf_counter() - t_0
+
+    def _stop_cprofile(self):
+        if self._profile is None: return
+        self._profile.disable()
+        self._profile.dump_stats(self.cprofile_path)
+        self._profile = None
+        self.cprofile_hands = None # one range per profiler
+
+    # --- Report ---
+
+    def summary(self) -> dict:
+        """{'hands': {...}, 'phases': {phase: {...}}, 'decisions': {player: {...}}}, in seconds (see Histogram.summary)."""
+        return {'hands': self.hands.summary(),
+                'phases': {phase: h.summary() for phase, h in self.phases.items()},
+                'decisions': {name: h.summary() for name, h in self.decisions.items()}}
+
+    def report(self, histograms = False) -> str:
+        """The summary as a table, optionally with the histogram of every phase."""
+        total = sum(h.total for h in self.phases.values()) or 1.0
+        hdr = f"{'':<16}{'calls':>9}{'total':>12}{'share':>8}{'mean':>12}{'p50':>12}{'p99':>12}{'max':>12}"
+        def row(name, h, share = True):
+            if not h.count: return f"{name:<16}{0:>9}"
+            return (f"{name:<16}{h.count:>9}{format_time(h.total):>12}" + (f"{h.total / total:>8.1%}" if share else ' ' * 8) +
+                    ''.join(f"{format_time(t):>12}" for t in (h.mean, h.percentile(0.5), h.percentile(0.99), h.max)))
+        lines = [f"{self.hands.count} hands, {format_time(total)} in the phases below", hdr]
+        lines += [row(phase, h) for phase, h in self.phases.items()]
+        lines += ['', 'Decisions by player', hdr]
+        lines += [row(name, h) for name, h in self.decisions.items()]
+        lines += ['', row('hand', self.hands, share = False)]
+        if histograms:
+            for phase, h in list(self.phases.items()) + [('hand', self.hands)]:
+                if h.count: lines += ['', phase, h.format()]
+        return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Profile headless games of bots by phase.')
+    parser.add_argument('--hands', type = int, default = 1000)
+    parser.add_argument('--players', type = int, default = 6)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--cprofile', type = int, nargs = 2, metavar = ('START', 'STOP'), default = None,
+                        help = 'run hands START to STOP-1 of the first game that plays them under cProfile')
+    parser.add_argument('--out', default = 'hands.prof', help = 'cProfile stats file')
+    parser.add_argument('--histograms', action = 'store_true')
+    parser.add_argument('--weights', default = None, help = "weights file for the bots' PokerAI (default: the placeholder rules)")
+    args = parser.parse_args()
+
+    profiler = PhaseProfiler(range(*args.cprofile) if args.cprofile else None, args.out)
+    seed = args.seed
+    while profiler.hands.count < args.hands:
+        players = [BasePlayer(i, name = f'Bot #{i+1}', ai = PokerAI(i, args.weights) if args.weights else None) for i in range(args.players)]
+        engine = Engine(players, buyin = 100, sb = 2, seed = seed)
+        profiler.attach(engine)
+        while profiler.hands.count < args.hands and engine.play_hand(): pass
+        profiler.detach()
+        seed += 1
+    print(profiler.report(args.histograms))
+    if args.cprofile: print(f"cProfile stats of hands {args.cprofile[0]} to {args.cprofile[1] - 1} in {args.out}")
@@ -0,0 +1,252 @@
+import argparse
+import multiprocessing as mp
+import queue
+import time
+import numpy as np
+from poker_ai import INPUT_VECTOR_SIZE, PokerAI, encode_states, tensorflow_available
+from poker_engine import BasePlayer, Engine
+from poker_utils import format_time
+
+# --- Self-Play Training ---
+# Trains PokerAI against itself with a policy gradient (REINFORCE with a mean baseline).
+# Training fits the Keras models, so it needs TensorFlow (the numpy backend is inference only).
+# Actors and the learner are separate processes:
+#   actors   each play many headless tables (poker_engine.Engine) in lock-step, every seat of
+#            every table played by the actor's one copy of the network, whose decisions are
+#            batched across the tables. Actions are sampled from the policy head (and the
+#            raise size jittered), and every decision is rewarded with the chips its player
+#            won or lost over the hand. Finished experience goes to the learner as (states,
+#            actions, magnitudes, rewards) arrays, as in poker_dataset.
+#   learner  gathers experience until it has a large batch, updates the dual-head network
+#            and broadcasts the new weights; actors pick them up between rounds of hands.
+# Actors may play a few rounds with weights one update old, which a policy gradient tolerates.
+
+EXPERIENCE_QUEUE_SIZE = 4 # chunks of experience waiting per actor before the actors block
+MAGNITUDE_NOISE = 0.1     # standard deviation of the exploration noise on the raise size
+ACTOR_POLL_TIME = 5.0     # seconds the learner waits for experience before checking the actors are alive
+
+
+class _Trajectories:
+    """Engine observer that fills in the reward of each decision once its hand is over."""
+    def __init__(self):
+        self.pending = []  # (row, player idx) of the decisions in the hand being played
+        self.finished = [] # (row, reward) of the decisions in finished hands
+
+    def on_hand_start(self, engine):
+        self.stacks = {p.idx: p.stack for p in engine.players}
+
+    def on_hand_end(self, engine):
+        stacks = {p.idx: p.stack for p in engine.players}
+        self.finished += [(row, stacks[idx] - self.stacks[idx]) for row, idx in self.pending]
+        self.pending = []
+
+
+class SelfPlayActor:
+    """
+    Plays n_tables tables of n_players seats with the policy and collects the experience.
+
+    Args:
+        ai (PokerAI): the policy, with the 'keras' backend; its weights are replaced with set_weights().
+        n_tables, n_players, buyin, sb: table set-up. A table is dealt again from scratch
+                                        when fewer than 3 players are left.
+        seed (int): seeds the tables and the action sampling.
+    """
+    def __init__(self, ai, n_tables = 64, n_players = 6, buyin = 100, sb = 2, seed = 0):
+        self.ai = ai
+        self.n_players, self.buyin, self.sb = n_players, buyin, sb
+        self.rng = np.random.default_rng(seed)
+        self.trajectories = {} # id(engine) -> _Trajectories
+        self.engines = [self._new_engine() for _ in range(n_tables)]
+
+    def _new_engine(self):
+        players = [BasePlayer(i, name = f'Bot #{i+1}') for i in range(self.n_players)]
+        engine = Engine(players, sb = self.sb, buyin = self.buyin, seed = int(self.rng.integers(1 << 63)))
+        trajectories = self.trajectories[id(engine)] = _Trajectories()
+        engine.subscribe(trajectories)
+        return engine
+
+    def set_weights(self, weights):
+        self.ai.model.set_weights(weights)
+
+    def play(self, n_hands = 1):
+        """
+        Plays n_hands hands on every table, batching the decisions across tables.
+
+        Returns:
+            Tuple[np.ndarray, ...]: (states, actions, magnitudes, rewards) of every decision.
+        """
+        states, actions, magnitudes, rewards = [], [], [], []
+        n_rows = 0
+        active = []
+        for i, engine in enumerate(self.engines):
+            if not engine.start_hand():
+                del self.trajectories[id(engine)]
+                engine = self.engines[i] = self._new_engine()
+                engine.start_hand()
+            active.append(engine)
+        played = {id(engine): 0 for engine in active}
+
+        while active:
+            inputs = encode_states([(engine, engine.to_act) for engine in active])
+            probabilities, raise_sizes = self.ai.predict_batch(inputs)
+            raise_sizes = np.clip(raise_sizes + self.rng.normal(0.0, MAGNITUDE_NOISE, len(raise_sizes)), 0.0, 1.0)
+            chosen = np.empty(len(active), dtype = np.int8)
+            for k, engine in enumerate(active):
+                player = engine.to_act
+                action, amount = self.ai._decode_action(engine, engine.players.index(player), probabilities[k], raise_sizes[k], self.rng)
+                chosen[k] = 0 if action == 'fold' else 2 if action == 'raise' else 1
+                self.trajectories[id(engine)].pending.append((n_rows + k, player.idx))
+                engine.act(action, amount)
+            states.append(inputs)
+            actions.append(chosen)
+            magnitudes.append(np.where(chosen == 2, raise_sizes, 0.0).astype(np.float32))
+            rewards.append(np.zeros(len(active), dtype = np.float32))
+            n_rows += len(active)
+
+            still_active = []
+            for engine in active:
+                if engine.to_act is not None:
+                    still_active.append(engine)
+                    continue
+                engine.end_hand()
+                played[id(engine)] += 1
+                if played[id(engine)] < n_hands and engine.start_hand(): still_active.append(engine)
+            active = still_active
+
+        rewards = np.concatenate(rewards) if rewards else np.zeros(0, dtype = np.float32)
+        for trajectories in self.trajectories.values():
+            for row, reward in trajectories.finished: rewards[row] = reward
+            trajectories.finished = []
+        if not states: return np.zeros((0, INPUT_VECTOR_SIZE), np.float32), np.zeros(0, np.int8), np.zeros(0, np.float32), rewards
+        return np.concatenate(states), np.concatenate(actions), np.concatenate(magnitudes), rewards
+
+
+class Learner:
+    """
+    Policy-gradient updates of a PokerAI's two heads from batches of experience.
+
+    Args:
+        ai (PokerAI): the network to train.
+        minibatch (int): rows per gradient step within an update.
+    """
+    def __init__(self, ai, minibatch = 1024):
+        self.ai = ai
+        self.minibatch = minibatch
+        self.n_updates = 0
+
+    def update(self, states, actions, magnitudes, rewards):
+        """
+        One pass over a batch. The action head is pushed towards actions that did better than
+        average (cross-entropy weighted by the advantage); the magnitude head is regressed onto
+        the raise sizes that did better than average.
+        """
+        advantages = (rewards - rewards.mean()) / (rewards.std() + 1e-8)
+        targets = np.eye(3, dtype = np.float32)[actions]
+        self.ai.action_model.fit(states, targets, sample_weight = advantages, batch_size = self.minibatch, epochs = 1, verbose = 0)
+        good_raises = (actions == 2) & (advantages > 0)
+        if good_raises.any():
+            self.ai.magnitude_model.fit(states[good_raises], magnitudes[good_raises], sample_weight = advantages[good_raises],
+                                        batch_size = self.minibatch, epochs = 1, verbose = 0)
+        self.n_updates += 1
+
+
+def run_actor(actor_id, weights_queue, experience_queue, stop, n_tables, n_players, hands_per_chunk, seed):
+    """Actor process: plays with the latest weights and sends the experience to the learner."""
+    actor = SelfPlayActor(PokerAI(0, backend = 'keras'), n_tables = n_tables, n_players = n_players, seed = seed + actor_id)
+    while not stop.is_set():
+        # Take the newest weights broadcast since the last chunk, if any
+        weights = None
+        while True:
+            try: weights = weights_queue.get_nowait()
+            except queue.Empty: break
+        if weights is not None: actor.set_weights(weights)
+        experience = actor.play(hands_per_chunk)
+        while not stop.is_set():
+            try:
+                experience_queue.put(experience, timeout = 0.5)
+                break
+            except queue.Full:
+                pass
+
+
+def _get_experience(experience_queue, actors):
+    """The next chunk of experience; raises RuntimeError if an actor has died instead of waiting forever."""
+    while True:
+        try:
+            return experience_queue.get(timeout = ACTOR_POLL_TIME)
+        except queue.Empty:
+            dead = [f"actor {i} (exit code {actor.exitcode})" for i, actor in enumerate(actors) if not actor.is_alive()]
+            if dead: raise RuntimeError(f"Self-play stopped: {', '.join(dead)} died.")
+
+
+def train(n_updates = 100, n_actors = 4, tables_per_actor = 64, n_players = 6, batch_size = 65536,
+          hands_per_chunk = 4, minibatch = 1024, seed = 0, checkpoint = None, verbose = True):
+    """
+    Trains a PokerAI by self-play with n_actors actor processes and a learner in this process.
+
+    Args:
+        n_updates (int): learner updates to make.
+        n_actors (int): actor processes; each plays tables_per_actor tables of n_players.
+        batch_size (int): decisions gathered for each update.
+        hands_per_chunk (int): hands per table between an actor's weight refreshes.
+        minibatch (int): rows per gradient step.
+        checkpoint (str): file to save the weights to after every update (save_weights).
+
+    Returns:
+        PokerAI: the trained network ('keras' backend).
+    """
+    if not tensorflow_available():
+        raise ImportError("Self-play training needs TensorFlow to fit the Keras models: pip install tensorflow.")
+    ai = PokerAI(0, backend = 'keras')
+    learner = Learner(ai, minibatch)
+    ctx = mp.get_context('spawn') # actors build their own TensorFlow state
+    stop = ctx.Event()
+    experience_queue = ctx.Queue(maxsize = EXPERIENCE_QUEUE_SIZE * n_actors)
+    weights_queues = [ctx.Queue() for _ in range(n_actors)]
+    actors = [ctx.Process(target = run_actor, daemon = True,
+                          args = (i, weights_queues[i], experience_queue, stop, tables_per_actor, n_players, hands_per_chunk, seed))
+              for i in range(n_actors)]
+
+    def broadcast():
+        weights = ai.model.get_weights()
+        for q in weights_queues: q.put(weights)
+
+    broadcast()
+    for actor in actors: actor.start()
+    t_0 = time.time()
+    try:
+        while learner.n_updates < n_updates:
+            chunks, n_rows = [], 0
+            while n_rows < batch_size:
+                chunk = _get_experience(experience_queue, actors)
+                chunks.append(chunk)
+                n_rows += len(chunk[1])
+            batch = [np.concatenate(arrays) for arrays in zip(*chunks)]
+            learner.update(*batch)
+            broadcast()
+            if checkpoint: ai.model.save_weights(checkpoint)
+            if verbose:
+                print(f"update {learner.n_updates}/{n_updates}: {n_rows} decisions, mean reward {batch[3].mean():+.3f}, "
+                      f"{format_time(time.time() - t_0)} elapsed")
+    finally:
+        stop.set()
+        for actor in actors: actor.join(timeout = 5)
+        for actor in actors:
+            if actor.is_alive(): actor.terminate()
+        # Weights nobody will read any more would otherwise hold up this process's exit
+        for q in weights_queues: q.cancel_join_thread()
+    return ai
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Train PokerAI by self-play.')
+    parser.add_argument('--updates', type = int, default = 100)
+    parser.add_argument('--actors', type = int, default = 4)
+    parser.add_argument('--tables', type = int, default = 64, help = 'tables per actor')
+    parser.add_argument('--players', type = int, default = 6)
+    parser.add_argument('--batch', type = int, default = 65536)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--checkpoint', default = 'poker_ai.weights.h5')
+    args = parser.parse_args()
+
+    train(args.updates, args.actors, args.tables, args.players, args.batch, seed = args.seed, checkpoint = args.checkpoint)
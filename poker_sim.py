@@ -0,0 +1,164 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from poker_engine import BasePlayer, Engine
+from poker_utils import format_time
+
+# --- Multi-Table Simulator ---
+# Plays many independent headless tables (see poker_engine.Engine) across a process pool
+# and merges the per-seat results into one report. Every table gets its own seed derived
+# from the run seed, so a run is reproducible whatever the number of workers.
+
+
+class SeatStats:
+    """Results of one seat, summed over every table it was played at."""
+    def __init__(self, seat, name = ''):
+        self.seat = seat
+        self.name = name
+        self.hands_played = 0
+        self.hands_won = 0    # hands where the seat won (a share of) at least one pot
+        self.showdowns = 0    # hands where the seat was still in at the showdown
+        self.chips_won = 0.0  # net chips over all hands played
+
+    @property
+    def chip_ev(self) -> float:
+        """Average net chips per hand played."""
+        return self.chips_won / self.hands_played if self.hands_played else 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.hands_won / self.hands_played if self.hands_played else 0.0
+
+    @property
+    def showdown_frequency(self) -> float:
+        return self.showdowns / self.hands_played if self.hands_played else 0.0
+
+    def merge(self, other):
+        self.hands_played += other.hands_played
+        self.hands_won += other.hands_won
+        self.showdowns += other.showdowns
+        self.chips_won += other.chips_won
+
+    def __repr__(self):
+        return f"SeatStats(seat={self.seat}, hands={self.hands_played}, chip_ev={self.chip_ev:.3f}, win_rate={self.win_rate:.3f})"
+
+
+class SimulationReport:
+    def __init__(self, seats, n_tables = 0, n_hands = 0, elapsed = 0.0):
+        self.seats = seats       # List[SeatStats], one per seat index
+        self.n_tables = n_tables
+        self.n_hands = n_hands
+        self.elapsed = elapsed
+
+    def merge(self, other):
+        for mine, theirs in zip(self.seats, other.seats):
+            mine.merge(theirs)
+        self.n_tables += other.n_tables
+        self.n_hands += other.n_hands
+
+    def __str__(self):
+        rate = self.n_hands / self.elapsed if self.elapsed else 0.0
+        lines = [f"{self.n_tables} tables, {self.n_hands} hands in {format_time(self.elapsed)} ({rate:.0f} hands/s)",
+                 f"{'Seat':<6}{'Name':<16}{'Hands':>9}{'Chip EV':>10}{'Win %':>8}{'Showdown %':>12}"]
+        for s in self.seats:
+            lines.append(f"{s.seat:<6}{s.name:<16}{s.hands_played:>9}{s.chip_ev:>10.3f}{100 * s.win_rate:>8.2f}{100 * s.showdown_frequency:>12.2f}")
+        return "\n".join(lines)
+
+
+class StatsObserver:
+    """Engine observer that accumulates SeatStats for one table."""
+    def __init__(self, players):
+        self.stats = {p.idx: SeatStats(p.idx, p.name) for p in players}
+        self.n_hands = 0
+
+    def on_hand_start(self, engine):
+        self._stacks = {p.idx: p.stack for p in engine.players if not p.is_out}
+        self._winners = set()
+
+    def on_showdown(self, engine):
+        # The Engine emits this even when everyone else folded; that's no showdown
+        live = [p for p in engine.players if not p.folded and not p.is_out]
+        if len(live) < 2: return
+        for p in live: self.stats[p.idx].showdowns += 1
+
+    def on_pot_won(self, engine, pot_idx, pot, player, winnings):
+        self._winners.add(player.idx)
+
+    def on_hand_end(self, engine):
+        self.n_hands += 1
+        for p in engine.players:
+            if p.idx not in self._stacks: continue
+            s = self.stats[p.idx]
+            s.hands_played += 1
+            s.chips_won += p.stack - self._stacks[p.idx]
+            if p.idx in self._winners: s.hands_won += 1
+
+
+def table_seed(seed, table_idx) -> int:
+    """Deterministic per-table seed (independent of the worker the table runs on)."""
+    return random.Random(f"{seed}:{table_idx}").getrandbits(64)
+
+
+def run_table(table_idx, n_players = 6, buyin = 100, sb = 2, max_rounds = 50, seed = 0, policy = None):
+    """Plays one table to completion and returns its SimulationReport. Runs in a worker process."""
+    players = [BasePlayer(i, name = f'Bot #{i+1}') for i in range(n_players)]
+    engine = Engine(players, sb = sb, buyin = buyin, seed = table_seed(seed, table_idx))
+    observer = StatsObserver(players)
+    engine.subscribe(observer)
+    engine.play(max_rounds = max_rounds, policy = policy)
+    seats = [observer.stats[i] for i in range(n_players)]
+    return SimulationReport(seats, n_tables = 1, n_hands = observer.n_hands)
+
+
+def _run_table_args(args):
+    return run_table(*args)
+
+
+def simulate(n_tables = 100, n_players = 6, buyin = 100, sb = 2, max_rounds = 50, seed = 0, workers = None, policy = None):
+    """
+    Plays n_tables independent tables of n_players bots, sharded across a ProcessPoolExecutor.
+
+    Args:
+        n_tables (int): number of tables to play.
+        n_players, buyin, sb: table set-up, as in Game(players, buyin, sb).
+        max_rounds (int): orbits of the dealer button per table (the blinds go up after each).
+        seed (int): run seed; table i is seeded with table_seed(seed, i).
+        workers (int): worker processes (default: one per core); 1 runs in this process.
+        policy: picklable (module-level) callable policy(engine, player) -> (action, amount);
+                defaults to BasePlayer.get_action.
+
+    Returns:
+        SimulationReport: per-seat chip EV, win rate and showdown frequency over all tables.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(i, n_players, buyin, sb, max_rounds, seed, policy) for i in range(n_tables)]
+    report = SimulationReport([SeatStats(i, f'Bot #{i+1}') for i in range(n_players)])
+
+    t_0 = time.time()
+    if workers == 1:
+        results = map(_run_table_args, tasks)
+        for result in results: report.merge(result)
+    else:
+        # Several tables per task keeps the inter-process overhead small next to the play
+        chunksize = max(1, n_tables // (workers * 4))
+        with ProcessPoolExecutor(max_workers = workers) as executor:
+            for result in executor.map(_run_table_args, tasks, chunksize = chunksize):
+                report.merge(result)
+    report.elapsed = time.time() - t_0
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Play many headless poker tables in parallel.')
+    parser.add_argument('--tables', type = int, default = 100)
+    parser.add_argument('--players', type = int, default = 6)
+    parser.add_argument('--buyin', type = int, default = 100)
+    parser.add_argument('--sb', type = int, default = 2)
+    parser.add_argument('--rounds', type = int, default = 50)
+    parser.add_argument('--seed', type = int, default = 0)
+    parser.add_argument('--workers', type = int, default = None)
+    args = parser.parse_args()
+
+    print(simulate(args.tables, args.players, args.buyin, args.sb, args.rounds, args.seed, args.workers))
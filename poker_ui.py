@@ -1,5 +1,9 @@
 import curses
 import os
+import select
+import sys
+from contextlib import contextmanager
+from functools import lru_cache
 from card_ascii import *
 import time
 import math
@@ -11,6 +15,13 @@ BLACK_PAIR = 2
 HIGHLIGHT_PAIR = 3
 MESSAGE_PAIR = 4
 
+LINE_CACHE_SIZE = 4096 # parsed lines kept by each Visualizer (art repeats; panel text changes)
+
+INSTANT = math.inf # speed at which pauses are dropped and only the end of each street is drawn
+SPEED_KEYS = {curses.KEY_F5: 1, curses.KEY_F6: 4, curses.KEY_F7: INSTANT}
+SKIP_KEY = curses.KEY_F8 # instant until the human player's next decision
+SPEED_HELP = '[F5] 1x  [F6] 4x  [F7] instant  [F8] skip to my turn'
+
 
 
 
@@ -21,7 +32,31 @@ class Visualizer:
         self.ideal_x = 200
         self.ideal_y = 50
 
+        # --- Curses Color/Attribute Mapping ---
+        # Assuming the standard color pairs initialized below
+        self.ansi_attrs = {
+            BLACK:   curses.color_pair(1), # Black text on White BG
+            RED:     curses.color_pair(2), # Red text on White BG
+            BLUE:    curses.color_pair(3), # Blue text on White BG
+            MAGENTA: curses.color_pair(4), # Magenta text on White BG
+            END:     curses.color_pair(1), # Reset
+        }
+        self.default_attr = curses.color_pair(1)
+        # Art lines are drawn over and over, so each distinct line is only parsed once
+        self._parse_line = lru_cache(maxsize=LINE_CACHE_SIZE)(self._parse_line)
+        self._frame_depth = 0
+        self._extent = []   # (row, x start, x end) of every line the last addstr drew
+        self.panels_drawn = 0
+        self._size = None
+        self.frames = None  # a FrameQueue while an event loop plays the frames (see poker_async)
+        self.quit_requested = False
+        self.speed = 1 # 1, 4 or INSTANT (see SPEED_KEYS)
+        self.skipping = False
+        self._direct_depth = 0
+        self._resized_to = None # screen size of the last KEY_RESIZE poll_key returned
+
         # Configure the screen
+        if hasattr(curses, 'set_escdelay'): curses.set_escdelay(25) # ESC on its own is reported without the default 1 s wait
         curses.curs_set(0) # Hide cursor
         stdscr.nodelay(True) # Non-blocking input
         self.stdscr.timeout(100)
@@ -55,10 +90,12 @@ class Visualizer:
                 pass
         self.max_x_table = self.max_x - UIConfig.MARGIN_X - UIConfig.POT_WIDTH
 
+        self._reset_buffers() # The colour set-up above bypassed the buffers
         self.stdscr.refresh()
 
     def get_screen_dimensions(self):
         self.max_y, self.max_x = self.stdscr.getmaxyx()
+        if self._size != (self.max_y, self.max_x): self._reset_buffers()
         self.max_x_table = self.max_x - UIConfig.MARGIN_X - UIConfig.POT_WIDTH
         self.clear_area(0,0,0,self.max_x)
         self.center = (self.max_x//2, self.max_y//2)
@@ -69,7 +106,7 @@ class Visualizer:
             y_check = True
         if self.max_x < self.ideal_x:
             if y_check: warning_msg += ' and '
-            warninhg_msg += f'width (currently {self.max_x}; recommended {self.ideal_x})'
+            warning_msg += f'width (currently {self.max_x}; recommended {self.ideal_x})'
     
         if warning_msg: self.addstr(0, UIConfig.MARGIN_X, RED + 'WARNING: Screen too small in ' + warning_msg + END)
 
@@ -78,101 +115,243 @@ class Visualizer:
         Retrieves a key from the screen in non-blocking mode.
         Returns the integer value of the key, or -1 if no key was pressed.
         """
-        return self.stdscr.getch()
+        key = self.poll_key()
+        self.handle_key(key)
+        return 27 if self.quit_requested else key # quit_requested may also come from a pause
 
-    def addstr(self, y: int, x: int, text: str, wait = 0, overwrite = True, ignore_spaces = False) -> int:
+    def poll_key(self, timeout = 0.0):
         """
-        Helper method to render a multi-line string starting at (y, x).
-        It respects newlines and attempts to center each line horizontally.
-        Returns the final row index used.
+        Returns the next key if one arrives within 'timeout' seconds, else -1.
+        Waits on stdin rather than on getch(), so the blocking mode set by the prompts is left alone.
+        A resize puts nothing on stdin, and a blocking getch() only reports it with the next key,
+        so the screen is resized here as soon as the terminal's size no longer matches it, which
+        queues the KEY_RESIZE returned. ncurses still reports that resize again with the next key;
+        the repeat is skipped.
+        """
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        if not ready:
+            try:
+                cols, rows = os.get_terminal_size(sys.__stdout__.fileno())
+            except OSError: # not a terminal
+                return -1
+            if not curses.is_term_resized(rows, cols): return -1
+            curses.resizeterm(rows, cols)
+        key = self.stdscr.getch()
+        if key == curses.KEY_RESIZE:
+            if self.stdscr.getmaxyx() == self._resized_to: return self.stdscr.getch() # the repeat: the key follows
+            self._resized_to = self.stdscr.getmaxyx()
+        return key
+
+    def wait(self, seconds):
+        """
+        Holds the current frame for 'seconds' at 1x speed. This is the only place the UI pauses:
+        with an event loop attached the hold is queued with the frame, otherwise it sleeps while
+        watching the keyboard, so that ESC and the speed keys take effect during the pause.
         """
+        if seconds <= 0 or self.quit_requested: return
+        seconds = 0.0 if self.instant else seconds / self.speed
+        if self.frames is not None:
+            if seconds: self.frames.hold(seconds)
+            return
+        end = time.monotonic() + seconds
+        pending = []
+        while True:
+            key = self.poll_key(max(0.0, end - time.monotonic()))
+            if key != -1 and not self.handle_key(key): pending.append(key)
+            if self.quit_requested or self.instant or time.monotonic() >= end: break
+        # Other keys typed during the pause are handed back for the next prompt
+        for key in reversed(pending): curses.ungetch(key)
+
+    # --- Speed ---
+    # Every pause is scaled by the speed picked with SPEED_KEYS. At INSTANT speed (and while
+    # skipping to the human player's next decision) the pauses are dropped and present() only
+    # writes when forced: the game forces it at the end of each street and the prompts draw
+    # directly, so the intermediate frames are coalesced into the final state of each street.
+
+    @property
+    def instant(self) -> bool:
+        return self.speed == INSTANT or self.skipping
+
+    def handle_key(self, key) -> bool:
+        """Acts on ESC and the speed keys; returns False for any other key."""
+        if key == 27:
+            self.quit_requested = True
+            return True
+        if key in SPEED_KEYS: self.speed, self.skipping = SPEED_KEYS[key], False
+        elif key == SKIP_KEY: self.skipping = True
+        else: return False
+        self.draw_speed()
+        self.present(force = True)
+        return True
+
+    def draw_speed(self):
+        """Draws the current speed and the keys to change it along the top row."""
+        label = 'skipping' if self.skipping else 'instant' if self.speed == INSTANT else f'{self.speed}x'
+        text = f'Speed: {label:<8}  {SPEED_HELP}'
+        self.draw_panel('speed', 0, self.center[0] - len(text)//2, text, lambda: text)
+
+    def flush(self):
+        """Shows the final state of a street: forces the present that instant speed skipped."""
+        if self.instant: self.present(force = True)
+
+    # --- Frame Buffer ---
+    # Drawing goes into a back buffer of (char, attr) cells instead of straight to curses.
+    # present() diffs it against the front buffer (what the terminal shows) and writes only
+    # the changed runs, then updates the terminal once. Drawing calls made inside
+    # 'with visualizer.frame():' are presented together when the outermost frame ends;
+    # outside a frame each call is presented straight away.
+
+    def _reset_buffers(self):
+        """(Re)allocates the buffers for the current screen size; the whole screen is repainted on the next present()."""
+        self._size = (self.max_y, self.max_x)
+        self._chars = [[' '] * self.max_x for _ in range(self.max_y)]
+        self._attrs = [[self.default_attr] * self.max_x for _ in range(self.max_y)]
+        self._front_chars = [[None] * self.max_x for _ in range(self.max_y)]
+        self._front_attrs = [[None] * self.max_x for _ in range(self.max_y)]
+        self._panels = {}
+
+    @contextmanager
+    def frame(self):
+        """Batches every drawing call in the block into one present()."""
+        self._frame_depth += 1
+        try:
+            yield self
+        finally:
+            self._frame_depth -= 1
+            if not self._frame_depth: self.present()
 
-        # --- Curses Color/Attribute Mapping ---
-        # Assuming the standard color pairs initialized in __init__
-        COLOR_BLACK = curses.color_pair(1)  # Black text on White BG
-        COLOR_RED = curses.color_pair(2)  # Red text on White BG
-        COLOR_BLUE = curses.color_pair(3)  # Red text on White BG
-        COLOR_MAGENTA = curses.color_pair(4)  # Red text on White BG
-        COLOR_DEFAULT = curses.color_pair(1) 
-        
-        ANSI_MAP = {
-            '\033[90m': COLOR_BLACK, # Black (Default)
-            '\033[91m': COLOR_RED,            # Red
-            '\033[94m': COLOR_BLUE,    # Blue
-            '\033[95m': COLOR_MAGENTA,    # Blue
-            '\033[0m':  COLOR_DEFAULT,         # Reset
-        }
+    def present(self, force = False):
+        """
+        Writes the cells that changed since the last present() and updates the terminal once.
+        At instant speed this is skipped unless forced (or inside direct()).
+        """
+        if self.instant and not force and not self._direct_depth: return
+        if self.frames is not None:
+            # The event loop plays the frame when its turn comes, so it gets a copy of the buffer
+            self.frames.push([row[:] for row in self._chars], [row[:] for row in self._attrs])
+        else:
+            self._write(self._chars, self._attrs)
 
-        
-        # Define the most common ANSI sequences to look for
-        ANSI_SEQUENCES = list(ANSI_MAP.keys())
+    @contextmanager
+    def direct(self):
+        """
+        Presents straight to the terminal inside the block, whatever the speed and even with an
+        event loop attached: for prompts, which have to show every keystroke.
+        """
+        frames, self.frames = self.frames, None
+        self._direct_depth += 1
+        try:
+            self.present()
+            yield self
+        finally:
+            self._direct_depth -= 1
+            self.frames = frames
+
+    def _write(self, back_chars, back_attrs):
+        """Diffs the given buffer against the front buffer and writes the changed runs."""
+        if (len(back_chars), len(back_chars[0]) if back_chars else 0) != self._size: return # drawn before a resize
+        for y in range(self.max_y):
+            chars, attrs = back_chars[y], back_attrs[y]
+            front_chars, front_attrs = self._front_chars[y], self._front_attrs[y]
+            if chars == front_chars and attrs == front_attrs: continue
+            changed = [x for x in range(self.max_x) if chars[x] != front_chars[x] or attrs[x] != front_attrs[x]]
+            start, end = changed[0], changed[-1] + 1
+            # One addnstr per run of equal attributes over the changed span
+            x = start
+            while x < end:
+                attr = attrs[x]
+                run_end = x + 1
+                while run_end < end and attrs[run_end] == attr: run_end += 1
+                try:
+                    self.stdscr.addnstr(y, x, ''.join(chars[x:run_end]), run_end - x, attr)
+                except curses.error:
+                    # Writing the bottom-right cell moves the cursor off screen; the cell is still drawn
+                    pass
+                x = run_end
+            front_chars[start:end] = chars[start:end]
+            front_attrs[start:end] = attrs[start:end]
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def clear(self):
+        """Clears the screen and both buffers."""
+        self.stdscr.clear()
+        self._reset_buffers()
+        for y in range(self.max_y):
+            self._front_chars[y][:] = self._chars[y]
+            self._front_attrs[y][:] = self._attrs[y]
+
+    def _parse_line(self, line: str, attr: int):
+        """Splits a line into (text, attr) runs on its ANSI colour codes; returns the runs and the attr it ends with."""
+        runs = []
+        for part in ANSI_ESCAPE.split(line):
+            if not part: continue
+            if part[0] == '\033':
+                attr = self.ansi_attrs.get(part, attr)
+            else:
+                runs.append((part, attr))
+        return tuple(runs), attr
 
-        max_y, max_x = self.stdscr.getmaxyx()
-        
-        lines = text.split('\n')
+    def addstr(self, y: int, x: int, text: str, wait = 0, overwrite = True, ignore_spaces = False) -> int:
+        """
+        Helper method to render a multi-line string starting at (y, x).
+        It respects newlines and ANSI colour codes (which carry over from line to line).
+        overwrite = False only draws on blank cells; ignore_spaces leaves the cells under a
+        line's leading and trailing spaces untouched.
+        Returns the final row index used.
+        """
+        max_y, max_x = self.max_y, self.max_x
         current_y = y
         # Start with the default color attribute
-        current_attr = COLOR_DEFAULT 
-
-        for line in lines:
-
-            first_non_space = len(line) if not line.strip() else line.find(line.strip()[0])
-            last_non_space =  len(line) if not line.strip() else line.rfind(line.strip()[-1])
+        current_attr = self.default_attr
+        self._extent = extent = []
 
+        for line in text.split('\n'):
             if current_y >= max_y:
                 break
-            
-            # Calculate x position to center the current line content (after removing ANSI codes)
-            clean_line = line
-            for seq in ANSI_SEQUENCES:
-                clean_line = clean_line.replace(seq, '')
-                
-            current_x = x
-            
-            i = 0
-            while i < len(line):
-                
-                # Check for ANSI escape sequences
-                found_ansi = False
-                for seq in ANSI_SEQUENCES:
-                    seq_len = len(seq)
-                    if line[i:i + seq_len] == seq:
-                        current_attr = ANSI_MAP[seq] 
-                        i += seq_len
-                        found_ansi = True
-                        break
-                
-                if found_ansi:
+            runs, current_attr = self._parse_line(line, current_attr)
+            if current_y < 0:
+                current_y += 1
+                continue
+            chars, attrs = self._chars[current_y], self._attrs[current_y]
+            if ignore_spaces:
+                clean_line = ''.join(part for part, _ in runs)
+                first_non_space = len(clean_line) - len(clean_line.lstrip(' '))
+                last_non_space = len(clean_line.rstrip(' ')) - 1
+
+            current_x, i = x, 0
+            for part, attr in runs:
+                n = len(part)
+                if overwrite and not ignore_spaces and 0 <= current_x and current_x + n <= max_x:
+                    # Fast path: the whole run lands on screen
+                    chars[current_x:current_x + n] = part
+                    attrs[current_x:current_x + n] = [attr] * n
+                    current_x += n
+                    i += n
                     continue
-                
-                # Draw the actual character
-                char = line[i]
-
-                can_write = overwrite or not self.is_cell_filled(current_y, current_x)
-                if char == ' ' and ignore_spaces and (i < first_non_space or i > last_non_space): 
-                    can_write = False
-                # Avoid writing off the screen horizontally or vertically
-                if current_x < max_x and current_y < max_y:
-                    try:
-                        if can_write: self.stdscr.addstr(current_y, current_x, char, current_attr | curses.A_NORMAL)
-                    except curses.error:
-                        # Should not happen if bounds check is correct, but safe to catch
-                        pass 
-
-                current_x += 1
-                i += 1
-            
+                for char in part:
+                    can_write = 0 <= current_x < max_x and (overwrite or chars[current_x] == ' ')
+                    if char == ' ' and ignore_spaces and (i < first_non_space or i > last_non_space):
+                        can_write = False
+                    if can_write:
+                        chars[current_x] = char
+                        attrs[current_x] = attr
+                    current_x += 1
+                    i += 1
+
+            if current_x > x: extent.append((current_y, max(0, x), min(max_x, current_x)))
             current_y += 1
-            
-        self.stdscr.refresh()
-        if wait: time.sleep(wait)
+
+        if not self._frame_depth or wait: self.present()
+        self.wait(wait)
         return current_y - 1
-        
+
 
     def addstrs(self, str_list, wait = 0):
-        for y, x, str in str_list:
-            self.addstr(y, x, str)
-        time.sleep(wait)
+        with self.frame():
+            for y, x, str in str_list:
+                self.addstr(y, x, str)
+        self.wait(wait)
 
     def clear_area(self, y1: int, x1: int, y2: int, x2: int):
         """
@@ -196,54 +375,71 @@ class Visualizer:
         if width <= 0:
             return
 
-        clear_line = ' ' * width
-
-        # Iterate over the rows and draw the space string
         for y in range(y_start, y_end + 1):
-            # We call addstr which uses the default background color/attribute
-            self.addstr(y, x_start, clear_line) 
-
-        # self.stdscr.refresh()
+            self._chars[y][x_start:x_end + 1] = ' ' * width
+            self._attrs[y][x_start:x_end + 1] = [self.default_attr] * width
+        if not self._frame_depth: self.present()
 
     def is_cell_filled(self, y: int, x: int) -> bool:
         """
-        Checks if the cell at (y, x) contains a non-space character
-        on the curses standard screen (stdscr).
-        
+        Checks if the cell at (y, x) holds a non-space character (in the frame being drawn).
+
         Args:
-            stdscr: The curses screen object.
             y (int): Row coordinate.
             x (int): Column coordinate.
-            max_y (int): Max row index of the terminal.
-            max_x (int): Max column index of the terminal.
-                
+
         Returns:
             bool: True if the cell contains a character other than a space.
         """
-
-        max_x , max_y = self.max_x, self.max_y
-        # 1. Boundary Check: Ensure the coordinates are valid
-        if y < 0 or y >= max_y or x < 0 or x >= max_x:
+        # Boundary Check: Ensure the coordinates are valid
+        if y < 0 or y >= self.max_y or x < 0 or x >= self.max_x:
             return False # Outside the screen bounds
+        return self._chars[y][x] != ' '
 
-        try:
-            # 2. Use stdscr.inch(y, x) to get the character and its attributes
-            # inch() returns an integer, where the character is the lower 8 bits.
-            char_int = self.stdscr.inch(y, x)
-            
-            # 3. Extract the character (mask off attributes)
-            char_code = char_int & 0xFF
-            
-            # 4. Convert the character code back to a string character
-            # Note: In a class method, this uses 'self.stdscr'
-            current_char = chr(char_code)
+    # --- Panels ---
+    # A panel is a block of text showing one piece of state (a player, the deck, the pot...).
+    # It is drawn with a key snapshotting that state; while the key is unchanged the text is
+    # not rebuilt: the cells drawn last time are reused, and only copied back if something
+    # else has drawn over them since.
 
-            # 5. Check if the character is not a space
-            return current_char != ' '
-            
-        except curses.error:
-            # Handle exceptions like terminal resize issues
-            return False
+    def draw_panel(self, name, y: int, x: int, key, render, wait = 0) -> bool:
+        """
+        Draws the panel 'name' at (y, x) unless it is unchanged and still on screen.
+
+        Args:
+            name: identifies the panel.
+            key: hashable snapshot of everything the panel's text depends on.
+            render: builds the panel's text; only called when the key (or position) changed.
+            wait (float): seconds to pause after drawing, as for addstr (paused even if skipped).
+
+        Returns:
+            bool: True if any cell was drawn.
+        """
+        panel = self._panels.get(name)
+        if panel is not None and panel[0] == (y, x, key):
+            chars, attrs = self._chars, self._attrs
+            rows = panel[1]
+            intact = all(chars[r][x0:x1] == row_chars and attrs[r][x0:x1] == row_attrs
+                         for r, x0, x1, row_chars, row_attrs in rows)
+            if not intact:
+                for r, x0, x1, row_chars, row_attrs in rows:
+                    chars[r][x0:x1] = row_chars
+                    attrs[r][x0:x1] = row_attrs
+                self.panels_drawn += 1
+            if (not intact and not self._frame_depth) or wait: self.present()
+            self.wait(wait)
+            return not intact
+
+        self.addstr(y, x, render(), wait)
+        # Remember the drawn cells up to the last visible one on each row: padding may be drawn
+        # over by neighbouring panels (as when they were drawn after this one) without loss
+        rows = []
+        for r, x0, x1 in self._extent:
+            x1 = x0 + len(''.join(self._chars[r][x0:x1]).rstrip(' '))
+            if x1 > x0: rows.append((r, x0, x1, self._chars[r][x0:x1], self._attrs[r][x0:x1]))
+        self._panels[name] = ((y, x, key), rows)
+        self.panels_drawn += 1
+        return True
         
     def starting_animation(self, deck1, deck2):
 
@@ -273,20 +469,23 @@ class Visualizer:
         title_card = title_ascii()
         
         while i > -3*overlap_num:
-            x1, x2 = centre[0] - i * centre[0]/n_cards, centre[0] + (i + 3 * overlap_num) * centre[0]/n_cards
-            x3, x4 = centre[0] - (i + 2 * overlap_num) * centre[0]/n_cards, centre[0] + (i +  1 * overlap_num) * centre[0]/n_cards
-            # self.addstr(1 , 1, f'{x1} {f(x1)}', 0.1)
-            # coming from the left:
-            if x1 <= centre[0]: self.addstr(round(centre[1] + f(x1))+h , round(x1)+w, deck1.cards.pop().back, overwrite=check_overwrite(x1))
-            if x3 <= centre[0]: self.addstr(round(centre[1] - f(x3))+h , round(x3)+w, deck2.cards.pop().back,  overwrite = not check_overwrite(x3))
-            # coming from the right:
-            if x2 >= centre[0]: self.addstr(round(centre[1] + f(x2))+h , round(x2)+w, deck1.cards.pop().back, overwrite= check_overwrite(x2))
-            if x4 >= centre[0]: self.addstr(round(centre[1] - f(x4))+h , round(x4)+w, deck2.cards.pop().back, overwrite= not check_overwrite(x4))
-
-            if x1 > centre[0]: 
-                self.addstr(centre[1]-len(title_card.split('\n'))//2 - 1 , centre[0]-len(title_card.split('\n')[0])//2 - 1, title_card , ignore_spaces=True )
-
-            time.sleep(0.02)
+            # One frame per step of the fly-in
+            with self.frame():
+                x1, x2 = centre[0] - i * centre[0]/n_cards, centre[0] + (i + 3 * overlap_num) * centre[0]/n_cards
+                x3, x4 = centre[0] - (i + 2 * overlap_num) * centre[0]/n_cards, centre[0] + (i +  1 * overlap_num) * centre[0]/n_cards
+                # self.addstr(1 , 1, f'{x1} {f(x1)}', 0.1)
+                # coming from the left:
+                if x1 <= centre[0]: self.addstr(round(centre[1] + f(x1))+h , round(x1)+w, deck1.cards.pop().back, overwrite=check_overwrite(x1))
+                if x3 <= centre[0]: self.addstr(round(centre[1] - f(x3))+h , round(x3)+w, deck2.cards.pop().back,  overwrite = not check_overwrite(x3))
+                # coming from the right:
+                if x2 >= centre[0]: self.addstr(round(centre[1] + f(x2))+h , round(x2)+w, deck1.cards.pop().back, overwrite= check_overwrite(x2))
+                if x4 >= centre[0]: self.addstr(round(centre[1] - f(x4))+h , round(x4)+w, deck2.cards.pop().back, overwrite= not check_overwrite(x4))
+
+                if x1 > centre[0]: 
+                    self.addstr(centre[1]-len(title_card.split('\n'))//2 - 1 , centre[0]-len(title_card.split('\n')[0])//2 - 1, title_card , ignore_spaces=True )
+
+            self.wait(0.02)
+            if self.quit_requested: return
 
             i -= 1
 
@@ -296,6 +495,7 @@ class Visualizer:
 
                 # --- KEY PRESS WAITING LOGIC ---
         wait_msg = "PRESS ANY KEY TO START"
+        self.present(force = True)
         self.stdscr.addstr(round(y_dim * 3/4) + 6, centre[0] - len(wait_msg)//2, wait_msg, curses.A_BLINK)
         
         # 1. Temporarily enable blocking mode
@@ -305,7 +505,7 @@ class Visualizer:
         # 3. Restore non-blocking mode
         self.stdscr.nodelay(True) 
 
-        self.stdscr.clear()
+        self.clear()
         
 
 
@@ -502,8 +702,8 @@ class Visualizer:
 
             # Ignore other keys and keep waiting
         
-        # Cleanup input line
-        self.clear_area(prompt_y, 0,prompt_y, self.max_x_table )
+        # Cleanup input lines (the panels drawn under them are restored on the next redraw)
+        self.clear_area(prompt_y, 0,prompt_y + 1, self.max_x_table )
         self.stdscr.nodelay(True) # Back to non-blocking
         curses.curs_set(0) # Hide cursor
         
@@ -0,0 +1,78 @@
+import random
+from collections import namedtuple
+from itertools import combinations
+import numpy as np
+import pytest
+from poker_hands import *
+from poker_hands import _build_non_flush_table, _NON_FLUSH_TABLE
+
+# The lookup-table evaluator must order hands exactly as the original evaluator did: the best
+# (Rank ID, Kicker Tuple) of get_poker_hand_rank over every 5-card subset of the hand.
+
+N_HANDS = 2000
+
+CardObject = namedtuple('CardObject', 'rank suit')
+DECK = [CardObject(rank, suit) for suit in SUITS for rank in RANKS]
+RANK_CHARS = {'A': 1, 'T': 10, 'J': 11, 'Q': 12, 'K': 13}
+SUIT_CHARS = {s[0].lower(): s for s in SUITS}
+
+
+def cards(text):
+    """CardObjects from text such as 'As Td 2c'."""
+    return [CardObject(RANK_CHARS.get(c[0]) or int(c[0]), SUIT_CHARS[c[1]]) for c in text.split()]
+
+
+def legacy_best(hand):
+    """(rank_id, kickers, name) of the best 5-card subset, by the original 5-card evaluator."""
+    scores = (get_poker_hand_rank([(c.rank, c.suit) for c in five]) for five in combinations(hand, 5))
+    return max(scores, key = lambda score: score[:2])
+
+
+def random_hands(n_cards, n = N_HANDS, seed = 0):
+    rng = random.Random(seed + n_cards)
+    return [rng.sample(DECK, n_cards) for _ in range(n)]
+
+
+SPECIAL_HANDS = [cards('As Ks Qs Js Ts 2c 2d'),  # royal flush
+                 cards('Ac 2c 3c 4c 5c 9d 3s'),  # steel wheel
+                 cards('Ac 2d 3h 4s 5c 9d 6h'),  # 6-high straight over a wheel
+                 cards('7c 7d 7h 7s 8c 8d 8h'),  # quads over trips
+                 cards('7c 7d 7h 8c 8d 8h 2c'),  # two trips
+                 cards('7c 7d 8c 8d 9c 9d 2c')]  # three pairs
+
+
+@pytest.mark.parametrize('n_cards', [5, 6, 7])
+def test_evaluate_hand_matches_legacy_scores(n_cards):
+    for hand in random_hands(n_cards):
+        assert decode_strength(evaluate_hand(hand)) == legacy_best(hand)[:2]
+
+
+@pytest.mark.parametrize('n_cards', [5, 6, 7])
+def test_evaluate_hand_orders_hands_like_legacy(n_cards):
+    hands = random_hands(n_cards)
+    strengths = [evaluate_hand(hand) for hand in hands]
+    legacy = [legacy_best(hand)[:2] for hand in hands]
+    for (s_a, s_b), (l_a, l_b) in zip(zip(strengths, strengths[1:]), zip(legacy, legacy[1:])):
+        assert (s_a > s_b) == (l_a > l_b) and (s_a == s_b) == (l_a == l_b)
+
+
+@pytest.mark.parametrize('hand', SPECIAL_HANDS + random_hands(7, 200, seed = 1))
+def test_get_best_5_card_hand_matches_legacy(hand):
+    name, best_five, score, discarded = get_best_5_card_hand(hand)
+    rank_id, kickers, legacy_name = legacy_best(hand)
+    assert score == (rank_id, kickers)
+    assert name == legacy_name
+    assert len(best_five) == 5 and sorted(best_five + discarded) == sorted(hand)
+    assert get_poker_hand_rank([(c.rank, c.suit) for c in best_five])[:2] == score
+
+
+def test_stored_non_flush_table_is_current():
+    assert _NON_FLUSH_TABLE == _build_non_flush_table()
+
+
+@pytest.mark.parametrize('n_cards', [5, 6, 7])
+def test_vectorised_evaluators_match_evaluate_ids(n_cards):
+    hands = np.array([to_card_ids(hand) for hand in random_hands(n_cards) + [hand[:n_cards] for hand in SPECIAL_HANDS]])
+    expected = [evaluate_ids(list(ids)) for ids in hands.tolist()]
+    assert evaluate_batch(hands).tolist() == expected
+    assert evaluate_masks(np.left_shift(1, hands.astype(np.int64)).sum(axis = 1)).tolist() == expected